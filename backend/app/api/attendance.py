@@ -1,128 +1,299 @@
-<<<<<<< HEAD
-from fastapi import APIRouter
-
-router = APIRouter()
-
-@router.get("/")
-async def get_attendance():
-    return {"message": "Attendance API"}
-=======
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, datetime
-
-from app.db.session import SessionLocal
-from app.models.user import User
+from typing import Optional
+
+from app.api.conditional import not_modified
+from app.api.dependencies import Principal, get_current_principal, get_employee_profile
+from app.api.export import export_format, streaming_export
+from app.api.pagination import PageParams, fetch_page, page_params
+from app.core import config
+from app.db.dialect import upsert_insert
+from app.db.session import get_db
 from app.models.attendance import Attendance
-from app.models.employee import EmployeeProfile  # adjust import if filename differs
+from app.models.attendance_rollup import AttendanceMonthly
+from app.models.employee import EmployeeProfile
+from app.schemas.attendance import AttendanceMonthlyOut, AttendanceOut, PunchBatchRequest
+from app.schemas.page import Page
+from app.services.attendance_rollup import (
+    ROLLUP_COLUMNS, apply_deltas, check_in_delta, check_out_delta, month_key
+)
+from app.services.dashboard import invalidate_dashboard
+from app.services.punch_buffer import PunchBufferStopped, PunchQueueFull, PunchRejected, punch_buffer
+from app.services.punch_ingest import ingest_punches
+from app.services.versions import bump
 
 router = APIRouter()
 
-
-# ---------------- DB Dependency ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
 
 
-# ---------------- Helper ----------------
-def get_user(db: Session, user_id: int):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return user
+# Columns handed back by check-in/out, straight from RETURNING
+_PUNCH_COLUMNS = (
+    Attendance.id,
+    Attendance.date,
+    Attendance.check_in_time,
+    Attendance.check_out_time,
+    Attendance.status
+)
 
 
-def get_employee_profile(db: Session, user_id: int):
-    employee = db.query(EmployeeProfile).filter(
-        EmployeeProfile.user_id == user_id
-    ).first()
-    if not employee:
-        raise HTTPException(status_code=400, detail="Employee profile not found")
-    return employee
+async def _buffered_punch(db: AsyncSession, direction: str, action: str, employee_id: int, company_id: int) -> dict:
+    # PUNCH_WRITE_MODE=buffered: the background flush commits and invalidates.
+    # Hand the request's connection back first, the flush needs one of its own.
+    await db.close()
+    try:
+        attendance = await punch_buffer.submit(direction, employee_id, company_id)
+    except PunchQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many punches queued, please retry",
+            headers={"Retry-After": "1"}
+        )
+    except PunchBufferStopped:
+        raise HTTPException(
+            status_code=503,
+            detail="Punch could not be recorded, please retry",
+            headers={"Retry-After": "1"}
+        )
+    except PunchRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if attendance is None:
+        return {"message": f"{action} accepted", "queued": True}
+    return {"message": f"{action} successful", "attendance": attendance}
 
 
 # ---------------- Employee Check-in ----------------
 @router.post("/check-in")
-def check_in(
-    user_id: int,
-    db: Session = Depends(get_db)
+async def check_in(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    user = get_user(db, user_id)
-
-    if user.role != "employee":
+    if principal.role != "employee":
         raise HTTPException(status_code=403, detail="Only employees can check in")
 
-    employee = get_employee_profile(db, user.id)
-    today = date.today()
-
-    existing = db.query(Attendance).filter(
-        Attendance.employee_id == employee.id,
-        Attendance.date == today
-    ).first()
-
-    if existing:
+    employee = await get_employee_profile(db, principal.user_id)
+    if config.PUNCH_WRITE_MODE == "buffered":
+        return await _buffered_punch(db, "in", "Check-in", employee.id, principal.company_id)
+
+    # One statement: the unique (employee_id, date) key decides the race, so
+    # of two concurrent check-ins exactly one gets a row back.
+    attendance = (await db.execute(
+        upsert_insert(db, Attendance)
+        .values(
+            employee_id=employee.id,
+            date=date.today(),
+            check_in_time=datetime.now().time(),
+            status="present"
+        )
+        .on_conflict_do_nothing(index_elements=["employee_id", "date"])
+        .returning(*_PUNCH_COLUMNS)
+    )).first()
+
+    if attendance is None:
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Already checked in today")
 
-    attendance = Attendance(
-        employee_id=employee.id,
-        date=today,
-        check_in_time=datetime.now().time(),
-        status="present"
-    )
+    await apply_deltas(db, [check_in_delta(
+        employee.id, principal.company_id, attendance.date, attendance.check_in_time
+    )])
+    await bump(db, "attendance", [employee.id])
+    await db.commit()
 
-    db.add(attendance)
-    db.commit()
+    invalidate_dashboard(principal.company_id)
 
-    return {"message": "Check-in successful"}
+    return {
+        "message": "Check-in successful",
+        "attendance": attendance._asdict()
+    }
 
 
 # ---------------- Employee Check-out ----------------
 @router.post("/check-out")
-def check_out(
-    user_id: int,
-    db: Session = Depends(get_db)
+async def check_out(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    user = get_user(db, user_id)
-
-    if user.role != "employee":
+    if principal.role != "employee":
         raise HTTPException(status_code=403, detail="Only employees can check out")
 
-    employee = get_employee_profile(db, user.id)
+    employee = await get_employee_profile(db, principal.user_id)
+    if config.PUNCH_WRITE_MODE == "buffered":
+        return await _buffered_punch(db, "out", "Check-out", employee.id, principal.company_id)
+
     today = date.today()
 
-    attendance = db.query(Attendance).filter(
-        Attendance.employee_id == employee.id,
-        Attendance.date == today
-    ).first()
+    # Only the first check-out matches check_out_time IS NULL
+    attendance = (await db.execute(
+        update(Attendance)
+        .where(
+            Attendance.employee_id == employee.id,
+            Attendance.date == today,
+            Attendance.check_out_time.is_(None)
+        )
+        .values(check_out_time=datetime.now().time())
+        .returning(*_PUNCH_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )).first()
+
+    if attendance is None:
+        await db.rollback()
+        # Failure path only: tell the two reasons apart
+        checked_in = await db.scalar(
+            select(Attendance.id).where(
+                Attendance.employee_id == employee.id,
+                Attendance.date == today
+            )
+        )
+        if not checked_in:
+            raise HTTPException(status_code=400, detail="No check-in found")
+        raise HTTPException(status_code=400, detail="Already checked out")
 
-    if not attendance:
-        raise HTTPException(status_code=400, detail="No check-in found")
+    await apply_deltas(db, [check_out_delta(
+        employee.id, principal.company_id, attendance.date, attendance.check_in_time, attendance.check_out_time
+    )])
+    await bump(db, "attendance", [employee.id])
+    await db.commit()
 
-    if attendance.check_out_time:
-        raise HTTPException(status_code=400, detail="Already checked out")
+    return {
+        "message": "Check-out successful",
+        "attendance": attendance._asdict()
+    }
 
-    attendance.check_out_time = datetime.now().time()
-    db.commit()
 
-    return {"message": "Check-out successful"}
+# ---------------- Time Clock Uploads Punches ----------------
+@router.post("/punches")
+async def upload_punches(
+    data: PunchBatchRequest,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk sync of kiosk / badge reader punches, merged first-in/last-out per day."""
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR devices can upload punches")
+
+    summary = await ingest_punches(db, principal.company_id, data.punches)
+    if summary["accepted"]:
+        invalidate_dashboard(principal.company_id)
+
+    return {"message": "Punches processed", **summary}
 
 
 # ---------------- Employee Views Own Attendance ----------------
-@router.get("/me")
-def my_attendance(
-    user_id: int,
-    db: Session = Depends(get_db)
+@router.get("/me", response_model=Page[AttendanceOut])
+async def my_attendance(
+    request: Request,
+    response: Response,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    user = get_user(db, user_id)
-    employee = get_employee_profile(db, user.id)
-
-    records = db.query(Attendance).filter(
-        Attendance.employee_id == employee.id
-    ).order_by(Attendance.date.desc()).all()
+    employee = await get_employee_profile(db, principal.user_id)
+    unchanged = await not_modified(request, response, db, employee.id, "attendance")
+    if unchanged:
+        return unchanged
+
+    query = select(Attendance).where(Attendance.employee_id == employee.id)
+    if date_from:
+        query = query.where(Attendance.date >= date_from)
+    if date_to:
+        query = query.where(Attendance.date <= date_to)
+    if status:
+        query = query.where(Attendance.status == status)
+
+    return await fetch_page(db, query, (Attendance.date, Attendance.id), page)
+
+
+# ---------------- Employee Views Monthly Summary ----------------
+@router.get("/summary/me", response_model=AttendanceMonthlyOut)
+async def my_monthly_summary(
+    month: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="YYYY-MM, defaults to this month"),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    employee = await get_employee_profile(db, principal.user_id)
+    month = month or month_key(date.today())
+
+    summary = await db.scalar(
+        select(AttendanceMonthly).where(
+            AttendanceMonthly.employee_id == employee.id,
+            AttendanceMonthly.month == month
+        )
+    )
+    if summary is None:
+        return {"employee_id": employee.id, "month": month, **{column: 0 for column in ROLLUP_COLUMNS}}
+    return summary
+
+
+# ---------------- HR Views Company Monthly Summary ----------------
+@router.get("/summary/company", response_model=Page[AttendanceMonthlyOut])
+async def company_monthly_summary(
+    month: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="YYYY-MM, defaults to this month"),
+    department: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can view attendance summaries")
 
-    return records
->>>>>>> d84000d7c096f156e71cba7eafa99c7359a1099b
+    query = select(AttendanceMonthly).where(
+        AttendanceMonthly.company_id == principal.company_id,
+        AttendanceMonthly.month == (month or month_key(date.today()))
+    )
+    if department:
+        query = query.join(EmployeeProfile, AttendanceMonthly.employee_id == EmployeeProfile.id).where(
+            EmployeeProfile.department == department
+        )
+
+    return await fetch_page(db, query, (AttendanceMonthly.employee_id,), page, descending=False)
+
+
+# ---------------- HR Exports Company Attendance ----------------
+@router.get("/company/export")
+async def export_company_attendance(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[str] = None,
+    department: Optional[str] = None,
+    fmt: str = Depends(export_format),
+    principal: Principal = Depends(get_current_principal)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can export attendance")
+
+    # The company's employees as an IN list from the company index: with a
+    # plain join filter SQLite prefers scanning employee_profiles once a
+    # company holds a sizeable share of them
+    employees = select(EmployeeProfile.id).where(EmployeeProfile.company_id == principal.company_id)
+    if department:
+        employees = employees.where(EmployeeProfile.department == department)
+
+    query = (
+        select(
+            Attendance.id,
+            Attendance.date,
+            EmployeeProfile.employee_code,
+            EmployeeProfile.full_name,
+            EmployeeProfile.department,
+            Attendance.check_in_time,
+            Attendance.check_out_time,
+            Attendance.status
+        )
+        .join(EmployeeProfile, Attendance.employee_id == EmployeeProfile.id)
+        .where(Attendance.employee_id.in_(employees))
+        .order_by(Attendance.id)
+    )
+    if date_from:
+        query = query.where(Attendance.date >= date_from)
+    if date_to:
+        query = query.where(Attendance.date <= date_to)
+    if status:
+        query = query.where(Attendance.status == status)
+
+    return streaming_export(query, fmt, "attendance")
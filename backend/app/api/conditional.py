@@ -0,0 +1,41 @@
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.versions import current_version, etag
+
+# Stored by the browser but revalidated on every poll
+CACHE_CONTROL = "private, no-cache"
+
+
+def _matches(if_none_match: str, tag: str) -> bool:
+    # Weak comparison, as If-None-Match requires: W/"x" matches "x"
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == tag for candidate in candidates)
+
+
+async def not_modified(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    employee_id: int,
+    collection: str
+) -> Optional[Response]:
+    """Conditional GET for an employee's own collection.
+
+    Reads the collection's version (one primary-key lookup) and returns a
+    bare 304 when the client's If-None-Match still holds, so the endpoint can
+    skip its list query. Otherwise sets the ETag on response and returns None.
+    The version is read before the list query: a write landing in between
+    leaves the page tagged with the older version, and the next poll refetches.
+    """
+    tag = etag(employee_id, collection, await current_version(db, employee_id, collection), request.url.query)
+    headers = {"ETag": tag, "Cache-Control": CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, tag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
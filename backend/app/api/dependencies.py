@@ -0,0 +1,95 @@
+import time
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.core.cache import TTLCache
+from app.core.security import decode_access_token
+from app.db.identity_cache import load_employee_profile, load_user
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# Keyed by the token signature: identical tokens share one entry and a
+# tampered payload can never hit an entry verified for a different one.
+_token_cache = TTLCache(maxsize=config.TOKEN_CACHE_SIZE, ttl=config.TOKEN_CACHE_TTL)
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int
+    company_id: int
+    role: str
+
+
+def _unauthorized(detail: str):
+    return HTTPException(
+        status_code=401,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+# ---------------- Current Principal ----------------
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> Principal:
+    """Resolve the caller from the bearer token's claims, without touching the DB."""
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+
+    token = credentials.credentials
+    signature = token.rsplit(".", 1)[-1]
+
+    cached = _token_cache.get(signature)
+    if cached is not None:
+        cached_token, principal = cached
+        if cached_token == token:
+            return principal
+
+    try:
+        claims = decode_access_token(token)
+        principal = Principal(
+            user_id=int(claims["user_id"]),
+            company_id=int(claims["company_id"]),
+            role=claims["role"]
+        )
+        # Every issued token expires; one without "exp" was not issued here
+        expires_at = float(claims["exp"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise _unauthorized("Invalid or expired token")
+
+    # Never cache a token past its own expiry
+    remaining = expires_at - time.time()
+    if remaining > 0:
+        _token_cache.set(signature, (token, principal), ttl=min(remaining, config.TOKEN_CACHE_TTL))
+
+    return principal
+
+
+async def get_admin_principal(principal: Principal = Depends(get_current_principal)) -> Principal:
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can view system statistics")
+    return principal
+
+
+def get_token_cache_stats() -> dict:
+    return _token_cache.stats()
+
+
+# ---------------- Cached Identity Lookups ----------------
+async def get_user(db: AsyncSession, user_id: int):
+    user = await load_user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid user")
+    return user
+
+
+async def get_employee_profile(db: AsyncSession, user_id: int):
+    employee = await load_employee_profile(db, user_id)
+    if not employee:
+        raise HTTPException(status_code=400, detail="Employee profile not found")
+    return employee
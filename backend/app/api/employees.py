@@ -1,272 +1,46 @@
-<<<<<<< HEAD
-from fastapi import APIRouter, HTTPException, Depends, status
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
-from datetime import datetime
-import secrets
-import string
-
-router = APIRouter()
-
-# Pydantic models
-class EmployeeCreate(BaseModel):
-    email: EmailStr
-    full_name: str
-    phone: Optional[str] = None
-    department: str
-    position: str
-    employee_id: Optional[str] = None
-    salary: Optional[float] = None
-    join_date: Optional[str] = None
-
-class EmployeeResponse(BaseModel):
-    id: str
-    employee_id: str
-    email: EmailStr
-    full_name: str
-    phone: Optional[str]
-    department: str
-    position: str
-    salary: Optional[float]
-    join_date: str
-    temporary_password: str
-    is_active: bool
-    is_first_login: bool
-    created_at: datetime
-
-class EmployeeUpdate(BaseModel):
-    email: Optional[EmailStr] = None
-    full_name: Optional[str] = None
-    phone: Optional[str] = None
-    department: Optional[str] = None
-    position: Optional[str] = None
-    salary: Optional[float] = None
-    is_active: Optional[bool] = None
-
-# Helper functions
-def generate_random_password(length: int = 12) -> str:
-    """
-    Generate a secure random password for new employees
-    Password includes uppercase, lowercase, digits, and special characters
-    """
-    # Ensure password has at least one of each required character type
-    password_chars = [
-        secrets.choice(string.ascii_uppercase),
-        secrets.choice(string.ascii_lowercase),
-        secrets.choice(string.digits),
-        secrets.choice(string.punctuation)
-    ]
-    
-    # Fill the rest with random characters
-    all_chars = string.ascii_letters + string.digits + string.punctuation
-    password_chars.extend(secrets.choice(all_chars) for _ in range(length - 4))
-    
-    # Shuffle the password characters
-    secrets.SystemRandom().shuffle(password_chars)
-    
-    return ''.join(password_chars)
-
-def generate_employee_id(department: str) -> str:
-    """Generate unique employee ID based on department"""
-    # Get department prefix (first 3 letters)
-    dept_prefix = department[:3].upper()
-    
-    # TODO: Get count from database to generate sequential number
-    # For now, using random number
-    random_num = secrets.randbelow(9999)
-    
-    return f"{dept_prefix}{random_num:04d}"
-
-# Routes
-@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def create_employee(employee: EmployeeCreate):
-    """
-    Create a new employee with random password
-    Admin will receive the temporary password to share with employee
-    """
-    try:
-        # Generate employee ID if not provided
-        if not employee.employee_id:
-            employee_id = generate_employee_id(employee.department)
-        else:
-            employee_id = employee.employee_id
-        
-        # Generate random temporary password
-        temporary_password = generate_random_password()
-        
-        # TODO: Hash password before storing
-        # from auth import get_password_hash
-        # hashed_password = get_password_hash(temporary_password)
-        
-        # TODO: Save employee to database with:
-        # - hashed_password
-        # - is_first_login = True
-        # - is_active = True
-        # - created_at = datetime.now()
-        
-        employee_data = {
-            "id": f"emp_{secrets.token_hex(8)}",
-            "employee_id": employee_id,
-            "email": employee.email,
-            "full_name": employee.full_name,
-            "phone": employee.phone,
-            "department": employee.department,
-            "position": employee.position,
-            "salary": employee.salary,
-            "join_date": employee.join_date or datetime.now().strftime("%Y-%m-%d"),
-            "temporary_password": temporary_password,
-            "is_active": True,
-            "is_first_login": True,
-            "created_at": datetime.now().isoformat()
-        }
-        
-        return {
-            "message": "Employee created successfully",
-            "employee": employee_data,
-            "note": "Share the temporary password with the employee. They will be required to reset it on first login."
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create employee: {str(e)}"
-        )
-
-@router.get("/", response_model=List[dict])
-async def get_all_employees():
-    """Get all employees"""
-    try:
-        # TODO: Query database for all employees
-        # For now, return empty list
-        return []
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch employees: {str(e)}"
-        )
-
-@router.get("/{employee_id}", response_model=dict)
-async def get_employee(employee_id: str):
-    """Get employee by ID"""
-    try:
-        # TODO: Query database for employee
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee not found"
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch employee: {str(e)}"
-        )
-
-@router.put("/{employee_id}", response_model=dict)
-async def update_employee(employee_id: str, employee: EmployeeUpdate):
-    """Update employee information"""
-    try:
-        # TODO: Update employee in database
-        return {
-            "message": "Employee updated successfully",
-            "employee_id": employee_id
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update employee: {str(e)}"
-        )
-
-@router.delete("/{employee_id}", response_model=dict)
-async def delete_employee(employee_id: str):
-    """Delete/deactivate employee"""
-    try:
-        # TODO: Soft delete employee in database (set is_active=False)
-        return {
-            "message": "Employee deleted successfully",
-            "employee_id": employee_id
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete employee: {str(e)}"
-        )
+import random
+from typing import Literal, Optional
 
-@router.post("/{employee_id}/reset-password", response_model=dict)
-async def admin_reset_employee_password(employee_id: str):
-    """
-    Admin can reset employee password
-    Generates new random password and marks as first login
-    """
-    try:
-        # Generate new random password
-        new_password = generate_random_password()
-        
-        # TODO: Hash and update password in database
-        # Also set is_first_login = True
-        
-        return {
-            "message": "Password reset successfully",
-            "employee_id": employee_id,
-            "temporary_password": new_password,
-            "note": "Employee will be required to reset this password on next login."
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to reset password: {str(e)}"
-        )
-=======
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal
-from app.models.user import User
+from app.api.dependencies import Principal, get_current_principal, get_user
+from app.api.pagination import PageParams, fetch_page, page_params
 from app.core.security import hash_password
+from app.db.identity_cache import invalidate_user
+from app.db.session import get_db
 from app.models.employee import EmployeeProfile
-import random
-
-router = APIRouter()
-
-
-# ---------------- DB Dependency ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.models.user import User
+from app.schemas.employee import EmployeeListItem, UserProfileOut
+from app.schemas.page import Page
+from app.services.dashboard import invalidate_dashboard
+from app.services.employee_import import ImportTooLarge, import_employees, parse_rows, validate_rows
 
 
-# ---------------- Helper ----------------
-def get_user(db: Session, user_id: int):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return user
+router = APIRouter()
 
 
 # ---------------- HR Creates Employee ----------------
 @router.post("/")
-def create_employee(
-    user_id: int,            # HR user_id
+async def create_employee(
     email: str,
     full_name: str,
     password: str,
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    hr = get_user(db, user_id)
-
-    if hr.role != "admin":
+    if principal.role != "admin":
         raise HTTPException(status_code=403, detail="Only HR can create employees")
 
     # Check if employee already exists
-    existing_user = db.query(User).filter(User.email == email).first()
+    existing_user = await db.scalar(select(User).where(User.email == email))
     if existing_user:
         raise HTTPException(status_code=400, detail="Employee already exists")
 
     employee = User(
-        company_id=hr.company_id,
+        company_id=principal.company_id,
         email=email,
         full_name=full_name,
         hashed_password=hash_password(password),
@@ -275,12 +49,12 @@ def create_employee(
     )
 
     db.add(employee)
-    db.commit()
-    db.refresh(employee)
+    await db.commit()
+    await db.refresh(employee)
 
     employee_profile = EmployeeProfile(
     user_id=employee.id,
-    company_id=hr.company_id,
+    company_id=principal.company_id,
     employee_code=f"EMP{random.randint(1000,9999)}",
     full_name=full_name,
     department="General",
@@ -290,7 +64,9 @@ def create_employee(
 )
 
     db.add(employee_profile)
-    db.commit()
+    await db.commit()
+    invalidate_user(employee.id)
+    invalidate_dashboard(principal.company_id)
 
     return {
         "message": "Employee created successfully",
@@ -298,46 +74,92 @@ def create_employee(
     }
 
 
-# ---------------- HR Views All Employees ----------------
-@router.get("/")
-def list_employees(
-    user_id: int,
-    db: Session = Depends(get_db)
+# ---------------- HR Bulk Imports Employees ----------------
+@router.post("/import")
+async def import_employees_upload(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Defaults from Content-Type"),
+    skip_invalid: bool = False,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    hr = get_user(db, user_id)
+    """Onboard many employees from a CSV (with header) or NDJSON request body.
 
-    if hr.role != "admin":
+    Every row is validated before anything is written. By default any invalid
+    row rejects the whole upload with per-row errors; with skip_invalid the
+    valid rows are imported and the rest reported.
+    """
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can import employees")
+
+    if format is None:
+        format = "ndjson" if "json" in request.headers.get("content-type", "") else "csv"
+
+    try:
+        rows = parse_rows(await request.body(), format)
+    except ImportTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload must be UTF-8 encoded")
+
+    if not rows:
+        raise HTTPException(status_code=400, detail="No rows to import")
+
+    valid, errors = await validate_rows(db, rows)
+    if errors and not skip_invalid:
+        raise HTTPException(status_code=422, detail={
+            "message": "No employees imported, fix the listed rows",
+            "errors": errors
+        })
+
+    try:
+        summary = await import_employees(db, principal.company_id, valid)
+        await db.commit()
+    except IntegrityError:
+        # An email or code was taken between validation and insert
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Import conflicted with a concurrent change, nothing was imported")
+
+    invalidate_dashboard(principal.company_id)
+
+    return {
+        "message": "Employees imported",
+        **summary,
+        "skipped": len(errors),
+        "errors": errors
+    }
+
+
+# ---------------- HR Views All Employees ----------------
+@router.get("/", response_model=Page[EmployeeListItem])
+async def list_employees(
+    department: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    page: PageParams = Depends(page_params),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    if principal.role != "admin":
         raise HTTPException(status_code=403, detail="Only HR can view employees")
 
-    employees = db.query(User).filter(
-        User.company_id == hr.company_id,
+    query = select(User).where(
+        User.company_id == principal.company_id,
         User.role == "employee"
-    ).all()
+    )
+    if department:
+        query = query.join(EmployeeProfile, EmployeeProfile.user_id == User.id).where(
+            EmployeeProfile.department == department
+        )
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
 
-    return [
-        {
-            "id": emp.id,
-            "full_name": emp.full_name,
-            "email": emp.email,
-            "is_active": emp.is_active
-        }
-        for emp in employees
-    ]
+    return await fetch_page(db, query, (User.id,), page, descending=False)
 
 
 # ---------------- Employee Views Own Profile ----------------
-@router.get("/me")
-def my_profile(
-    user_id: int,
-    db: Session = Depends(get_db)
+@router.get("/me", response_model=UserProfileOut)
+async def my_profile(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    user = get_user(db, user_id)
-
-    return {
-        "id": user.id,
-        "full_name": user.full_name,
-        "email": user.email,
-        "role": user.role,
-        "company_id": user.company_id
-    }
->>>>>>> d84000d7c096f156e71cba7eafa99c7359a1099b
+    return await get_user(db, principal.user_id)
@@ -1,63 +1,80 @@
-<<<<<<< HEAD
-from fastapi import APIRouter
-
-router = APIRouter()
-
-@router.get("/")
-async def get_leave():
-    return {"message": "Leave API"}
-=======
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-
-from app.db.session import SessionLocal
-from app.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from datetime import date, timedelta
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import not_modified
+from app.api.dependencies import Principal, get_current_principal, get_employee_profile
+from app.api.export import export_format, streaming_export
+from app.api.pagination import PageParams, fetch_page, page_params
+from app.core import config
+from app.db.session import get_db
 from app.models.employee import EmployeeProfile
 from app.models.leave import LeaveRequest
-from app.schemas.leave import LeaveApplyRequest
+from app.schemas.leave import LeaveAccrualRequest, LeaveApplyRequest, LeaveBalanceOut, LeaveDecisionBatch, LeaveOut
+from app.schemas.page import Page
+from app.services.attendance_rollup import apply_deltas, leave_deltas
+from app.services.dashboard import invalidate_dashboard
+from app.services.leave_calendar import occupy, release, team_calendar
+from app.services.leave_decisions import decide_leaves
+from app.services.leave_ledger import (
+    InsufficientBalance, accrue, credit, debit, get_balance, get_balances, is_tracked, leave_days
+)
+from app.services.leave_overlap import find_attended_day, find_overlap, overlap_message
+from app.services.versions import bump
 
 router = APIRouter()
 
 
-# ---------------- DB Dependency ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-# ---------------- Helpers ----------------
-def get_user(db: Session, user_id: int):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return user
-
-
-def get_employee_profile(db: Session, user_id: int):
-    employee = db.query(EmployeeProfile).filter(
-        EmployeeProfile.user_id == user_id
-    ).first()
-    if not employee:
-        raise HTTPException(status_code=400, detail="Employee profile not found")
-    return employee
+# ---------------- Helper ----------------
+def filter_leaves(query, date_from, date_to, status, leave_type):
+    # Date range keeps every leave that overlaps [date_from, date_to]
+    if date_from:
+        query = query.where(LeaveRequest.end_date >= date_from)
+    if date_to:
+        query = query.where(LeaveRequest.start_date <= date_to)
+    if status:
+        query = query.where(LeaveRequest.status == status)
+    if leave_type:
+        query = query.where(LeaveRequest.leave_type == leave_type)
+    return query
 
 
 # ---------------- Employee Applies Leave ----------------
 @router.post("/apply")
-def apply_leave(
-    user_id: int,
+async def apply_leave(
     payload: LeaveApplyRequest,
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    user = get_user(db, user_id)
-
-    if user.role != "employee":
+    if principal.role != "employee":
         raise HTTPException(status_code=403, detail="Only employees can apply leave")
 
-    employee = get_employee_profile(db, user.id)
+    if payload.end_date < payload.start_date:
+        raise HTTPException(status_code=400, detail="end_date cannot be before start_date")
+    if leave_days(payload.start_date, payload.end_date) > config.LEAVE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Leave cannot exceed {config.LEAVE_MAX_DAYS} days")
+
+    employee = await get_employee_profile(db, principal.user_id)
+
+    overlap = await find_overlap(db, employee.id, payload.start_date, payload.end_date)
+    if overlap:
+        raise HTTPException(status_code=409, detail=overlap_message(overlap))
+
+    attended = await find_attended_day(db, employee.id, payload.start_date, payload.end_date)
+    if attended:
+        raise HTTPException(status_code=409, detail=f"Attendance already recorded on {attended}")
+
+    if is_tracked(payload.leave_type):
+        requested = leave_days(payload.start_date, payload.end_date)
+        available = await get_balance(db, employee.id, payload.leave_type)
+        if requested > available:
+            raise HTTPException(
+                status_code=400,
+                detail=str(InsufficientBalance(payload.leave_type, available, requested))
+            )
 
     leave = LeaveRequest(
         employee_id=employee.id,
@@ -68,8 +85,15 @@ def apply_leave(
     )
 
     db.add(leave)
-    db.commit()
-    db.refresh(leave)
+    await bump(db, "leave", [employee.id])
+    try:
+        await db.commit()
+    except IntegrityError:
+        # ex_leave_requests_no_overlap: a concurrent application won the dates
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Leave overlaps another pending or approved leave")
+    await db.refresh(leave)
+    invalidate_dashboard(principal.company_id)
 
     return {
         "message": "Leave applied successfully",
@@ -78,105 +102,307 @@ def apply_leave(
 
 
 # ---------------- Employee Views Own Leaves ----------------
-@router.get("/me")
-def my_leaves(
-    user_id: int,
-    db: Session = Depends(get_db)
+@router.get("/me", response_model=Page[LeaveOut])
+async def my_leaves(
+    request: Request,
+    response: Response,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[str] = None,
+    leave_type: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    user = get_user(db, user_id)
-    employee = get_employee_profile(db, user.id)
-
-    leaves = db.query(LeaveRequest).filter(
-        LeaveRequest.employee_id == employee.id
-    ).order_by(LeaveRequest.start_date.desc()).all()
+    employee = await get_employee_profile(db, principal.user_id)
+    unchanged = await not_modified(request, response, db, employee.id, "leave")
+    if unchanged:
+        return unchanged
+
+    query = filter_leaves(
+        select(LeaveRequest).where(LeaveRequest.employee_id == employee.id),
+        date_from, date_to, status, leave_type
+    )
 
-    return leaves
+    return await fetch_page(db, query, (LeaveRequest.start_date, LeaveRequest.id), page)
 
 
 # ---------------- HR Views Company Leaves ----------------
-@router.get("/company")
-def company_leaves(
-    user_id: int,
-    db: Session = Depends(get_db)
+@router.get("/company", response_model=Page[LeaveOut])
+async def company_leaves(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[str] = None,
+    leave_type: Optional[str] = None,
+    department: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    hr = get_user(db, user_id)
-
-    if hr.role != "admin":
+    if principal.role != "admin":
         raise HTTPException(status_code=403, detail="Only HR can view leaves")
 
-    leaves = (
-        db.query(LeaveRequest)
+    query = filter_leaves(
+        select(LeaveRequest)
+        .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
+        .where(EmployeeProfile.company_id == principal.company_id),
+        date_from, date_to, status, leave_type
+    )
+    if department:
+        query = query.where(EmployeeProfile.department == department)
+
+    return await fetch_page(db, query, (LeaveRequest.start_date, LeaveRequest.id), page)
+
+
+# ---------------- HR Exports Company Leaves ----------------
+@router.get("/company/export")
+async def export_company_leaves(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[str] = None,
+    leave_type: Optional[str] = None,
+    department: Optional[str] = None,
+    fmt: str = Depends(export_format),
+    principal: Principal = Depends(get_current_principal)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can export leaves")
+
+    query = filter_leaves(
+        select(
+            LeaveRequest.id,
+            EmployeeProfile.employee_code,
+            EmployeeProfile.full_name,
+            EmployeeProfile.department,
+            LeaveRequest.leave_type,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveRequest.status,
+            LeaveRequest.admin_comment
+        )
         .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
-        .filter(EmployeeProfile.company_id == hr.company_id)
-        .order_by(LeaveRequest.start_date.desc())
-        .all()
+        .where(EmployeeProfile.company_id == principal.company_id)
+        .order_by(LeaveRequest.id),
+        date_from, date_to, status, leave_type
     )
+    if department:
+        query = query.where(EmployeeProfile.department == department)
+
+    return streaming_export(query, fmt, "leaves")
 
-    return leaves
+
+# ---------------- HR Views Team Availability ----------------
+@router.get("/calendar")
+async def leave_calendar(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    department: Optional[str] = None,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can view the leave calendar")
+
+    date_from = date_from or date.today()
+    date_to = date_to or date_from + timedelta(days=config.LEAVE_CALENDAR_DEFAULT_DAYS - 1)
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to cannot be before date_from")
+    if leave_days(date_from, date_to) > config.LEAVE_CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Calendar window cannot exceed {config.LEAVE_CALENDAR_MAX_DAYS} days")
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "department": department,
+        "days": await team_calendar(db, principal.company_id, date_from, date_to, department)
+    }
 
 
 # ---------------- HR Approves Leave ----------------
 @router.post("/{leave_id}/approve")
-def approve_leave(
+async def approve_leave(
     leave_id: int,
-    user_id: int,
     admin_comment: str = "",
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    hr = get_user(db, user_id)
-
-    if hr.role != "admin":
+    if principal.role != "admin":
         raise HTTPException(status_code=403, detail="Only HR can approve leave")
 
-    leave = (
-        db.query(LeaveRequest)
+    # Locked so two concurrent decisions cannot both move the balance
+    leave = await db.scalar(
+        select(LeaveRequest)
         .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
-        .filter(
+        .where(
             LeaveRequest.id == leave_id,
-            EmployeeProfile.company_id == hr.company_id
+            EmployeeProfile.company_id == principal.company_id
         )
-        .first()
+        .with_for_update(of=LeaveRequest)
     )
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave not found")
-
+    if leave.status == "cancelled":
+        raise HTTPException(status_code=400, detail="Leave was cancelled")
+
+    # A rejected leave no longer held its dates; another may have taken them
+    if leave.status == "rejected":
+        overlap = await find_overlap(db, leave.employee_id, leave.start_date, leave.end_date, exclude_id=leave.id)
+        if overlap:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail=overlap_message(overlap))
+
+    # Only a status change moves the balance and the monthly rollup
+    if leave.status != "approved":
+        try:
+            await debit(db, leave, principal.company_id)
+        except InsufficientBalance as e:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
+        await apply_deltas(db, leave_deltas(
+            leave.employee_id, principal.company_id, leave.start_date, leave.end_date
+        ))
+        await occupy(db, principal.company_id, [leave])
     leave.status = "approved"
     leave.admin_comment = admin_comment
-    db.commit()
+    await bump(db, "leave", [leave.employee_id])
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Leave overlaps another pending or approved leave")
+    invalidate_dashboard(principal.company_id)
 
     return {"message": "Leave approved"}
 
 
 # ---------------- HR Rejects Leave ----------------
 @router.post("/{leave_id}/reject")
-def reject_leave(
+async def reject_leave(
     leave_id: int,
-    user_id: int,
     admin_comment: str = "",
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    hr = get_user(db, user_id)
-
-    if hr.role != "admin":
+    if principal.role != "admin":
         raise HTTPException(status_code=403, detail="Only HR can reject leave")
 
-    leave = (
-        db.query(LeaveRequest)
+    # Locked so two concurrent decisions cannot both move the balance
+    leave = await db.scalar(
+        select(LeaveRequest)
         .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
-        .filter(
+        .where(
             LeaveRequest.id == leave_id,
-            EmployeeProfile.company_id == hr.company_id
+            EmployeeProfile.company_id == principal.company_id
         )
-        .first()
+        .with_for_update(of=LeaveRequest)
     )
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave not found")
-
+    if leave.status == "cancelled":
+        raise HTTPException(status_code=400, detail="Leave was cancelled")
+
+    if leave.status == "approved":
+        await credit(db, leave, principal.company_id, "rejection")
+        await apply_deltas(db, leave_deltas(
+            leave.employee_id, principal.company_id, leave.start_date, leave.end_date, sign=-1
+        ))
+        await release(db, [leave.id])
     leave.status = "rejected"
     leave.admin_comment = admin_comment
-    db.commit()
+    await bump(db, "leave", [leave.employee_id])
+    await db.commit()
+    invalidate_dashboard(principal.company_id)
 
     return {"message": "Leave rejected"}
->>>>>>> d84000d7c096f156e71cba7eafa99c7359a1099b
+
+
+# ---------------- HR Decides Leaves In Bulk ----------------
+@router.post("/decisions")
+async def decide_leaves_in_bulk(
+    payload: LeaveDecisionBatch,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can approve or reject leave")
+
+    results = await decide_leaves(db, principal.company_id, payload.decisions)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # ex_leave_requests_no_overlap: a concurrent application took revived dates
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Decisions conflicted with a concurrent change, nothing was applied")
+    invalidate_dashboard(principal.company_id)
+
+    failed = sum(1 for result in results if "error" in result)
+    return {
+        "message": "Leave decisions applied",
+        "applied": len(results) - failed,
+        "failed": failed,
+        "results": results
+    }
+
+
+# ---------------- Employee Cancels Leave ----------------
+@router.post("/{leave_id}/cancel")
+async def cancel_leave(
+    leave_id: int,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    employee = await get_employee_profile(db, principal.user_id)
+
+    leave = await db.scalar(
+        select(LeaveRequest)
+        .where(LeaveRequest.id == leave_id, LeaveRequest.employee_id == employee.id)
+        .with_for_update()
+    )
+
+    if not leave:
+        raise HTTPException(status_code=404, detail="Leave not found")
+    if leave.status not in ("pending", "approved"):
+        raise HTTPException(status_code=400, detail=f"Leave is already {leave.status}")
+    if leave.start_date <= date.today():
+        raise HTTPException(status_code=400, detail="Only upcoming leave can be cancelled")
+
+    if leave.status == "approved":
+        await credit(db, leave, principal.company_id, "cancellation")
+        await apply_deltas(db, leave_deltas(
+            leave.employee_id, principal.company_id, leave.start_date, leave.end_date, sign=-1
+        ))
+        await release(db, [leave.id])
+    leave.status = "cancelled"
+    await bump(db, "leave", [leave.employee_id])
+    await db.commit()
+    invalidate_dashboard(principal.company_id)
+
+    return {"message": "Leave cancelled"}
+
+
+# ---------------- Employee Views Leave Balance ----------------
+@router.get("/balance", response_model=List[LeaveBalanceOut])
+async def my_leave_balance(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    employee = await get_employee_profile(db, principal.user_id)
+    return await get_balances(db, employee.id)
+
+
+# ---------------- HR Runs Monthly Leave Accrual ----------------
+@router.post("/accruals")
+async def run_leave_accrual(
+    payload: LeaveAccrualRequest,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can run leave accruals")
+
+    summary = await accrue(db, principal.company_id, payload.month)
+    await db.commit()
+
+    return {"message": "Leave accrual completed", **summary}
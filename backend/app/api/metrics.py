@@ -0,0 +1,46 @@
+from anyio import to_thread
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import Counter, Gauge, render
+from app.db.session import get_pool_stats
+from app.services.punch_buffer import get_punch_buffer_stats
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _saturation() -> list:
+    """Metrics read at scrape time: DB pool, threadpool and punch queue."""
+    pool = get_pool_stats()
+    limiter = to_thread.current_default_thread_limiter()
+    punches = get_punch_buffer_stats()
+
+    readings = [
+        (Gauge, "db_pool_checked_out", "Connections of the API pool in use.", pool["checked_out"]),
+        (Gauge, "db_pool_size", "Configured size of the API pool.", pool["size"]),
+        (Gauge, "db_pool_overflow", "Connections open beyond the pool size.", pool["overflow"]),
+        (Gauge, "db_pool_max_overflow", "Largest overflow allowed.", pool["max_overflow"]),
+        (Counter, "db_pool_checkout_wait_seconds_total", "Time requests waited for a connection.", pool["wait_seconds_total"]),
+        (Counter, "db_pool_checkout_timeouts_total", "Requests answered 503 for lack of a connection.", pool["checkout_timeouts"]),
+        (Gauge, "threadpool_busy_threads", "Worker threads running sync endpoints and dependencies.", limiter.borrowed_tokens),
+        (Gauge, "threadpool_max_threads", "Worker thread limit.", limiter.total_tokens),
+        (Gauge, "threadpool_waiting_tasks", "Tasks waiting for a worker thread.", limiter.statistics().tasks_waiting),
+        (Gauge, "punch_queue_depth", "Punches waiting in the write-behind buffer.", punches["queue_depth"]),
+    ]
+    metrics = []
+    for kind, name, help, value in readings:
+        # SQLite's pool has no size or overflow
+        if value is None:
+            continue
+        metric = kind(name, help)
+        metric.inc(amount=value)
+        metrics.append(metric)
+    return metrics
+
+
+# ---------------- Prometheus Scrape ----------------
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render(_saturation()), media_type=CONTENT_TYPE)
@@ -0,0 +1,92 @@
+import base64
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class PageParams:
+    """Query parameters shared by every keyset-paginated list endpoint."""
+
+    def __init__(self, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        self.cursor = cursor
+        self.limit = limit
+
+
+async def page_params(
+    cursor: str = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+) -> PageParams:
+    # A coroutine, not the class itself: FastAPI runs class and plain-def
+    # dependencies on the worker threadpool, one thread per request
+    return PageParams(cursor, limit)
+
+
+# ---------------- Cursor Encoding ----------------
+def _encode_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, raw):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    return python_type(raw)
+
+
+def encode_cursor(values: list) -> str:
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: tuple) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw, list) or len(raw) != len(keys):
+            raise ValueError(cursor)
+        return [_decode_value(key, value) for key, value in zip(keys, raw)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# ---------------- Keyset Pagination ----------------
+async def fetch_page(
+    db: AsyncSession,
+    stmt,
+    keys: tuple,
+    page: PageParams,
+    descending: bool = True
+) -> dict:
+    """Run stmt one page at a time, ordered by keys.
+
+    keys must end with a unique column (normally the primary key) so the sort
+    is total and no row is skipped or repeated between pages. The row-value
+    comparison lets the database seek straight into an index on keys rather
+    than counting past an OFFSET.
+    """
+    if page.cursor:
+        bound = tuple_(*decode_cursor(page.cursor, keys))
+        stmt = stmt.where(tuple_(*keys) < bound if descending else tuple_(*keys) > bound)
+
+    order_by = [key.desc() if descending else key.asc() for key in keys]
+    rows = (await db.scalars(stmt.order_by(*order_by).limit(page.limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+    return {
+        "items": rows,
+        "next_cursor": next_cursor
+    }
@@ -1,68 +1,47 @@
-<<<<<<< HEAD
-from fastapi import APIRouter
-
-router = APIRouter()
-
-@router.get("/")
-async def get_payroll():
-    return {"message": "Payroll API"}
-=======
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-
-from app.db.session import SessionLocal
-from app.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from typing import Literal, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import not_modified
+from app.api.dependencies import Principal, get_current_principal, get_employee_profile
+from app.api.export import export_format, streaming_export
+from app.api.pagination import PageParams, fetch_page, page_params
+from app.db.session import get_db
 from app.models.employee import EmployeeProfile
 from app.models.payroll import Payroll
+from app.schemas.page import Page
+from app.schemas.payroll import PayrollOut, PayrollRunRequest, PayslipPrerenderRequest
+from app.services.dashboard import invalidate_dashboard
+from app.services.payroll_run import run_monthly_payroll
+from app.services.payslip_render import MEDIA_TYPES
+from app.services.payslips import get_payslip, payslip_data, payslip_query, prerender
+from app.services.versions import bump
 
 router = APIRouter()
 
 
-# ---------------- DB Dependency ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-# ---------------- Helpers ----------------
-def get_user(db: Session, user_id: int):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return user
-
-
-def get_employee_profile(db: Session, user_id: int):
-    employee = db.query(EmployeeProfile).filter(
-        EmployeeProfile.user_id == user_id
-    ).first()
-    if not employee:
-        raise HTTPException(status_code=400, detail="Employee profile not found")
-    return employee
-
-
 # ---------------- HR Creates Payroll ----------------
 @router.post("/create")
-def create_payroll(
-    user_id: int,          # HR user_id
+async def create_payroll(
     employee_id: int,      # employee_profiles.id
     basic_salary: int,
     deductions: int,
     month: str,
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    hr = get_user(db, user_id)
-
-    if hr.role != "admin":
+    if principal.role != "admin":
         raise HTTPException(status_code=403, detail="Only HR can create payroll")
 
-    employee = db.query(EmployeeProfile).filter(
-        EmployeeProfile.id == employee_id,
-        EmployeeProfile.company_id == hr.company_id
-    ).first()
+    employee = await db.scalar(
+        select(EmployeeProfile).where(
+            EmployeeProfile.id == employee_id,
+            EmployeeProfile.company_id == principal.company_id
+        )
+    )
 
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -78,8 +57,14 @@ def create_payroll(
     )
 
     db.add(payroll)
-    db.commit()
-    db.refresh(payroll)
+    await bump(db, "payroll", [employee.id])
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Payroll already exists for this month")
+    await db.refresh(payroll)
+    invalidate_dashboard(principal.company_id)
 
     return {
         "message": "Payroll created successfully",
@@ -88,40 +73,148 @@ def create_payroll(
     }
 
 
+# ---------------- HR Runs Monthly Payroll ----------------
+@router.post("/run")
+async def run_payroll(
+    payload: PayrollRunRequest,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can run payroll")
+
+    summary = await run_monthly_payroll(db, principal.company_id, payload.month, payload.department)
+    invalidate_dashboard(principal.company_id)
+
+    return {
+        "message": "Payroll run completed",
+        **summary
+    }
+
+
 # ---------------- Employee Views Own Payroll ----------------
-@router.get("/me")
-def my_payroll(
-    user_id: int,
-    db: Session = Depends(get_db)
+@router.get("/me", response_model=Page[PayrollOut])
+async def my_payroll(
+    request: Request,
+    response: Response,
+    month: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    user = get_user(db, user_id)
-    employee = get_employee_profile(db, user.id)
+    employee = await get_employee_profile(db, principal.user_id)
+    unchanged = await not_modified(request, response, db, employee.id, "payroll")
+    if unchanged:
+        return unchanged
 
-    payrolls = db.query(Payroll).filter(
-        Payroll.employee_id == employee.id
-    ).order_by(Payroll.id.desc()).all()
+    query = select(Payroll).where(Payroll.employee_id == employee.id)
+    if month:
+        query = query.where(Payroll.month == month)
 
-    return payrolls
+    return await fetch_page(db, query, (Payroll.id,), page)
 
 
 # ---------------- HR Views Company Payroll ----------------
-@router.get("/company")
-def company_payroll(
-    user_id: int,
-    db: Session = Depends(get_db)
+@router.get("/company", response_model=Page[PayrollOut])
+async def company_payroll(
+    month: Optional[str] = None,
+    department: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    hr = get_user(db, user_id)
-
-    if hr.role != "admin":
+    if principal.role != "admin":
         raise HTTPException(status_code=403, detail="Only HR can view payroll")
 
-    payrolls = (
-        db.query(Payroll)
+    query = (
+        select(Payroll)
+        .join(EmployeeProfile, Payroll.employee_id == EmployeeProfile.id)
+        .where(EmployeeProfile.company_id == principal.company_id)
+    )
+    if month:
+        query = query.where(Payroll.month == month)
+    if department:
+        query = query.where(EmployeeProfile.department == department)
+
+    return await fetch_page(db, query, (Payroll.id,), page)
+
+
+# ---------------- HR Exports Company Payroll ----------------
+@router.get("/company/export")
+async def export_company_payroll(
+    month: Optional[str] = None,
+    department: Optional[str] = None,
+    fmt: str = Depends(export_format),
+    principal: Principal = Depends(get_current_principal)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can export payroll")
+
+    query = (
+        select(
+            Payroll.id,
+            Payroll.month,
+            EmployeeProfile.employee_code,
+            EmployeeProfile.full_name,
+            EmployeeProfile.department,
+            Payroll.basic_salary,
+            Payroll.deductions,
+            Payroll.net_salary
+        )
         .join(EmployeeProfile, Payroll.employee_id == EmployeeProfile.id)
-        .filter(EmployeeProfile.company_id == hr.company_id)
-        .order_by(Payroll.id.desc())
-        .all()
+        .where(EmployeeProfile.company_id == principal.company_id)
+        .order_by(Payroll.id)
+    )
+    if month:
+        query = query.where(Payroll.month == month)
+    if department:
+        query = query.where(EmployeeProfile.department == department)
+
+    return streaming_export(query, fmt, f"payroll-{month or 'all'}")
+
+
+# ---------------- Payslip Download ----------------
+@router.get("/{payroll_id}/payslip")
+async def download_payslip(
+    payroll_id: int,
+    format: Literal["html", "pdf"] = Query("pdf"),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    row = (await db.execute(
+        payslip_query(principal.company_id).where(Payroll.id == payroll_id)
+    )).first()
+
+    # Employees only see their own payslips; HR sees the whole company's
+    if row and principal.role != "admin":
+        employee = await get_employee_profile(db, principal.user_id)
+        if row.employee_id != employee.id:
+            row = None
+    if not row:
+        raise HTTPException(status_code=404, detail="Payslip not found")
+
+    path = await get_payslip(payslip_data(row), format)
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[format],
+        filename=f"payslip-{row.employee_code}-{row.month or 'undated'}.{format}",
+        content_disposition_type="inline" if format == "html" else "attachment"
     )
 
-    return payrolls
->>>>>>> d84000d7c096f156e71cba7eafa99c7359a1099b
+
+# ---------------- HR Pre-Renders A Month's Payslips ----------------
+@router.post("/payslips/prerender")
+async def prerender_payslips(
+    payload: PayslipPrerenderRequest,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can pre-render payslips")
+
+    summary = await prerender(db, principal.company_id, payload.month, payload.format)
+
+    return {
+        "message": "Payslips pre-rendered",
+        **summary
+    }
@@ -1,77 +1,52 @@
-<<<<<<< HEAD
-from fastapi import APIRouter
-
-router = APIRouter()
-
-@router.get("/")
-async def get_reports():
-    return {"message": "Reports API"}
-=======
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 from datetime import date
+from typing import Literal, Optional
 
-from app.db.session import SessionLocal
-from app.models.user import User
-from app.models.employee import EmployeeProfile
-from app.models.attendance import Attendance
-from app.models.leave import LeaveRequest
-from app.models.payroll import Payroll
-
-router = APIRouter()
-
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-# ---------------- DB Dependency ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.api.dependencies import Principal, get_current_principal
+from app.core import config
+from app.db.session import get_db
+from app.services.analytics import attendance_analytics, window_months
+from app.services.attendance_rollup import month_key
+from app.services.dashboard import get_dashboard
 
+router = APIRouter()
 
-# ---------------- Helper ----------------
-def get_user(db: Session, user_id: int):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return user
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
 
 
 # ---------------- HR Dashboard Report ----------------
 @router.get("/dashboard")
-def hr_dashboard(
-    user_id: int,
-    db: Session = Depends(get_db)
+async def hr_dashboard(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
-    hr = get_user(db, user_id)
-
-    if hr.role != "admin":
+    if principal.role != "admin":
         raise HTTPException(status_code=403, detail="Only HR can view dashboard")
 
-    total_employees = db.query(EmployeeProfile).filter(
-        EmployeeProfile.company_id == hr.company_id
-    ).count()
-
-    today_attendance = db.query(Attendance).filter(
-        Attendance.date == date.today()
-    ).count()
+    return await get_dashboard(db, principal.company_id)
 
-    pending_leaves = db.query(LeaveRequest).filter(
-        LeaveRequest.status == "pending"
-    ).count()
 
-    total_payrolls = (
-        db.query(Payroll)
-        .join(EmployeeProfile, Payroll.employee_id == EmployeeProfile.id)
-        .filter(EmployeeProfile.company_id == hr.company_id)
-        .count()
-    )
-
-    return {
-        "total_employees": total_employees,
-        "today_attendance": today_attendance,
-        "pending_leaves": pending_leaves,
-        "total_payrolls_generated": total_payrolls
-    }
->>>>>>> d84000d7c096f156e71cba7eafa99c7359a1099b
+# ---------------- HR Attendance And Leave Analytics ----------------
+@router.get("/analytics")
+async def hr_analytics(
+    date_from: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="YYYY-MM, defaults to 11 months ago"),
+    date_to: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="YYYY-MM, defaults to this month"),
+    dimension: Literal["department", "month", "department_month"] = "department_month",
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    if principal.role != "admin":
+        raise HTTPException(status_code=403, detail="Only HR can view analytics")
+
+    date_to = date_to or month_key(date.today())
+    if date_from is None:
+        year, month = map(int, date_to.split("-"))
+        date_from = f"{year - 1}-{month + 1:02d}" if month < 12 else f"{year}-01"
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from cannot be after date_to")
+    if len(window_months(date_from, date_to)) > config.ANALYTICS_MAX_MONTHS:
+        raise HTTPException(status_code=400, detail=f"Window cannot exceed {config.ANALYTICS_MAX_MONTHS} months")
+
+    return await attendance_analytics(db, principal.company_id, date_from, date_to, dimension)
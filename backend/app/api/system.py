@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import get_admin_principal, get_token_cache_stats
+from app.db.identity_cache import get_identity_cache_stats
+from app.db.session import get_pool_stats
+from app.services.analytics import get_analytics_cache_stats
+from app.services.dashboard import get_dashboard_cache_stats
+from app.services.payslips import get_payslip_stats
+from app.services.punch_buffer import get_punch_buffer_stats
+
+# Process-wide pool, cache and queue state: HR admins only
+router = APIRouter(dependencies=[Depends(get_admin_principal)])
+
+
+# ---------------- DB Pool Statistics ----------------
+@router.get("/db-pool")
+async def db_pool_stats():
+    return get_pool_stats()
+
+
+# ---------------- In-Process Cache Statistics ----------------
+@router.get("/caches")
+async def cache_stats():
+    return {
+        "tokens": get_token_cache_stats(),
+        **get_identity_cache_stats(),
+        "dashboard": get_dashboard_cache_stats(),
+        "analytics": get_analytics_cache_stats()
+    }
+
+
+# ---------------- Punch Write Buffer Statistics ----------------
+@router.get("/punch-buffer")
+async def punch_buffer_stats():
+    return get_punch_buffer_stats()
+
+
+# ---------------- Payslip Render Statistics ----------------
+@router.get("/payslips")
+async def payslip_stats():
+    return get_payslip_stats()
@@ -0,0 +1,98 @@
+import os
+from datetime import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Database
+DATABASE_URL = os.getenv("DATABASE_URL")
+# Used by the API handlers; derived from DATABASE_URL (asyncpg / aiosqlite) when unset
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Connection pool (ignored for SQLite, which uses SQLAlchemy's default pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+
+# Per-request statement timeout (PostgreSQL only, 0 disables)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+# Verified access tokens kept in memory so repeat requests skip signature checks
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "300"))  # seconds
+
+# User / EmployeeProfile snapshots cached per process
+IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", "10000"))
+IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", "60"))  # seconds
+
+# Streaming exports
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))  # rows fetched per server-side cursor round-trip
+EXPORT_STATEMENT_TIMEOUT_MS = int(os.getenv("EXPORT_STATEMENT_TIMEOUT_MS", "0"))  # 0 disables
+
+# HR dashboard counters, cached per company and evicted by every write that changes them
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "30"))  # seconds
+
+# Check-ins after this local time count as late arrivals in the monthly rollup.
+# Changing it applies to new check-ins; run scripts.rebuild_attendance_rollup to restate history.
+ATTENDANCE_LATE_AFTER = time.fromisoformat(os.getenv("ATTENDANCE_LATE_AFTER", "09:30"))
+
+# Payroll run deductions, applied to EmployeeProfile.salary (monthly wage).
+# Defaults: employee PF at 12% of basic (basic = 40% of wage) plus professional tax.
+PAYROLL_DEDUCTION_RATE = float(os.getenv("PAYROLL_DEDUCTION_RATE", "0.048"))
+PAYROLL_FIXED_DEDUCTION = int(os.getenv("PAYROLL_FIXED_DEDUCTION", "200"))
+# Approved leave of these types is deducted as loss of pay (salary / days in month per day),
+# as are absences recorded in attendance (status "absent", or "half-day" at 0.5). Days with
+# no attendance row are not absences: check-in/out never records one.
+PAYROLL_UNPAID_LEAVE_TYPES = [t.strip() for t in os.getenv("PAYROLL_UNPAID_LEAVE_TYPES", "unpaid").split(",") if t.strip()]
+
+# Payslip documents: rendered in a process pool, cached on disk by content hash
+PAYSLIP_CACHE_DIR = os.getenv("PAYSLIP_CACHE_DIR", "./payslip_cache")
+PAYSLIP_RENDER_WORKERS = int(os.getenv("PAYSLIP_RENDER_WORKERS", "2"))
+
+# Bulk employee import
+EMPLOYEE_IMPORT_MAX_ROWS = int(os.getenv("EMPLOYEE_IMPORT_MAX_ROWS", "10000"))
+
+# Time-clock ingestion (kiosks, badge readers)
+PUNCH_BATCH_MAX = int(os.getenv("PUNCH_BATCH_MAX", "20000"))  # punches per upload
+PUNCH_CLOCK_SKEW = int(os.getenv("PUNCH_CLOCK_SKEW", "300"))  # seconds a device clock may run ahead
+
+# Check-in/check-out write path.
+#   PUNCH_WRITE_MODE: "direct" commits every punch; "buffered" queues punches
+#   and group-commits them from a background task.
+#   PUNCH_DURABILITY (buffered only): "commit" answers once the punch's batch
+#   is committed; "queued" answers on enqueue (faster, a crash loses the queue).
+PUNCH_WRITE_MODE = os.getenv("PUNCH_WRITE_MODE", "direct")
+PUNCH_DURABILITY = os.getenv("PUNCH_DURABILITY", "commit")
+PUNCH_FLUSH_INTERVAL_MS = int(os.getenv("PUNCH_FLUSH_INTERVAL_MS", "20"))
+PUNCH_FLUSH_MAX_ROWS = int(os.getenv("PUNCH_FLUSH_MAX_ROWS", "500"))
+PUNCH_QUEUE_MAX = int(os.getenv("PUNCH_QUEUE_MAX", "10000"))  # full queue answers 503
+
+# Leave days credited per month by the accrual run, per leave type.
+# Only these types are balance-checked; any other type (e.g. unpaid) is not.
+LEAVE_MONTHLY_ACCRUAL = {
+    leave_type.strip(): int(days)
+    for leave_type, days in (
+        item.split(":") for item in os.getenv("LEAVE_MONTHLY_ACCRUAL", "paid:2,sick:1").split(",") if item
+    )
+}
+
+# Longest leave a single request may span (calendar days)
+LEAVE_MAX_DAYS = int(os.getenv("LEAVE_MAX_DAYS", "90"))
+
+LEAVE_DECISION_BATCH_MAX = int(os.getenv("LEAVE_DECISION_BATCH_MAX", "1000"))  # items per bulk approve/reject
+
+# Team availability calendar: default and largest window (days)
+LEAVE_CALENDAR_DEFAULT_DAYS = int(os.getenv("LEAVE_CALENDAR_DEFAULT_DAYS", "56"))
+LEAVE_CALENDAR_MAX_DAYS = int(os.getenv("LEAVE_CALENDAR_MAX_DAYS", "366"))
+
+# HR analytics reports, cached per (company, window, dimension)
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "300"))  # seconds
+ANALYTICS_MAX_MONTHS = int(os.getenv("ANALYTICS_MAX_MONTHS", "24"))
+
+# Prometheus-style /metrics: per-route latency and status counts, DB queries and
+# time per request, pool and threadpool saturation. "0" disables collection.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_LATENCY_BUCKETS = [
+    float(b) for b in os.getenv("METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10").split(",")
+]  # seconds
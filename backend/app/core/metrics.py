@@ -0,0 +1,182 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from app.core import config
+
+
+# ---------------- Metric Types ----------------
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    """Monotonic counter per label tuple."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, _labels(self.labels, labels), value
+
+
+class Gauge(Counter):
+    """Current value per label tuple; set directly, or moved up and down."""
+
+    kind = "gauge"
+
+    def set(self, labels: tuple = (), value: float = 0):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label tuple, as Prometheus expects."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            snapshot = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        names = self.labels + ("le",)
+        for labels, (counts, total) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket", _labels(names, labels + (le,)), cumulative
+            yield f"{self.name}_sum", _labels(self.labels, labels), total
+            yield f"{self.name}_count", _labels(self.labels, labels), cumulative
+
+
+# ---------------- Registry ----------------
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"),
+    config.METRICS_LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests being served.")
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements issued per HTTP request, by route.", ("method", "route"),
+    (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request, by route.", ("method", "route"),
+    config.METRICS_LATENCY_BUCKETS
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed by the API engine, requests and background tasks.")
+DB_QUERY_SECONDS = Counter("db_query_seconds_total", "Time spent in SQL statements by the API engine.")
+
+METRICS = [REQUESTS, REQUEST_SECONDS, REQUESTS_IN_PROGRESS, REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, DB_QUERIES, DB_QUERY_SECONDS]
+
+# [queries, seconds] of the request being served; read by the engine hooks
+request_db_stats: ContextVar[Optional[list]] = ContextVar("request_db_stats", default=None)
+
+
+def record_query(seconds: float):
+    DB_QUERIES.inc()
+    DB_QUERY_SECONDS.inc(amount=seconds)
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += seconds
+
+
+def render(extra: list = ()) -> str:
+    """Prometheus text exposition (0.0.4) of the registry plus scrape-time gauges."""
+    lines = []
+    for metric in list(METRICS) + list(extra):
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines += [f"{name}{labels} {value}" for name, labels, value in metric.samples()]
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- Middleware ----------------
+def route_template(scope) -> str:
+    # FastAPI 0.143+ keeps included routes unprefixed and records the full
+    # template (e.g. /api/leave/{leave_id}/approve) on the effective route
+    # context; older versions copy routes with the prefix into scope["route"].
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each HTTP request under its route template.
+
+    The label is the matched route's template, not the raw path, so label
+    cardinality stays bounded; requests that match no route are counted as
+    "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        db_stats = [0, 0.0]
+        token = request_db_stats.set(db_stats)
+        REQUESTS_IN_PROGRESS.inc(amount=1)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_db_stats.reset(token)
+            REQUESTS_IN_PROGRESS.inc(amount=-1)
+
+            labels = (scope["method"], route_template(scope))
+            REQUESTS.inc(labels + (str(status),))
+            REQUEST_SECONDS.observe(labels, elapsed)
+            REQUEST_DB_QUERIES.observe(labels, db_stats[0])
+            REQUEST_DB_SECONDS.observe(labels, db_stats[1])
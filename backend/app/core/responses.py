@@ -0,0 +1,17 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """Default response class: orjson instead of json.dumps for dict returns.
+
+    Routes with a response_model never get here; FastAPI dumps those straight
+    to bytes through the Pydantic schema. This covers the remaining
+    {"message": ..., **summary} style returns, already made JSON-safe by
+    jsonable_encoder. NumPy scalars pass through unconverted.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -25,3 +25,7 @@ def create_access_token(data: dict) -> str:
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+def decode_access_token(token: str) -> dict:
+    # Raises jose.JWTError on a bad signature, malformed token or expired "exp"
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -0,0 +1,41 @@
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.dialects import postgresql, sqlite
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert_insert(db, table):
+    """INSERT construct for the session's dialect, with on_conflict_do_nothing/do_update."""
+    dialect = db.bind.dialect.name
+    if dialect not in _INSERTS:
+        raise RuntimeError(f"ON CONFLICT inserts are not supported on '{dialect}'")
+    return _INSERTS[dialect](table)
+
+
+def month_of(db, column):
+    """'YYYY-MM' of a DATE column, in the session's SQL dialect."""
+    if db.bind.dialect.name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
+def _seconds_of_day(db, column):
+    if db.bind.dialect.name == "postgresql":
+        return (
+            func.extract("hour", column) * 3600
+            + func.extract("minute", column) * 60
+            + func.floor(func.extract("second", column))
+        )
+    return func.strftime("%s", column)
+
+
+def minutes_between(db, start, end):
+    """Whole minutes from one TIME column to another, ignoring fractional
+    seconds (NULL if either is NULL)."""
+    seconds = _seconds_of_day(db, end) - _seconds_of_day(db, start)
+    if db.bind.dialect.name == "postgresql":
+        return cast(func.trunc(seconds / 60), Integer)
+    return cast(seconds / 60, Integer)
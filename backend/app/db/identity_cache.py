@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import config
+from app.core.cache import TTLCache
+from app.models.employee import EmployeeProfile
+from app.models.user import User
+
+# Both caches are keyed by users.id (profiles are always looked up by user_id)
+_users = TTLCache(maxsize=config.IDENTITY_CACHE_SIZE, ttl=config.IDENTITY_CACHE_TTL)
+_profiles = TTLCache(maxsize=config.IDENTITY_CACHE_SIZE, ttl=config.IDENTITY_CACHE_TTL)
+
+
+# ---------------- Snapshots ----------------
+# Immutable copies of the row, safe to share between requests and sessions.
+@dataclass(frozen=True)
+class UserSnapshot:
+    id: int
+    company_id: int
+    email: str
+    full_name: str
+    role: str
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class EmployeeProfileSnapshot:
+    id: int
+    user_id: int
+    company_id: int
+    employee_code: str
+    full_name: str
+    phone: Optional[str]
+    address: Optional[str]
+    job_title: Optional[str]
+    department: Optional[str]
+    salary: Optional[int]
+    year_of_joining: Optional[int]
+
+
+def _snapshot(cls, row):
+    return cls(**{name: getattr(row, name) for name in cls.__dataclass_fields__})
+
+
+# ---------------- Loaders ----------------
+async def load_user(db: AsyncSession, user_id: int) -> Optional[UserSnapshot]:
+    user = _users.get(user_id)
+    if user is None:
+        row = await db.scalar(select(User).where(User.id == user_id))
+        if row is None:
+            return None
+        user = _snapshot(UserSnapshot, row)
+        _users.set(user_id, user)
+    return user
+
+
+async def load_employee_profile(db: AsyncSession, user_id: int) -> Optional[EmployeeProfileSnapshot]:
+    profile = _profiles.get(user_id)
+    if profile is None:
+        row = await db.scalar(
+            select(EmployeeProfile).where(EmployeeProfile.user_id == user_id)
+        )
+        if row is None:
+            return None
+        profile = _snapshot(EmployeeProfileSnapshot, row)
+        _profiles.set(user_id, profile)
+    return profile
+
+
+# ---------------- Invalidation ----------------
+def invalidate_user(user_id: int):
+    """Drop cached user/profile snapshots; call after writes that bypass the ORM unit of work."""
+    _users.invalidate(user_id)
+    _profiles.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_identity_writes(session, flush_context):
+    touched = session.info.setdefault("identity_writes", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            touched.add(obj.id)
+        elif isinstance(obj, EmployeeProfile):
+            touched.add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_identity_writes(session):
+    # Only evict once the write is durable, so no other request can re-cache the old row
+    for user_id in session.info.pop("identity_writes", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_identity_writes(session):
+    session.info.pop("identity_writes", None)
+
+
+def get_identity_cache_stats() -> dict:
+    return {
+        "users": _users.stats(),
+        "employee_profiles": _profiles.stats(),
+    }
@@ -1,15 +1,160 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
+import threading
+import time
 
-load_dotenv()
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+from app.core import config
+from app.core.metrics import record_query
 
-engine = create_engine(DATABASE_URL)
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+
+    return {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for '{backend}', set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Sync engine: scripts, migrations and benchmarks
+engine = create_engine(config.DATABASE_URL, **_engine_options(config.DATABASE_URL))
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
+
+# Async engine: API handlers
+ASYNC_DATABASE_URL = config.ASYNC_DATABASE_URL or _async_url(config.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+# ---------------- Statement Timeout ----------------
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    # SET LOCAL only lasts for the current transaction, so it is re-applied
+    # every time the session begins a new one (e.g. after a commit).
+    timeout_ms = session.info.get("statement_timeout_ms")
+    if timeout_ms and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+# ---------------- Pool Statistics ----------------
+_stats_lock = threading.Lock()
+_stats = {
+    "checkouts": 0,
+    "checkout_timeouts": 0,
+    "waits": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+}
+
+
+@event.listens_for(async_engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    with _stats_lock:
+        _stats["checkouts"] += 1
+
+
+def _record_wait(seconds: float, timed_out: bool = False):
+    with _stats_lock:
+        _stats["waits"] += 1
+        _stats["wait_seconds_total"] += seconds
+        _stats["wait_seconds_max"] = max(_stats["wait_seconds_max"], seconds)
+        if timed_out:
+            _stats["checkout_timeouts"] += 1
+
+
+def get_pool_stats() -> dict:
+    pool = async_engine.sync_engine.pool
+
+    with _stats_lock:
+        stats = dict(_stats)
+
+    waits = stats["waits"]
+    stats["wait_seconds_avg"] = stats["wait_seconds_total"] / waits if waits else 0.0
+
+    stats.update({
+        "pool": type(pool).__name__,
+        "size": pool.size() if hasattr(pool, "size") else None,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+        "max_overflow": getattr(pool, "_max_overflow", None),
+    })
+    return stats
+
+
+# ---------------- Query Metrics ----------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_query(time.perf_counter() - conn.info["query_started"].pop())
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        record_query(time.perf_counter() - started.pop())
+
+
+if config.METRICS_ENABLED:
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(async_engine.sync_engine, "handle_error", _handle_error)
+
+
+# ---------------- DB Dependency ----------------
+def session_provider(statement_timeout_ms: int = config.DB_STATEMENT_TIMEOUT_MS):
+    """Build a get_db dependency with its own statement timeout.
+
+    The connection is checked out up front so that pool wait time is measured
+    and pool exhaustion surfaces as a 503 instead of a hung request.
+    """
+    async def get_db():
+        async with AsyncSessionLocal() as db:
+            db.info["statement_timeout_ms"] = statement_timeout_ms
+
+            started = time.perf_counter()
+            try:
+                await db.connection()
+            except exc.TimeoutError:
+                _record_wait(time.perf_counter() - started, timed_out=True)
+                raise HTTPException(status_code=503, detail="Database is busy, please retry")
+            _record_wait(time.perf_counter() - started)
+
+            yield db
+
+    return get_db
+
+
+get_db = session_provider()
@@ -1,13 +1,23 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-<<<<<<< HEAD
-from app.api import auth, employees, attendance, leave, payroll, reports
-=======
-from app.api import auth,employees,attendance,leave,payroll,reports
+from app.api import auth,employees,attendance,leave,payroll,reports,system,metrics
+from app.core import config
+from app.core.metrics import MetricsMiddleware
+from app.core.responses import OrjsonResponse
+from app.services.payslips import shutdown_render_pool
+from app.services.punch_buffer import punch_buffer
 
->>>>>>> d84000d7c096f156e71cba7eafa99c7359a1099b
 
-app = FastAPI(title="Dayflow HRMS")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Commit any buffered punches before the process exits
+    await punch_buffer.drain()
+    shutdown_render_pool()
+
+
+app = FastAPI(title="Dayflow HRMS", lifespan=lifespan, default_response_class=OrjsonResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,12 +26,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so the timing covers CORS and every other layer
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(employees.router,prefix="/employees",tags=["Employees"])
 app.include_router(attendance.router,prefix="/attendance",tags=["Attendance"])
 app.include_router(leave.router,prefix="/leave",tags=["Leave"])
 app.include_router(payroll.router,prefix="/payroll",tags=["Payroll"])
 app.include_router(reports.router,prefix="/reports",tags=["Reports"])
+app.include_router(system.router,prefix="/system",tags=["System"])
+app.include_router(metrics.router,tags=["System"])
 
 
 # Include routers
@@ -31,6 +46,7 @@ app.include_router(attendance.router, prefix="/api/attendance", tags=["Attendanc
 app.include_router(leave.router, prefix="/api/leave", tags=["Leave"])
 app.include_router(payroll.router, prefix="/api/payroll", tags=["Payroll"])
 app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
+app.include_router(system.router, prefix="/api/system", tags=["System"])
 
 @app.get("/")
 def root():
@@ -0,0 +1,10 @@
+from .company import Company
+from .user import User
+from .employee import EmployeeProfile
+from .attendance import Attendance
+from .leave import LeaveRequest
+from .payroll import Payroll
+from .attendance_rollup import AttendanceMonthly
+from .leave_ledger import LeaveBalance, LeaveLedgerEntry
+from .leave_calendar import LeaveCalendarDay
+from .collection_version import CollectionVersion
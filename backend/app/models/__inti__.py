@@ -1,6 +0,0 @@
-from .company import Company
-from .user import User
-from .employee import EmployeeProfile
-from .attendance import Attendance
-from .leave import LeaveRequest
-from .payroll import Payroll
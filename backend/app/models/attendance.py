@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Index, UniqueConstraint
 from app.db.base import Base
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # check-in/out lookups and the per-employee history, one row per day
+        UniqueConstraint("employee_id", "date", name="uq_attendance_employee_date"),
+        Index("ix_attendance_date", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
+from app.db.base import Base
+
+# Per-employee monthly totals, kept current by every attendance/leave writer.
+# Rebuild from the source tables with scripts.rebuild_attendance_rollup.
+class AttendanceMonthly(Base):
+    __tablename__ = "attendance_monthly"
+    __table_args__ = (
+        UniqueConstraint("employee_id", "month", name="uq_attendance_monthly_employee_month"),
+        # company-wide month summary, keyset on employee_id
+        Index("ix_attendance_monthly_company_month", "company_id", "month", "employee_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    employee_id = Column(Integer, ForeignKey("employee_profiles.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+
+    month = Column(String, nullable=False)  # YYYY-MM
+
+    present_days = Column(Integer, nullable=False, server_default="0")
+    half_days = Column(Integer, nullable=False, server_default="0")
+    absent_days = Column(Integer, nullable=False, server_default="0")
+    leave_days = Column(Integer, nullable=False, server_default="0")  # approved leave, calendar days
+    minutes_worked = Column(Integer, nullable=False, server_default="0")
+    late_days = Column(Integer, nullable=False, server_default="0")  # checked in after ATTENDANCE_LATE_AFTER
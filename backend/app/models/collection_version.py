@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.db.base import Base
+
+# Per-employee change counter of each collection served under /me
+# (attendance | leave | payroll), bumped in every writer's transaction.
+# Drives the ETags of the list endpoints; a missing row reads as version 0.
+class CollectionVersion(Base):
+    __tablename__ = "collection_versions"
+
+    employee_id = Column(Integer, ForeignKey("employee_profiles.id"), primary_key=True)
+    collection = Column(String, primary_key=True)
+
+    version = Column(Integer, nullable=False, server_default="0")
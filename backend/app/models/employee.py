@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from app.db.base import Base
 
 class EmployeeProfile(Base):
     __tablename__ = "employee_profiles"
+    __table_args__ = (
+        # every company-scoped join goes through company_id
+        Index("ix_employee_profiles_company_department", "company_id", "department"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
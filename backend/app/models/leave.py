@@ -1,8 +1,24 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index, func, literal_column, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from app.db.base import Base
 
 class LeaveRequest(Base):
     __tablename__ = "leave_requests"
+    __table_args__ = (
+        # per-employee history, newest first (keyset on start_date, id)
+        Index("ix_leave_requests_employee_start", "employee_id", "start_date", "id"),
+        # overlap check: only leaves ending on or after a date
+        Index("ix_leave_requests_employee_end", "employee_id", "end_date"),
+        Index("ix_leave_requests_status", "status"),
+        # no two pending/approved leaves of one employee share a day (PostgreSQL, needs btree_gist)
+        ExcludeConstraint(
+            ("employee_id", "="),
+            (func.daterange(literal_column("start_date"), literal_column("end_date"), literal_column("'[]'")), "&&"),
+            name="ex_leave_requests_no_overlap",
+            using="gist",
+            where=text("status IN ('pending', 'approved')")
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -13,6 +29,6 @@ class LeaveRequest(Base):
     start_date = Column(Date)
     end_date = Column(Date)
 
-    status = Column(String, default="pending")# (pending | approved | rejected)
+    status = Column(String, default="pending")# (pending | approved | rejected | cancelled)
 
     admin_comment = Column(String)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index, UniqueConstraint
+from app.db.base import Base
+
+# One row per approved leave per calendar day, kept current by approve,
+# reject and cancel, so "who is out between X and Y" is one range read.
+# Rebuild from leave_requests with scripts.rebuild_leave_calendar.
+class LeaveCalendarDay(Base):
+    __tablename__ = "leave_calendar"
+    __table_args__ = (
+        UniqueConstraint("leave_request_id", "day", name="uq_leave_calendar_leave_day"),
+        # company calendar over a date window
+        Index("ix_leave_calendar_company_day", "company_id", "day", "employee_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    employee_id = Column(Integer, ForeignKey("employee_profiles.id"), nullable=False)
+
+    leave_request_id = Column(Integer, ForeignKey("leave_requests.id"), nullable=False)
+    leave_type = Column(String, nullable=False)
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class LeaveLedgerEntry(Base):
+    __tablename__ = "leave_ledger"
+    __table_args__ = (
+        # one accrual per employee, type and period; NULL periods never collide
+        UniqueConstraint("employee_id", "leave_type", "period", name="uq_leave_ledger_accrual"),
+        Index("ix_leave_ledger_employee_type_id", "employee_id", "leave_type", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    employee_id = Column(Integer, ForeignKey("employee_profiles.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    leave_type = Column(String, nullable=False)
+
+    delta = Column(Integer, nullable=False)  # days: + accrual/credit, - debit
+    reason = Column(String, nullable=False)  # accrual | approval | rejection | cancellation
+
+    leave_request_id = Column(Integer, ForeignKey("leave_requests.id"))
+    period = Column(String)  # YYYY-MM, accruals only
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Running totals of the ledger, one row per employee and leave type, so a
+# balance check is a primary-key read however long the history is.
+class LeaveBalance(Base):
+    __tablename__ = "leave_balances"
+
+    employee_id = Column(Integer, ForeignKey("employee_profiles.id"), primary_key=True)
+    leave_type = Column(String, primary_key=True)
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+
+    balance = Column(Integer, nullable=False, server_default="0")  # days available
+    used = Column(Integer, nullable=False, server_default="0")     # days debited net of credits
@@ -1,15 +1,24 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Float, Integer, String, ForeignKey, Index, UniqueConstraint
 from app.db.base import Base
 
 class Payroll(Base):
     __tablename__ = "payroll"
+    __table_args__ = (
+        # one payslip per employee per month
+        UniqueConstraint("employee_id", "month", name="uq_payroll_employee_month"),
+        Index("ix_payroll_employee_id_id", "employee_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     employee_id = Column(Integer, ForeignKey("employee_profiles.id"))
 
     basic_salary = Column(Integer)
-    deductions = Column(Integer)
+    deductions = Column(Integer)          # loss of pay + statutory deductions
     net_salary = Column(Integer)
 
+    # Set by payroll runs; NULL on manually created payslips
+    lop_days = Column(Float)              # unpaid leave + absent days (half-day = 0.5)
+    loss_of_pay = Column(Integer)
+
     month = Column(String)
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime, time
+from typing import List, Literal, Optional
+
+from app.core import config
+
+class Punch(BaseModel):
+    employee_code: str
+    timestamp: datetime      # naive = server local time
+    direction: Literal["in", "out"]
+
+class PunchBatchRequest(BaseModel):
+    punches: List[Punch] = Field(min_length=1, max_length=config.PUNCH_BATCH_MAX)
+
+class AttendanceOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    # Optional wherever the column is nullable: legacy rows may hold NULLs
+    id: int
+    employee_id: Optional[int] = None
+    date: Optional[date]       # no default: a "date = None" would shadow the type
+    check_in_time: Optional[time] = None
+    check_out_time: Optional[time] = None
+    status: Optional[str] = None
+
+class AttendanceMonthlyOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    employee_id: int
+    month: str
+    present_days: int = 0
+    half_days: int = 0
+    absent_days: int = 0
+    leave_days: int = 0
+    minutes_worked: int = 0
+    late_days: int = 0
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Optional
+
+class EmployeeImportRow(BaseModel):
+    email: EmailStr
+    full_name: str = Field(min_length=1)
+    password: Optional[str] = None   # generated when omitted
+    employee_code: Optional[str] = None
+    department: str = "General"
+    job_title: str = "Employee"
+    salary: int = Field(default=0, ge=0)   # monthly wage
+    year_of_joining: Optional[int] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+
+class EmployeeListItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    full_name: str
+    email: str
+    is_active: Optional[bool] = None   # nullable column
+
+class UserProfileOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    full_name: str
+    email: str
+    role: str
+    company_id: int
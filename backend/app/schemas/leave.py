@@ -1,7 +1,39 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import date
+from typing import List, Literal, Optional
+
+from app.core import config
 
 class LeaveApplyRequest(BaseModel):
     leave_type: str          # paid | sick | unpaid
     start_date: date
     end_date: date
+
+class LeaveAccrualRequest(BaseModel):
+    month: str = Field(pattern=r"^\d{4}-(0[1-9]|1[0-2])$")  # YYYY-MM
+
+class LeaveDecision(BaseModel):
+    leave_id: int
+    decision: Literal["approve", "reject"]
+    comment: str = ""
+
+class LeaveDecisionBatch(BaseModel):
+    decisions: List[LeaveDecision] = Field(min_length=1, max_length=config.LEAVE_DECISION_BATCH_MAX)
+
+class LeaveOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    # Optional wherever the column is nullable: legacy rows may hold NULLs
+    id: int
+    employee_id: Optional[int] = None
+    leave_type: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    status: Optional[str] = None
+    admin_comment: Optional[str] = None
+
+class LeaveBalanceOut(BaseModel):
+    leave_type: str
+    balance: int
+    used: int
+    monthly_accrual: int
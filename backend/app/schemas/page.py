@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    # One keyset page, as returned by app.api.pagination.fetch_page
+    items: List[T]
+    next_cursor: Optional[str] = None
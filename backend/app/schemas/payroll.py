@@ -0,0 +1,23 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Literal, Optional
+
+class PayrollRunRequest(BaseModel):
+    month: str = Field(pattern=r"^\d{4}-(0[1-9]|1[0-2])$")  # YYYY-MM
+    department: Optional[str] = None
+
+class PayslipPrerenderRequest(BaseModel):
+    month: str = Field(pattern=r"^\d{4}-(0[1-9]|1[0-2])$")  # YYYY-MM
+    format: Literal["html", "pdf"] = "pdf"
+
+class PayrollOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    # Optional wherever the column is nullable: legacy rows may hold NULLs
+    id: int
+    employee_id: Optional[int] = None
+    month: Optional[str] = None
+    basic_salary: Optional[int] = None
+    deductions: Optional[int] = None
+    net_salary: Optional[int] = None
+    lop_days: Optional[float] = None      # NULL on manually created payslips
+    loss_of_pay: Optional[int] = None
@@ -0,0 +1,214 @@
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.core.cache import TTLCache
+from app.models.attendance_rollup import AttendanceMonthly
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+from app.services.attendance_rollup import month_bounds, month_key
+
+DIMENSIONS = ("department", "month", "department_month")
+_ROLLUP_METRICS = ("present_days", "half_days", "absent_days", "late_days", "minutes_worked")
+_DIGITS = {"attendance_rate": 4, "avg_hours": 2, "late_rate": 4, "leave_utilization": 4}
+
+# Keyed by (company_id, first_month, last_month, dimension); expiry only, as
+# every check-in would otherwise evict a report nobody needs to the minute
+_cache = TTLCache(maxsize=1000, ttl=config.ANALYTICS_CACHE_TTL)
+
+
+@dataclass
+class AnalyticsFrame:
+    """A company's window as columns: one entry per rollup row or leave-month."""
+    months: list                # YYYY-MM, ascending
+    departments: list           # department names, indexed by code
+    employee: np.ndarray        # rollup rows: employee id
+    department: np.ndarray      # rollup rows: department code
+    month: np.ndarray           # rollup rows: index into months
+    metrics: dict               # rollup rows: name -> int64 array
+    leave_department: np.ndarray
+    leave_month: np.ndarray
+    leave_days: np.ndarray
+    leave_tracked: np.ndarray   # bool, counts towards utilization
+
+
+def window_months(first: str, last: str) -> list:
+    months, current = [], month_bounds(first)[0]
+    while month_key(current) <= last:
+        months.append(month_key(current))
+        current = month_bounds(month_key(current))[1] + timedelta(days=1)
+    return months
+
+
+# ---------------- Load ----------------
+def _ordinals(days) -> np.ndarray:
+    return np.fromiter((day.toordinal() for day in days), dtype=np.int64, count=len(days))
+
+
+async def load_frame(db: AsyncSession, company_id: int, months: list) -> AnalyticsFrame:
+    """Three reads: employees' departments, the window's rollup rows, approved leave.
+
+    Core rows (no ORM loading) turned into arrays column by column; dates
+    become day ordinals so the leave/month overlap is integer arithmetic.
+    """
+    first, last = month_bounds(months[0])[0], month_bounds(months[-1])[1]
+    conn = await db.connection()
+
+    employees = (await conn.execute(
+        select(EmployeeProfile.id, EmployeeProfile.department)
+        .where(EmployeeProfile.company_id == company_id)
+    )).all()
+    employee_ids = np.array([row[0] for row in employees], dtype=np.int64)
+    departments, employee_departments = np.unique(
+        np.array([row[1] or "Unassigned" for row in employees], dtype=object), return_inverse=True
+    )
+    # Sorted here, not in SQL, so the read stays on the company index
+    order = np.argsort(employee_ids)
+    employee_ids, employee_departments = employee_ids[order], employee_departments[order]
+
+    def department_of(ids: np.ndarray) -> np.ndarray:
+        return employee_departments[np.searchsorted(employee_ids, ids)]
+
+    rollup = (await conn.execute(
+        select(AttendanceMonthly.employee_id, AttendanceMonthly.month, *(
+            getattr(AttendanceMonthly, column) for column in _ROLLUP_METRICS
+        ))
+        .where(AttendanceMonthly.company_id == company_id, AttendanceMonthly.month.between(months[0], months[-1]))
+    )).all()
+    columns = list(zip(*rollup)) or [()] * (2 + len(_ROLLUP_METRICS))
+    employee = np.array(columns[0], dtype=np.int64)
+
+    leaves = (await conn.execute(
+        select(LeaveRequest.employee_id, LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.leave_type)
+        .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
+        .where(
+            EmployeeProfile.company_id == company_id,
+            LeaveRequest.status == "approved",
+            LeaveRequest.end_date >= first,
+            LeaveRequest.start_date <= last
+        )
+    )).all()
+    leave_columns = list(zip(*leaves)) or [()] * 4
+
+    # Days of each leave inside each month, as one (leaves x months) array
+    starts = _ordinals(leave_columns[1]).reshape(-1, 1)
+    ends = _ordinals(leave_columns[2]).reshape(-1, 1)
+    month_firsts = _ordinals([month_bounds(month)[0] for month in months])
+    month_lasts = _ordinals([month_bounds(month)[1] for month in months])
+    overlap = np.minimum(ends, month_lasts) - np.maximum(starts, month_firsts) + 1
+    leave_rows, leave_months = np.nonzero(overlap > 0)
+
+    tracked_types = list(config.LEAVE_MONTHLY_ACCRUAL)
+    return AnalyticsFrame(
+        months=months,
+        departments=list(departments),
+        employee=employee,
+        department=department_of(employee),
+        month=np.searchsorted(np.array(months), np.array(columns[1], dtype=str)),
+        metrics={
+            column: np.array(values, dtype=np.int64) for column, values in zip(_ROLLUP_METRICS, columns[2:])
+        },
+        leave_department=department_of(np.array(leave_columns[0], dtype=np.int64)[leave_rows]),
+        leave_month=leave_months,
+        leave_days=overlap[leave_rows, leave_months],
+        leave_tracked=np.isin(np.array(leave_columns[3], dtype=object), tracked_types)[leave_rows]
+    )
+
+
+# ---------------- Aggregate ----------------
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+def aggregate(frame: AnalyticsFrame, dimension: str) -> list:
+    """Group-by over the frame with bincount; one dict per non-empty group."""
+    months = len(frame.months)
+    if dimension == "department":
+        groups, key, leave_key = len(frame.departments), frame.department, frame.leave_department
+    elif dimension == "month":
+        groups, key, leave_key = months, frame.month, frame.leave_month
+    else:
+        groups = len(frame.departments) * months
+        key = frame.department * months + frame.month
+        leave_key = frame.leave_department * months + frame.leave_month
+
+    def total(values: np.ndarray, keys: np.ndarray = key) -> np.ndarray:
+        return np.bincount(keys, weights=values, minlength=groups).astype(np.int64)
+
+    sums = {column: total(values) for column, values in frame.metrics.items()}
+
+    # Rollup rows are unique per (employee, month): their count is employee-months
+    employee_months = np.bincount(key, minlength=groups)
+    employees = np.bincount(np.unique(frame.employee * groups + key) % groups, minlength=groups)
+    leave_days = total(frame.leave_days, leave_key)
+    tracked_days = total(frame.leave_days * frame.leave_tracked, leave_key)
+
+    worked = sums["present_days"] + sums["half_days"]
+    recorded = worked + sums["absent_days"]
+    entitlement = employee_months * sum(config.LEAVE_MONTHLY_ACCRUAL.values())
+
+    metrics = {
+        "employees": employees,
+        "present_days": sums["present_days"],
+        "half_days": sums["half_days"],
+        "absent_days": sums["absent_days"],
+        "attendance_rate": _ratio(sums["present_days"] + 0.5 * sums["half_days"], recorded),
+        "avg_hours": _ratio(sums["minutes_worked"] / 60, worked),
+        "late_arrivals": sums["late_days"],
+        "late_rate": _ratio(sums["late_days"], worked),
+        "leave_days": leave_days,
+        "leave_utilization": _ratio(tracked_days, entitlement),
+    }
+
+    rows = []
+    for group in np.nonzero((employee_months > 0) | (leave_days > 0))[0].tolist():
+        row = {}
+        if dimension != "month":
+            row["department"] = frame.departments[group // months if dimension == "department_month" else group]
+        if dimension != "department":
+            row["month"] = frame.months[group % months]
+        for name, values in metrics.items():
+            value = values[group].item()
+            row[name] = round(value, _DIGITS[name]) if name in _DIGITS else value
+        rows.append(row)
+    return rows
+
+
+async def attendance_analytics(db: AsyncSession, company_id: int, first: str, last: str, dimension: str) -> dict:
+    """The report for one dimension, from cache or from a fresh frame.
+
+    Loading dominates, so a miss aggregates and caches every dimension of the
+    window at once; switching dimension afterwards is a cache hit.
+    """
+    report = _cache.get((company_id, first, last, dimension))
+    if report is not None:
+        return report
+
+    started = time.perf_counter()
+    frame = await load_frame(db, company_id, window_months(first, last))
+    loaded_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    reports = {}
+    for each in DIMENSIONS:
+        aggregated = time.perf_counter()
+        groups = aggregate(frame, each)
+        reports[each] = {
+            "date_from": first,
+            "date_to": last,
+            "dimension": each,
+            "groups": groups,
+            "load_ms": loaded_ms,
+            "aggregate_ms": round((time.perf_counter() - aggregated) * 1000, 2),
+        }
+        _cache.set((company_id, first, last, each), reports[each])
+    # Never read back: with a zero TTL or an eviction the entry may already be gone
+    return reports[dimension]
+
+
+def get_analytics_cache_stats() -> dict:
+    return _cache.stats()
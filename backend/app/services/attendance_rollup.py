@@ -0,0 +1,208 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import config
+from app.db.dialect import minutes_between, month_of, upsert_insert
+from app.models.attendance import Attendance
+from app.models.attendance_rollup import AttendanceMonthly
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+
+ROLLUP_COLUMNS = ("present_days", "half_days", "absent_days", "leave_days", "minutes_worked", "late_days")
+ATTENDANCE_COLUMNS = ("present_days", "half_days", "absent_days", "minutes_worked", "late_days")
+_STATUS_COLUMNS = {"present": "present_days", "half-day": "half_days", "absent": "absent_days"}
+
+INSERT_BATCH_SIZE = 1000
+
+
+# ---------------- Helpers ----------------
+def month_key(day: date) -> str:
+    return day.strftime("%Y-%m")
+
+
+def month_bounds(month: str) -> tuple:
+    first = date.fromisoformat(f"{month}-01")
+    last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return first, last
+
+
+def minutes_worked(check_in, check_out) -> int:
+    # Same rule as dialect.minutes_between, so rebuilds match increments
+    seconds = lambda t: t.hour * 3600 + t.minute * 60 + t.second
+    return int((seconds(check_out) - seconds(check_in)) / 60)
+
+
+def leave_days_by_month(start: date, end: date) -> dict:
+    """Calendar days of [start, end] falling in each month."""
+    days, current = {}, start
+    while current <= end:
+        _, last = month_bounds(month_key(current))
+        chunk_end = min(last, end)
+        days[month_key(current)] = (chunk_end - current).days + 1
+        current = chunk_end + timedelta(days=1)
+    return days
+
+
+def _delta(employee_id: int, company_id: int, month: str, **values) -> dict:
+    return {
+        "employee_id": employee_id,
+        "company_id": company_id,
+        "month": month,
+        **{column: values.get(column, 0) for column in ROLLUP_COLUMNS}
+    }
+
+
+# ---------------- Incremental Maintenance ----------------
+async def apply_deltas(db: AsyncSession, deltas: list):
+    """Add per-(employee, month) deltas in the caller's transaction."""
+    merged = {}
+    for delta in deltas:
+        key = (delta["employee_id"], delta["month"])
+        if key in merged:
+            for column in ROLLUP_COLUMNS:
+                merged[key][column] += delta[column]
+        else:
+            merged[key] = dict(delta)
+    if not merged:
+        return
+
+    insert_stmt = upsert_insert(db, AttendanceMonthly)
+    table = AttendanceMonthly.__table__
+    upsert = insert_stmt.on_conflict_do_update(
+        index_elements=["employee_id", "month"],
+        set_={column: table.c[column] + insert_stmt.excluded[column] for column in ROLLUP_COLUMNS}
+    )
+    rows = list(merged.values())
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await db.execute(upsert, rows[start:start + INSERT_BATCH_SIZE])
+
+
+def is_late(check_in) -> bool:
+    return check_in is not None and check_in > config.ATTENDANCE_LATE_AFTER
+
+
+def check_in_delta(employee_id: int, company_id: int, day: date, check_in=None, status: str = "present") -> dict:
+    return _delta(
+        employee_id, company_id, month_key(day),
+        **{_STATUS_COLUMNS[status]: 1, "late_days": int(is_late(check_in))}
+    )
+
+
+def check_out_delta(employee_id: int, company_id: int, day: date, check_in, check_out) -> dict:
+    minutes = minutes_worked(check_in, check_out) if check_in else 0
+    return _delta(employee_id, company_id, month_key(day), minutes_worked=minutes)
+
+
+def leave_deltas(employee_id: int, company_id: int, start: date, end: date, sign: int = 1) -> list:
+    """+sign leave days per month covered by an approved (or un-approved) leave."""
+    return [
+        _delta(employee_id, company_id, month, leave_days=sign * days)
+        for month, days in leave_days_by_month(start, end).items()
+    ]
+
+
+# ---------------- Recompute From Source ----------------
+def _attendance_totals(db, *criteria):
+    month = month_of(db, Attendance.date)
+    counts = [
+        func.count(Attendance.id).filter(Attendance.status == status).label(column)
+        for status, column in _STATUS_COLUMNS.items()
+    ]
+    minutes = func.coalesce(
+        func.sum(minutes_between(db, Attendance.check_in_time, Attendance.check_out_time)), 0
+    )
+    late = func.count(Attendance.id).filter(Attendance.check_in_time > config.ATTENDANCE_LATE_AFTER)
+    return (
+        select(
+            Attendance.employee_id,
+            EmployeeProfile.company_id,
+            month.label("month"),
+            *counts,
+            minutes.label("minutes_worked"),
+            late.label("late_days")
+        )
+        .join(EmployeeProfile, Attendance.employee_id == EmployeeProfile.id)
+        .where(*criteria)
+        .group_by(Attendance.employee_id, EmployeeProfile.company_id, month)
+    )
+
+
+async def refresh_attendance(db: AsyncSession, keys: set):
+    """Recompute the attendance columns of (employee_id, month) keys from source.
+
+    For bulk writers whose effect is not a simple delta (punch uploads widen
+    existing rows). leave_days is left as is. Runs in the caller's transaction.
+    """
+    if not keys:
+        return
+
+    months = sorted({month for _, month in keys})
+    first, _ = month_bounds(months[0])
+    _, last = month_bounds(months[-1])
+    totals = (await db.execute(_attendance_totals(
+        db,
+        Attendance.employee_id.in_({employee_id for employee_id, _ in keys}),
+        Attendance.date.between(first, last)
+    ))).all()
+    rows = [
+        {**row._asdict(), "leave_days": 0}
+        for row in totals if (row.employee_id, row.month) in keys
+    ]
+
+    insert_stmt = upsert_insert(db, AttendanceMonthly)
+    upsert = insert_stmt.on_conflict_do_update(
+        index_elements=["employee_id", "month"],
+        set_={column: insert_stmt.excluded[column] for column in ATTENDANCE_COLUMNS}
+    )
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await db.execute(upsert, rows[start:start + INSERT_BATCH_SIZE])
+
+
+def rebuild(db: Session, company_id: Optional[int] = None, month: Optional[str] = None) -> int:
+    """Recompute attendance_monthly from attendance and approved leave.
+
+    Optionally scoped to one company and/or month. Takes a sync session
+    (scripts, or AsyncSession.run_sync); the caller commits. Returns the
+    number of rollup rows written.
+    """
+    attendance_criteria, leave_criteria, scope = [], [LeaveRequest.status == "approved"], []
+    if company_id:
+        attendance_criteria.append(EmployeeProfile.company_id == company_id)
+        leave_criteria.append(EmployeeProfile.company_id == company_id)
+        scope.append(AttendanceMonthly.company_id == company_id)
+    if month:
+        first, last = month_bounds(month)
+        attendance_criteria.append(Attendance.date.between(first, last))
+        leave_criteria += [LeaveRequest.end_date >= first, LeaveRequest.start_date <= last]
+        scope.append(AttendanceMonthly.month == month)
+
+    db.execute(delete(AttendanceMonthly).where(*scope))
+
+    rows = {
+        (row.employee_id, row.month): {**row._asdict(), "leave_days": 0}
+        for row in db.execute(_attendance_totals(db, *attendance_criteria))
+    }
+
+    leaves = db.execute(
+        select(LeaveRequest.employee_id, EmployeeProfile.company_id, LeaveRequest.start_date, LeaveRequest.end_date)
+        .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
+        .where(*leave_criteria)
+    )
+    for leave in leaves:
+        for leave_month, days in leave_days_by_month(leave.start_date, leave.end_date).items():
+            if month and leave_month != month:
+                continue
+            row = rows.setdefault(
+                (leave.employee_id, leave_month),
+                _delta(leave.employee_id, leave.company_id, leave_month)
+            )
+            row["leave_days"] += days
+
+    values = list(rows.values())
+    for start in range(0, len(values), INSERT_BATCH_SIZE):
+        db.execute(insert(AttendanceMonthly), values[start:start + INSERT_BATCH_SIZE])
+    return len(values)
@@ -0,0 +1,61 @@
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.core.cache import TTLCache
+from app.models.attendance import Attendance
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+from app.models.payroll import Payroll
+
+# Keyed by (company_id, day) so counters never leak across midnight
+_cache = TTLCache(maxsize=10000, ttl=config.DASHBOARD_CACHE_TTL)
+
+
+def _company_count(model, company_id: int, *criteria):
+    return (
+        select(func.count(model.id))
+        .join(EmployeeProfile, model.employee_id == EmployeeProfile.id)
+        .where(EmployeeProfile.company_id == company_id, *criteria)
+        .scalar_subquery()
+    )
+
+
+def dashboard_query(company_id: int, today: date):
+    """All four headline counters for one company as a single SELECT."""
+    return select(
+        select(func.count(EmployeeProfile.id))
+        .where(EmployeeProfile.company_id == company_id)
+        .scalar_subquery()
+        .label("total_employees"),
+        _company_count(Attendance, company_id, Attendance.date == today)
+        .label("today_attendance"),
+        _company_count(LeaveRequest, company_id, LeaveRequest.status == "pending")
+        .label("pending_leaves"),
+        _company_count(Payroll, company_id)
+        .label("total_payrolls_generated"),
+    )
+
+
+async def get_dashboard(db: AsyncSession, company_id: int) -> dict:
+    today = date.today()
+    key = (company_id, today)
+
+    counters = _cache.get(key)
+    if counters is None:
+        row = (await db.execute(dashboard_query(company_id, today))).one()
+        counters = dict(row._mapping)
+        _cache.set(key, counters)
+
+    return dict(counters)
+
+
+def invalidate_dashboard(company_id: int):
+    """Call after committing a write that changes any dashboard counter."""
+    _cache.invalidate((company_id, date.today()))
+
+
+def get_dashboard_cache_stats() -> dict:
+    return _cache.stats()
@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.dialect import upsert_insert
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+from app.models.leave_calendar import LeaveCalendarDay
+
+INSERT_BATCH_SIZE = 1000
+
+
+# ---------------- Helpers ----------------
+def calendar_rows(leave, company_id: int) -> list:
+    """One row per calendar day of the leave, inclusive."""
+    return [
+        {
+            "company_id": company_id,
+            "day": leave.start_date + timedelta(days=offset),
+            "employee_id": leave.employee_id,
+            "leave_request_id": leave.id,
+            "leave_type": leave.leave_type,
+        }
+        for offset in range((leave.end_date - leave.start_date).days + 1)
+    ]
+
+
+# ---------------- Incremental Maintenance ----------------
+async def occupy(db: AsyncSession, company_id: int, leaves: list):
+    """Mark the days of newly approved leaves, in the caller's transaction."""
+    rows = [row for leave in leaves for row in calendar_rows(leave, company_id)]
+    if not rows:
+        return
+    upsert = upsert_insert(db, LeaveCalendarDay).on_conflict_do_nothing(
+        index_elements=["leave_request_id", "day"]
+    )
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await db.execute(upsert, rows[start:start + INSERT_BATCH_SIZE])
+
+
+async def release(db: AsyncSession, leave_ids: list):
+    """Clear the days of leaves that are no longer approved."""
+    if leave_ids:
+        await db.execute(delete(LeaveCalendarDay).where(LeaveCalendarDay.leave_request_id.in_(leave_ids)))
+
+
+# ---------------- Reads ----------------
+async def team_calendar(
+    db: AsyncSession,
+    company_id: int,
+    first: date,
+    last: date,
+    department: Optional[str] = None
+) -> list:
+    """Who is out on each day of [first, last], from one range read.
+
+    Every day of the window is listed, including days nobody is out.
+    """
+    query = (
+        select(
+            LeaveCalendarDay.day,
+            LeaveCalendarDay.employee_id,
+            LeaveCalendarDay.leave_type,
+            EmployeeProfile.employee_code,
+            EmployeeProfile.full_name,
+            EmployeeProfile.department
+        )
+        .join(EmployeeProfile, LeaveCalendarDay.employee_id == EmployeeProfile.id)
+        .where(LeaveCalendarDay.company_id == company_id, LeaveCalendarDay.day.between(first, last))
+        .order_by(LeaveCalendarDay.day, LeaveCalendarDay.employee_id)
+    )
+    if department:
+        query = query.where(EmployeeProfile.department == department)
+
+    out = {}
+    for row in (await db.execute(query)).all():
+        entry = row._asdict()
+        out.setdefault(entry.pop("day"), []).append(entry)
+
+    days = []
+    for offset in range((last - first).days + 1):
+        day = first + timedelta(days=offset)
+        employees = out.get(day, [])
+        days.append({"date": day, "count": len(employees), "out": employees})
+    return days
+
+
+# ---------------- Rebuild ----------------
+def rebuild_calendar(db: Session, company_id: Optional[int] = None) -> int:
+    """Recompute leave_calendar from approved leave. Sync session; caller commits."""
+    db.execute(delete(LeaveCalendarDay).where(
+        *([LeaveCalendarDay.company_id == company_id] if company_id else [])
+    ))
+
+    leaves = db.execute(
+        select(
+            LeaveRequest.id,
+            LeaveRequest.employee_id,
+            LeaveRequest.leave_type,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            EmployeeProfile.company_id
+        )
+        .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
+        .where(
+            LeaveRequest.status == "approved",
+            *([EmployeeProfile.company_id == company_id] if company_id else [])
+        )
+    )
+
+    rows = [row for leave in leaves for row in calendar_rows(leave, leave.company_id)]
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(LeaveCalendarDay), rows[start:start + INSERT_BATCH_SIZE])
+    return len(rows)
@@ -0,0 +1,117 @@
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+from app.services.attendance_rollup import apply_deltas, leave_deltas
+from app.services.leave_calendar import occupy, release
+from app.services.leave_ledger import InsufficientBalance, is_tracked, leave_days, lock_balances, post_many
+from app.services.leave_overlap import find_overlap, overlap_message
+from app.services.versions import bump
+
+_STATUS = {"approve": "approved", "reject": "rejected"}
+
+
+def _overlaps(leave, ranges: list) -> bool:
+    return any(leave.start_date <= end and leave.end_date >= start for start, end in ranges)
+
+
+async def decide_leaves(db: AsyncSession, company_id: int, decisions: list) -> list:
+    """Approve/reject a batch of the company's leaves in the caller's transaction.
+
+    Ownership is checked and the rows locked with one query, balances are
+    decided against one locked read, and statuses and comments land in one
+    UPDATE. Each decision follows the single-leave endpoints' rules; one that
+    cannot be applied gets an error outcome and leaves the rest untouched.
+    Returns one outcome per decision, in order.
+    """
+    ids = {decision.leave_id for decision in decisions}
+    leaves = {
+        leave.id: leave
+        for leave in (await db.execute(
+            select(
+                LeaveRequest.id,
+                LeaveRequest.employee_id,
+                LeaveRequest.leave_type,
+                LeaveRequest.start_date,
+                LeaveRequest.end_date,
+                LeaveRequest.status
+            )
+            .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
+            .where(LeaveRequest.id.in_(ids), EmployeeProfile.company_id == company_id)
+            .with_for_update(of=LeaveRequest)
+        )).all()
+    }
+    balances = await lock_balances(db, {
+        (leave.employee_id, leave.leave_type) for leave in leaves.values() if is_tracked(leave.leave_type)
+    })
+
+    outcomes, seen, revived = [], set(), {}
+    postings, deltas, updates = [], [], {}
+    approved, released = [], []
+
+    for decision in decisions:
+        leave = leaves.get(decision.leave_id)
+        outcome = {"leave_id": decision.leave_id, "decision": decision.decision}
+        outcomes.append(outcome)
+
+        if decision.leave_id in seen:
+            outcome["error"] = "Duplicate leave_id in batch"
+            continue
+        seen.add(decision.leave_id)
+        if leave is None:
+            outcome["error"] = "Leave not found"
+            continue
+        if leave.status == "cancelled":
+            outcome["error"] = "Leave was cancelled"
+            continue
+
+        status = _STATUS[decision.decision]
+        days = leave_days(leave.start_date, leave.end_date)
+
+        if status == "approved" and leave.status == "rejected":
+            # A rejected leave no longer held its dates; check the DB and this batch
+            overlap = await find_overlap(db, leave.employee_id, leave.start_date, leave.end_date, exclude_id=leave.id)
+            if overlap:
+                outcome["error"] = overlap_message(overlap)
+                continue
+            if _overlaps(leave, revived.get(leave.employee_id, [])):
+                outcome["error"] = "Overlaps another leave approved in this batch"
+                continue
+            revived.setdefault(leave.employee_id, []).append((leave.start_date, leave.end_date))
+
+        if status == "approved" and leave.status != "approved":
+            key = (leave.employee_id, leave.leave_type)
+            if key in balances:
+                if balances[key] < days:
+                    outcome["error"] = str(InsufficientBalance(leave.leave_type, balances[key], days))
+                    continue
+                balances[key] -= days
+            postings.append((leave, -days, "approval"))
+            deltas += leave_deltas(leave.employee_id, company_id, leave.start_date, leave.end_date)
+            approved.append(leave)
+        elif status == "rejected" and leave.status == "approved":
+            postings.append((leave, days, "rejection"))
+            deltas += leave_deltas(leave.employee_id, company_id, leave.start_date, leave.end_date, sign=-1)
+            released.append(leave.id)
+
+        updates[leave.id] = (status, decision.comment)
+        outcome["status"] = status
+
+    if updates:
+        await db.execute(
+            update(LeaveRequest)
+            .where(LeaveRequest.id.in_(updates))
+            .values(
+                status=case({leave_id: status for leave_id, (status, _) in updates.items()}, value=LeaveRequest.id),
+                admin_comment=case({leave_id: comment for leave_id, (_, comment) in updates.items()}, value=LeaveRequest.id)
+            )
+            .execution_options(synchronize_session=False)
+        )
+    await post_many(db, company_id, postings)
+    await apply_deltas(db, deltas)
+    await occupy(db, company_id, approved)
+    await release(db, released)
+    await bump(db, "leave", {leaves[leave_id].employee_id for leave_id in updates})
+
+    return outcomes
@@ -0,0 +1,251 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import config
+from app.db.dialect import upsert_insert
+from app.models.employee import EmployeeProfile
+from app.models.leave_ledger import LeaveBalance, LeaveLedgerEntry
+from app.models.user import User
+
+INSERT_BATCH_SIZE = 1000
+
+
+class InsufficientBalance(Exception):
+    def __init__(self, leave_type: str, available: int, requested: int):
+        super().__init__(f"Insufficient {leave_type} leave balance: {available} days available, {requested} requested")
+
+
+# ---------------- Helpers ----------------
+def leave_days(start: date, end: date) -> int:
+    # Calendar days, inclusive; the same count the attendance rollup uses
+    return (end - start).days + 1
+
+
+def is_tracked(leave_type: str) -> bool:
+    return leave_type in config.LEAVE_MONTHLY_ACCRUAL
+
+
+async def get_balance(db: AsyncSession, employee_id: int, leave_type: str) -> int:
+    balance = await db.get(LeaveBalance, (employee_id, leave_type))
+    return balance.balance if balance else 0
+
+
+async def get_balances(db: AsyncSession, employee_id: int) -> list:
+    rows = {
+        row.leave_type: row
+        for row in (await db.scalars(
+            select(LeaveBalance).where(LeaveBalance.employee_id == employee_id)
+        )).all()
+    }
+    return [
+        {
+            "leave_type": leave_type,
+            "balance": rows[leave_type].balance if leave_type in rows else 0,
+            "used": rows[leave_type].used if leave_type in rows else 0,
+            "monthly_accrual": days,
+        }
+        for leave_type, days in config.LEAVE_MONTHLY_ACCRUAL.items()
+    ]
+
+
+def _entry(leave, company_id: int, delta: int, reason: str) -> dict:
+    return {
+        "employee_id": leave.employee_id,
+        "company_id": company_id,
+        "leave_type": leave.leave_type,
+        "delta": delta,
+        "reason": reason,
+        "leave_request_id": leave.id,
+    }
+
+
+# ---------------- Debits And Credits ----------------
+async def debit(db: AsyncSession, leave, company_id: int):
+    """Take an approved leave's days off the balance, in the caller's transaction.
+
+    The balance check and the decrement are one conditional UPDATE, so two
+    concurrent approvals can never overdraw it. Raises InsufficientBalance.
+    """
+    if not is_tracked(leave.leave_type):
+        return
+
+    days = leave_days(leave.start_date, leave.end_date)
+    debited = (await db.execute(
+        update(LeaveBalance)
+        .where(
+            LeaveBalance.employee_id == leave.employee_id,
+            LeaveBalance.leave_type == leave.leave_type,
+            LeaveBalance.balance >= days
+        )
+        .values(balance=LeaveBalance.balance - days, used=LeaveBalance.used + days)
+        .returning(LeaveBalance.balance)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if debited is None:
+        available = await get_balance(db, leave.employee_id, leave.leave_type)
+        raise InsufficientBalance(leave.leave_type, available, days)
+
+    await db.execute(insert(LeaveLedgerEntry).values(_entry(leave, company_id, -days, "approval")))
+
+
+async def credit(db: AsyncSession, leave, company_id: int, reason: str):
+    """Give back the days of a previously approved leave (rejection, cancellation)."""
+    if not is_tracked(leave.leave_type):
+        return
+
+    days = leave_days(leave.start_date, leave.end_date)
+    insert_stmt = upsert_insert(db, LeaveBalance).values(
+        employee_id=leave.employee_id,
+        leave_type=leave.leave_type,
+        company_id=company_id,
+        balance=days,
+        used=-days
+    )
+    await db.execute(insert_stmt.on_conflict_do_update(
+        index_elements=["employee_id", "leave_type"],
+        set_={
+            "balance": LeaveBalance.balance + insert_stmt.excluded.balance,
+            "used": LeaveBalance.used + insert_stmt.excluded.used,
+        }
+    ))
+    await db.execute(insert(LeaveLedgerEntry).values(_entry(leave, company_id, days, reason)))
+
+
+# ---------------- Batched Postings ----------------
+async def lock_balances(db: AsyncSession, keys: set) -> dict:
+    """Current balances of (employee_id, leave_type) keys, row-locked (PostgreSQL).
+
+    Lets a batch decide every debit up front; missing rows read as 0.
+    """
+    if not keys:
+        return {}
+    rows = (await db.execute(
+        select(LeaveBalance.employee_id, LeaveBalance.leave_type, LeaveBalance.balance)
+        .where(LeaveBalance.employee_id.in_({employee_id for employee_id, _ in keys}))
+        .with_for_update()
+    )).all()
+    balances = {key: 0 for key in keys}
+    balances.update({(row.employee_id, row.leave_type): row.balance for row in rows if (row.employee_id, row.leave_type) in keys})
+    return balances
+
+
+async def post_many(db: AsyncSession, company_id: int, postings: list):
+    """Write (leave, delta, reason) postings: one balance upsert, one ledger insert.
+
+    The caller has already checked debits against lock_balances. Untracked
+    leave types are skipped, as in debit/credit.
+    """
+    postings = [(leave, delta, reason) for leave, delta, reason in postings if is_tracked(leave.leave_type)]
+    if not postings:
+        return
+
+    totals = {}
+    for leave, delta, _ in postings:
+        key = (leave.employee_id, leave.leave_type)
+        totals[key] = totals.get(key, 0) + delta
+
+    insert_stmt = upsert_insert(db, LeaveBalance)
+    await db.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=["employee_id", "leave_type"],
+            set_={
+                "balance": LeaveBalance.balance + insert_stmt.excluded.balance,
+                "used": LeaveBalance.used + insert_stmt.excluded.used,
+            }
+        ),
+        [
+            {"employee_id": employee_id, "leave_type": leave_type, "company_id": company_id,
+             "balance": delta, "used": -delta}
+            for (employee_id, leave_type), delta in totals.items()
+        ]
+    )
+    await db.execute(
+        insert(LeaveLedgerEntry),
+        [_entry(leave, company_id, delta, reason) for leave, delta, reason in postings]
+    )
+
+
+# ---------------- Accrual ----------------
+async def accrue(db: AsyncSession, company_id: int, period: str) -> dict:
+    """Credit every active employee's monthly entitlement for period (YYYY-MM).
+
+    Idempotent: the ledger's (employee, type, period) key lets each accrual
+    land once, and only rows actually inserted move a balance. Caller commits.
+    """
+    employee_ids = (await db.scalars(
+        select(EmployeeProfile.id)
+        .join(User, User.id == EmployeeProfile.user_id)
+        .where(EmployeeProfile.company_id == company_id, User.is_active.is_(True))
+    )).all()
+
+    entries = [
+        {
+            "employee_id": employee_id,
+            "company_id": company_id,
+            "leave_type": leave_type,
+            "delta": days,
+            "reason": "accrual",
+            "period": period,
+        }
+        for employee_id in employee_ids
+        for leave_type, days in config.LEAVE_MONTHLY_ACCRUAL.items()
+    ]
+
+    credited = []
+    for start in range(0, len(entries), INSERT_BATCH_SIZE):
+        credited += (await db.execute(
+            upsert_insert(db, LeaveLedgerEntry)
+            .values(entries[start:start + INSERT_BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=["employee_id", "leave_type", "period"])
+            .returning(LeaveLedgerEntry.employee_id, LeaveLedgerEntry.leave_type, LeaveLedgerEntry.delta)
+        )).all()
+
+    balances = [
+        {"employee_id": row.employee_id, "leave_type": row.leave_type, "company_id": company_id,
+         "balance": row.delta, "used": 0}
+        for row in credited
+    ]
+    insert_stmt = upsert_insert(db, LeaveBalance)
+    upsert = insert_stmt.on_conflict_do_update(
+        index_elements=["employee_id", "leave_type"],
+        set_={"balance": LeaveBalance.balance + insert_stmt.excluded.balance}
+    )
+    for start in range(0, len(balances), INSERT_BATCH_SIZE):
+        await db.execute(upsert, balances[start:start + INSERT_BATCH_SIZE])
+
+    return {
+        "month": period,
+        "employees": len(employee_ids),
+        "credited": len(credited),
+        "already_accrued": len(entries) - len(credited),
+    }
+
+
+# ---------------- Rebuild ----------------
+def rebuild_balances(db: Session, company_id: Optional[int] = None) -> int:
+    """Recompute leave_balances from the ledger. Sync session; caller commits."""
+    scope = [LeaveLedgerEntry.company_id == company_id] if company_id else []
+
+    db.execute(delete(LeaveBalance).where(*([LeaveBalance.company_id == company_id] if company_id else [])))
+
+    totals = db.execute(
+        select(
+            LeaveLedgerEntry.employee_id,
+            LeaveLedgerEntry.leave_type,
+            LeaveLedgerEntry.company_id,
+            func.sum(LeaveLedgerEntry.delta).label("balance"),
+            func.coalesce(func.sum(
+                case((LeaveLedgerEntry.reason != "accrual", -LeaveLedgerEntry.delta))
+            ), 0).label("used")
+        )
+        .where(*scope)
+        .group_by(LeaveLedgerEntry.employee_id, LeaveLedgerEntry.leave_type, LeaveLedgerEntry.company_id)
+    )
+    rows = [row._asdict() for row in totals]
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(LeaveBalance), rows[start:start + INSERT_BATCH_SIZE])
+    return len(rows)
@@ -0,0 +1,64 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attendance import Attendance
+from app.models.leave import LeaveRequest
+
+# Statuses that hold their dates; the PostgreSQL exclusion constraint uses the same set
+BLOCKING_STATUSES = ("pending", "approved")
+ATTENDED_STATUSES = ("present", "half-day")
+
+
+async def find_overlap(
+    db: AsyncSession,
+    employee_id: int,
+    start: date,
+    end: date,
+    exclude_id: Optional[int] = None
+):
+    """First pending/approved leave of the employee overlapping [start, end], or None.
+
+    A seek on ix_leave_requests_employee_end from end_date >= start: only the
+    employee's current and future leaves are read, however long the history,
+    and start_date <= end filters those few. Correct for stored leaves of any
+    length, including ones longer than LEAVE_MAX_DAYS. On PostgreSQL the
+    ex_leave_requests_no_overlap constraint backs this up against concurrent
+    applications.
+    """
+    query = (
+        select(LeaveRequest.id, LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.status)
+        .where(
+            LeaveRequest.employee_id == employee_id,
+            LeaveRequest.end_date >= start,
+            LeaveRequest.start_date <= end,
+            LeaveRequest.status.in_(BLOCKING_STATUSES)
+        )
+        .order_by(LeaveRequest.end_date)
+        .limit(1)
+    )
+    if exclude_id is not None:
+        query = query.where(LeaveRequest.id != exclude_id)
+    return (await db.execute(query)).first()
+
+
+async def find_attended_day(db: AsyncSession, employee_id: int, start: date, end: date) -> Optional[date]:
+    """First day in [start, end] the employee already worked, via uq_attendance_employee_date."""
+    return await db.scalar(
+        select(Attendance.date)
+        .where(
+            Attendance.employee_id == employee_id,
+            Attendance.date.between(start, end),
+            Attendance.status.in_(ATTENDED_STATUSES)
+        )
+        .order_by(Attendance.date)
+        .limit(1)
+    )
+
+
+def overlap_message(overlap) -> str:
+    return (
+        f"Overlaps leave {overlap.id} ({overlap.start_date} to {overlap.end_date}, {overlap.status})"
+    )
@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import and_, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.models.attendance_rollup import AttendanceMonthly
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+from app.models.payroll import Payroll
+from app.models.user import User
+from app.services.attendance_rollup import month_bounds
+
+
+@dataclass
+class PayrollInputs:
+    """One month's inputs for a set of employees, as aligned arrays."""
+    employee_ids: np.ndarray    # int64, sorted
+    salary: np.ndarray          # int64, monthly wage
+    unpaid_days: np.ndarray     # float64, unpaid leave days inside the month
+    absent_days: np.ndarray     # float64, recorded absences (a half-day counts 0.5)
+    days_in_month: int
+    attendance_days: Optional[np.ndarray] = None  # int64, present + half + absent days recorded
+
+
+def _half_up(values: np.ndarray) -> np.ndarray:
+    # Same rounding as SQL round() for the non-negative amounts used here
+    return np.floor(values + 0.5).astype(np.int64)
+
+
+# ---------------- Compute ----------------
+def compute(inputs: PayrollInputs) -> dict:
+    """Pro-rated pay, deductions and net salary for every employee at once.
+
+    Loss of pay is salary / days_in_month per unpaid leave or absent day.
+    Only recorded absences count: a day with no attendance row is not one.
+    Statutory deductions (PAYROLL_DEDUCTION_RATE of the earned amount plus
+    PAYROLL_FIXED_DEDUCTION) never exceed what was earned, so net >= 0.
+    basic_salary - deductions == net_salary holds for every payslip.
+    """
+    salary = inputs.salary.astype(np.float64)
+    lop_days = np.clip(inputs.unpaid_days + inputs.absent_days, 0, inputs.days_in_month)
+
+    loss_of_pay = _half_up(salary * lop_days / inputs.days_in_month)
+    earned = inputs.salary - loss_of_pay
+    statutory = _half_up(earned * config.PAYROLL_DEDUCTION_RATE) + config.PAYROLL_FIXED_DEDUCTION
+    statutory = np.minimum(np.where(earned > 0, statutory, 0), earned)
+
+    deductions = loss_of_pay + statutory
+    return {
+        "employee_id": inputs.employee_ids,
+        "basic_salary": inputs.salary,
+        "lop_days": lop_days,
+        "loss_of_pay": loss_of_pay,
+        "deductions": deductions,
+        "net_salary": inputs.salary - deductions,
+    }
+
+
+# ---------------- Load ----------------
+def _positions(employee_ids: np.ndarray, ids: np.ndarray) -> tuple:
+    # Index of each id in the sorted employee_ids, and which ids are in it
+    positions = np.searchsorted(employee_ids, ids)
+    found = positions < len(employee_ids)
+    found[found] = employee_ids[positions[found]] == ids[found]
+    return positions, found
+
+
+def unpaid_leave_days(employee_ids: np.ndarray, leaves: list, first: date, last: date) -> np.ndarray:
+    """Per-employee approved unpaid leave days falling in [first, last]."""
+    days = np.zeros(len(employee_ids), dtype=np.float64)
+    if not leaves:
+        return days
+
+    ids = np.fromiter((leave[0] for leave in leaves), dtype=np.int64, count=len(leaves))
+    starts = np.array([leave[1] for leave in leaves], dtype="datetime64[D]")
+    ends = np.array([leave[2] for leave in leaves], dtype="datetime64[D]")
+
+    clipped = (
+        np.minimum(ends, np.datetime64(last, "D")) - np.maximum(starts, np.datetime64(first, "D"))
+    ).astype(np.int64) + 1
+    positions, found = _positions(employee_ids, ids)
+    np.add.at(days, positions[found], np.maximum(clipped[found], 0))
+    return days
+
+
+async def load_inputs(
+    db: AsyncSession,
+    company_id: int,
+    month: str,
+    department: Optional[str] = None
+) -> PayrollInputs:
+    """Load month's inputs for active, salaried employees without a payslip yet.
+
+    Three set-based reads: the employees, their approved unpaid leave
+    overlapping the month, and absences from the attendance rollup.
+
+    Absences are what was recorded as "absent" or "half-day" attendance.
+    Check-in/check-out and punch ingestion only ever write present days, so
+    a missed day must be recorded explicitly to be deducted; it is never
+    inferred from a missing row (there is no holiday calendar or joining
+    date to infer it from). attendance_days lets the caller spot employees
+    with nothing recorded for the month.
+    """
+    first, last = month_bounds(month)
+
+    criteria = [
+        EmployeeProfile.company_id == company_id,
+        User.is_active.is_(True),
+        EmployeeProfile.salary > 0,
+        ~exists().where(and_(Payroll.employee_id == EmployeeProfile.id, Payroll.month == month)),
+    ]
+    if department:
+        criteria.append(EmployeeProfile.department == department)
+
+    employees = (await db.execute(
+        select(EmployeeProfile.id, EmployeeProfile.salary)
+        .join(User, User.id == EmployeeProfile.user_id)
+        .where(*criteria)
+    )).all()
+    # Sorted here rather than in SQL, which would trade the company index for the primary key
+    employees = np.array(employees, dtype=np.int64).reshape(-1, 2)
+    employees = employees[np.argsort(employees[:, 0])]
+    employee_ids, salary = employees[:, 0].copy(), employees[:, 1].copy()
+
+    leave_query = (
+        select(LeaveRequest.employee_id, LeaveRequest.start_date, LeaveRequest.end_date)
+        .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
+        .where(
+            EmployeeProfile.company_id == company_id,
+            LeaveRequest.status == "approved",
+            LeaveRequest.leave_type.in_(config.PAYROLL_UNPAID_LEAVE_TYPES),
+            LeaveRequest.end_date >= first,
+            LeaveRequest.start_date <= last
+        )
+    )
+    unpaid_days = unpaid_leave_days(employee_ids, (await db.execute(leave_query)).all(), first, last)
+
+    absent_days = np.zeros(len(employee_ids), dtype=np.float64)
+    attendance_days = np.zeros(len(employee_ids), dtype=np.int64)
+    absences = (await db.execute(
+        select(
+            AttendanceMonthly.employee_id,
+            AttendanceMonthly.absent_days,
+            AttendanceMonthly.half_days,
+            AttendanceMonthly.present_days
+        )
+        .where(AttendanceMonthly.company_id == company_id, AttendanceMonthly.month == month)
+    )).all()
+    if absences:
+        table = np.array(absences, dtype=np.int64)
+        positions, found = _positions(employee_ids, table[:, 0])
+        absent_days[positions[found]] = table[found, 1] + 0.5 * table[found, 2]
+        attendance_days[positions[found]] = table[found, 1:4].sum(axis=1)
+
+    return PayrollInputs(
+        employee_ids=employee_ids,
+        salary=salary,
+        unpaid_days=unpaid_days,
+        absent_days=absent_days,
+        days_in_month=(last - first).days + 1,
+        attendance_days=attendance_days
+    )
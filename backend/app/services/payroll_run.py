@@ -0,0 +1,101 @@
+import time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.dialect import upsert_insert
+from app.models.employee import EmployeeProfile
+from app.models.payroll import Payroll
+from app.models.user import User
+from app.services.payroll_engine import compute, load_inputs
+from app.services.versions import bump
+
+INSERT_BATCH_SIZE = 1000
+_PAYSLIP_COLUMNS = ("employee_id", "basic_salary", "lop_days", "loss_of_pay", "deductions", "net_salary")
+
+
+def _eligible(company_id: int, department: Optional[str]):
+    criteria = [
+        EmployeeProfile.company_id == company_id,
+        User.is_active.is_(True),
+    ]
+    if department:
+        criteria.append(EmployeeProfile.department == department)
+    return criteria
+
+
+async def save_payslips(db: AsyncSession, month: str, payslips: dict) -> list[int]:
+    """Bulk insert computed payslips, skipping any that already exist. Caller commits.
+
+    Returns the employee ids that got a payslip.
+    """
+    columns = [payslips[name].tolist() for name in _PAYSLIP_COLUMNS]
+    rows = [dict(zip(_PAYSLIP_COLUMNS, values), month=month) for values in zip(*columns)]
+
+    # executemany + RETURNING is batched into multi-row INSERTs by the driver layer
+    insert = (
+        upsert_insert(db, Payroll)
+        .on_conflict_do_nothing(index_elements=["employee_id", "month"])
+        .returning(Payroll.employee_id)
+    )
+    created = []
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        created += (await db.execute(insert, rows[start:start + INSERT_BATCH_SIZE])).scalars().all()
+    return created
+
+
+async def run_monthly_payroll(
+    db: AsyncSession,
+    company_id: int,
+    month: str,
+    department: Optional[str] = None
+) -> dict:
+    """Create one payslip per active employee for month.
+
+    Inputs are loaded set-wise, pay is computed for everyone at once by
+    payroll_engine, and payslips are inserted in bulk. Employees that already
+    have a payslip for month are left untouched, so re-running (or two runs
+    racing) never duplicates or overwrites one.
+
+    Absences are deducted only where attendance recorded them (see
+    payroll_engine.load_inputs); without_attendance counts the payslips
+    created for employees with no attendance at all in month, which were
+    therefore paid without any absence deduction.
+    """
+    started = time.perf_counter()
+
+    counts = (await db.execute(
+        select(
+            func.count(EmployeeProfile.id).label("eligible"),
+            func.count(EmployeeProfile.id).filter(
+                func.coalesce(EmployeeProfile.salary, 0) <= 0
+            ).label("no_salary")
+        )
+        .join(User, User.id == EmployeeProfile.user_id)
+        .where(*_eligible(company_id, department))
+    )).one()
+
+    inputs = await load_inputs(db, company_id, month, department)
+    computed = time.perf_counter()
+    payslips = compute(inputs)
+    compute_ms = (time.perf_counter() - computed) * 1000
+
+    created = await save_payslips(db, month, payslips)
+    unrecorded = inputs.employee_ids[inputs.attendance_days == 0]
+    await bump(db, "payroll", created)
+    await db.commit()
+
+    return {
+        "month": month,
+        "department": department,
+        "eligible": counts.eligible,
+        "created": len(created),
+        "already_existed": counts.eligible - counts.no_salary - len(created),
+        "skipped_no_salary": counts.no_salary,
+        "with_loss_of_pay": int((payslips["loss_of_pay"] > 0).sum()),
+        "without_attendance": int(np.isin(unrecorded, created).sum()),
+        "compute_ms": round(compute_ms, 2),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
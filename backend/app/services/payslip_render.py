@@ -0,0 +1,150 @@
+"""Payslip documents (HTML and PDF) from a plain payslip dict.
+
+Kept free of database and app imports: these functions run in the render
+process pool, whose workers import only this module.
+"""
+import html
+import os
+import tempfile
+
+# Bump when the layout changes, so cached documents are re-rendered
+TEMPLATE_VERSION = 1
+
+MEDIA_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+}
+
+
+# Legacy payslips may hold NULL in any of these columns; they render as "-"
+def _amount(value) -> str:
+    return "-" if value is None else f"{value:,}"
+
+
+def _text(value) -> str:
+    return "-" if value is None else str(value)
+
+
+def line_items(data: dict) -> list:
+    loss_of_pay = data.get("loss_of_pay") or 0
+    deductions = data.get("deductions")
+    return [
+        ("Basic salary", _amount(data.get("basic_salary"))),
+        (f"Loss of pay ({data['lop_days']:g} days)" if data.get("lop_days") else "Loss of pay", _amount(loss_of_pay)),
+        ("Statutory deductions", _amount(None if deductions is None else deductions - loss_of_pay)),
+        ("Total deductions", _amount(deductions)),
+        ("Net salary", _amount(data.get("net_salary"))),
+    ]
+
+
+def _details(data: dict) -> list:
+    code = data.get("employee_code")
+    return [
+        ("Employee", f"{data['full_name']} ({code})" if code else data["full_name"]),
+        ("Department", data.get("department") or "-"),
+        ("Job title", data.get("job_title") or "-"),
+        ("Pay period", _text(data.get("month"))),
+    ]
+
+
+# ---------------- HTML ----------------
+def render_html(data: dict) -> bytes:
+    rows = lambda items: "".join(
+        f"<tr><th>{html.escape(label)}</th><td>{html.escape(str(value))}</td></tr>" for label, value in items
+    )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Payslip {html.escape(_text(data.get('month')))}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; margin: 40px; color: #222; }}
+table {{ border-collapse: collapse; width: 100%; max-width: 560px; margin-bottom: 24px; }}
+th, td {{ padding: 6px 10px; border-bottom: 1px solid #ddd; text-align: left; }}
+td {{ text-align: right; }}
+tr:last-child th, tr:last-child td {{ font-weight: bold; }}
+</style></head>
+<body>
+<h1>{html.escape(data['company'])}</h1>
+<h2>Payslip for {html.escape(_text(data.get('month')))}</h2>
+<table>{rows(_details(data))}</table>
+<table>{rows(line_items(data))}</table>
+</body></html>
+""".encode("utf-8")
+
+
+# ---------------- PDF ----------------
+def _pdf_text(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(data: dict) -> bytes:
+    """A single A4 page in Helvetica; no external PDF library needed."""
+    ops, y = [], 790
+
+    def text(x, size, value, bold=False):
+        ops.append(f"BT /{'F2' if bold else 'F1'} {size} Tf {x} {y} Td ({_pdf_text(value)}) Tj ET")
+
+    text(50, 20, data["company"], bold=True)
+    y -= 28
+    text(50, 14, f"Payslip for {_text(data.get('month'))}")
+    y -= 36
+    for label, value in _details(data):
+        text(50, 11, label, bold=True)
+        text(180, 11, str(value))
+        y -= 18
+    y -= 18
+    items = line_items(data)
+    for n, (label, value) in enumerate(items):
+        last = n == len(items) - 1
+        text(50, 11, label, bold=last)
+        text(400, 11, value, bold=last)
+        y -= 18
+        ops.append(f"50 {y + 12} m 545 {y + 12} l 0.8 G S")
+
+    stream = "\n".join(ops).encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 6 0 R"
+        b" /Resources << /Font << /F1 4 0 R /F2 5 0 R >> >> >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    ]
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+_RENDERERS = {"html": render_html, "pdf": render_pdf}
+
+
+def render_to_file(data: dict, fmt: str, path: str) -> int:
+    """Render into path atomically (temp file + rename); returns the size in bytes.
+
+    Concurrent renders of the same document race harmlessly: the content is
+    identical and the last rename wins.
+    """
+    document = _RENDERERS[fmt](data)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(document)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return len(document)
+
+
+def render_batch(jobs: list) -> int:
+    """render_to_file for each (data, fmt, path); one pool task per chunk of a batch."""
+    return sum(render_to_file(data, fmt, path) for data, fmt, path in jobs)
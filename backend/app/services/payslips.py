@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.models.company import Company
+from app.models.employee import EmployeeProfile
+from app.models.payroll import Payroll
+from app.services.payslip_render import TEMPLATE_VERSION, render_batch, render_to_file
+
+PAYSLIP_COLUMNS = (
+    Payroll.id.label("payroll_id"),
+    Payroll.month,
+    Company.name.label("company"),
+    EmployeeProfile.employee_code,
+    EmployeeProfile.full_name,
+    EmployeeProfile.department,
+    EmployeeProfile.job_title,
+    Payroll.basic_salary,
+    Payroll.lop_days,
+    Payroll.loss_of_pay,
+    Payroll.deductions,
+    Payroll.net_salary,
+)
+
+PRERENDER_CHUNK = 200  # payslips per pool task
+
+_pool: Optional[ProcessPoolExecutor] = None
+_stats = {"hits": 0, "renders": 0, "prerendered": 0}
+
+
+def payslip_query(company_id: int):
+    return (
+        select(*PAYSLIP_COLUMNS, Payroll.employee_id)
+        .join(EmployeeProfile, Payroll.employee_id == EmployeeProfile.id)
+        .join(Company, Company.id == EmployeeProfile.company_id)
+        .where(EmployeeProfile.company_id == company_id)
+    )
+
+
+def payslip_data(row) -> dict:
+    return {column.key: getattr(row, column.key) for column in PAYSLIP_COLUMNS}
+
+
+# ---------------- Content-Addressed Cache ----------------
+def cache_path(data: dict, fmt: str) -> str:
+    """Where the document for exactly this data lives.
+
+    The key hashes every rendered field and the template version, so a
+    corrected payslip or a layout change gets a new file; stale files are
+    simply never read again.
+    """
+    key = hashlib.sha256(
+        json.dumps({"v": TEMPLATE_VERSION, "fmt": fmt, "data": data}, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return os.path.join(config.PAYSLIP_CACHE_DIR, key[:2], f"{key}.{fmt}")
+
+
+# ---------------- Render Pool ----------------
+def _render_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that runs an event loop and DB threads is unsafe
+        _pool = ProcessPoolExecutor(
+            max_workers=config.PAYSLIP_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_render_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+async def get_payslip(data: dict, fmt: str) -> str:
+    """Path of the rendered document, rendering it in the pool on a cache miss."""
+    path = cache_path(data, fmt)
+    if os.path.exists(path):
+        _stats["hits"] += 1
+        return path
+
+    await asyncio.get_running_loop().run_in_executor(_render_pool(), render_to_file, data, fmt, path)
+    _stats["renders"] += 1
+    return path
+
+
+async def prerender(db: AsyncSession, company_id: int, month: str, fmt: str) -> dict:
+    """Render every payslip of a company's month that is not cached yet."""
+    started = time.perf_counter()
+    rows = (await db.execute(payslip_query(company_id).where(Payroll.month == month))).all()
+
+    missing = []
+    for row in rows:
+        data = payslip_data(row)
+        path = cache_path(data, fmt)
+        if not os.path.exists(path):
+            missing.append((data, fmt, path))
+
+    if missing:
+        loop = asyncio.get_running_loop()
+        pool = _render_pool()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, render_batch, missing[start:start + PRERENDER_CHUNK])
+            for start in range(0, len(missing), PRERENDER_CHUNK)
+        ))
+    _stats["prerendered"] += len(missing)
+
+    return {
+        "month": month,
+        "format": fmt,
+        "payslips": len(rows),
+        "rendered": len(missing),
+        "already_cached": len(rows) - len(missing),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def get_payslip_stats() -> dict:
+    return {**_stats, "workers": config.PAYSLIP_RENDER_WORKERS, "pool_started": _pool is not None}
@@ -0,0 +1,357 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from datetime import time as clock_time
+from typing import Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.db.dialect import upsert_insert
+from app.db.session import AsyncSessionLocal
+from app.models.attendance import Attendance
+from app.services.attendance_rollup import apply_deltas, check_in_delta, check_out_delta
+from app.services.dashboard import invalidate_dashboard
+from app.services.versions import bump
+
+logger = logging.getLogger(__name__)
+
+_ROW_COLUMNS = (
+    Attendance.employee_id,
+    Attendance.id,
+    Attendance.date,
+    Attendance.check_in_time,
+    Attendance.check_out_time,
+    Attendance.status
+)
+
+
+class PunchQueueFull(Exception):
+    pass
+
+
+class PunchRejected(Exception):
+    pass
+
+
+class PunchBufferStopped(Exception):
+    pass
+
+
+@dataclass
+class QueuedPunch:
+    direction: str          # in | out
+    employee_id: int
+    company_id: int
+    day: date
+    at: clock_time
+    outcome: Optional[asyncio.Future] = None
+
+
+def _row(row: dict) -> dict:
+    return {key: value for key, value in row.items() if key != "employee_id"}
+
+
+def _fail(punches: list, error: Exception):
+    # Answer every caller still waiting; punches already answered are left alone
+    for punch in punches:
+        if punch.outcome is not None and not punch.outcome.done():
+            punch.outcome.set_exception(error)
+
+
+# ---------------- Batch Apply ----------------
+async def _apply_check_ins(db: AsyncSession, day: date, punches: list, results: dict):
+    winners = {}
+    for punch in punches:
+        if punch.employee_id in winners:
+            results[id(punch)] = "Already checked in today"
+        else:
+            winners[punch.employee_id] = punch
+
+    inserted = (await db.execute(
+        upsert_insert(db, Attendance)
+        .values([
+            {
+                "employee_id": punch.employee_id,
+                "date": day,
+                "check_in_time": punch.at,
+                "status": "present",
+            }
+            for punch in winners.values()
+        ])
+        .on_conflict_do_nothing(index_elements=["employee_id", "date"])
+        .returning(*_ROW_COLUMNS)
+    )).all()
+    rows = {row.employee_id: row for row in inserted}
+
+    for employee_id, punch in winners.items():
+        row = rows.get(employee_id)
+        results[id(punch)] = _row(row._asdict()) if row else "Already checked in today"
+
+
+async def _apply_check_outs(db: AsyncSession, day: date, punches: list, results: dict):
+    # Lock today's rows (PostgreSQL) so the decisions below hold until commit
+    existing = {
+        row.employee_id: row._asdict()
+        for row in (await db.execute(
+            select(*_ROW_COLUMNS)
+            .where(
+                Attendance.date == day,
+                Attendance.employee_id.in_({punch.employee_id for punch in punches})
+            )
+            .with_for_update()
+        )).all()
+    }
+
+    updates = []
+    for punch in punches:
+        row = existing.get(punch.employee_id)
+        if row is None:
+            results[id(punch)] = "No check-in found"
+        elif row["check_out_time"] is not None:
+            results[id(punch)] = "Already checked out"
+        else:
+            row["check_out_time"] = punch.at
+            updates.append({"row_id": row["id"], "check_out": punch.at})
+            results[id(punch)] = _row(row)
+
+    if updates:
+        await db.execute(
+            update(Attendance.__table__)
+            .where(Attendance.id == bindparam("row_id"), Attendance.check_out_time.is_(None))
+            .values(check_out_time=bindparam("check_out")),
+            updates
+        )
+
+
+async def apply_punches(db: AsyncSession, punches: list) -> list:
+    """Apply a batch of queued punches in the caller's transaction.
+
+    Returns one outcome per punch, in order: the resulting attendance row as
+    a dict, or the rejection message check-in/check-out would have given.
+    Check-ins are applied before check-outs so both can share a batch, and
+    the monthly rollup is updated with the batch's net deltas and the
+    employees' attendance versions are bumped.
+    """
+    results = {}
+    for direction, apply in (("in", _apply_check_ins), ("out", _apply_check_outs)):
+        by_day = {}
+        for punch in punches:
+            if punch.direction == direction:
+                by_day.setdefault(punch.day, []).append(punch)
+        for day, day_punches in by_day.items():
+            await apply(db, day, day_punches, results)
+
+    outcomes = [results[id(punch)] for punch in punches]
+    await apply_deltas(db, [
+        check_in_delta(punch.employee_id, punch.company_id, punch.day, punch.at) if punch.direction == "in"
+        else check_out_delta(punch.employee_id, punch.company_id, punch.day, row["check_in_time"], row["check_out_time"])
+        for punch, row in zip(punches, outcomes) if isinstance(row, dict)
+    ])
+    await bump(db, "attendance", {punch.employee_id for punch, row in zip(punches, outcomes) if isinstance(row, dict)})
+    return outcomes
+
+
+# ---------------- Write-Behind Buffer ----------------
+class PunchBuffer:
+    """In-process queue that group-commits punches from a background task.
+
+    A batch is flushed flush_interval_ms after its first punch arrived, or as
+    soon as max_rows punches are waiting, in one transaction. The task is
+    started on the first submit in each event loop.
+    """
+
+    def __init__(self, flush_interval_ms: int, max_rows: int, max_queue: int, durability: str):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.max_queue = max_queue
+        self.durability = durability
+
+        self._loop = None
+        self._queue = None
+        self._full = None
+        self._task = None
+
+        self._stats = {
+            "enqueued": 0,
+            "rejected_queue_full": 0,
+            "queue_depth_peak": 0,
+            "flushes": 0,
+            "flush_failures": 0,
+            "rows_flushed": 0,
+            "rows_rejected": 0,
+            "flush_ms_last": 0.0,
+            "flush_ms_max": 0.0,
+            "flush_ms_total": 0.0,
+        }
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._full = asyncio.Event()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, direction: str, employee_id: int, company_id: int) -> Optional[dict]:
+        """Queue a punch stamped now.
+
+        With "commit" durability, waits for the batch and returns the row or
+        raises PunchRejected; with "queued" durability, returns None at once.
+        Raises PunchQueueFull instead of waiting when the queue is full.
+        """
+        self._ensure_running()
+
+        now = datetime.now()
+        punch = QueuedPunch(
+            direction=direction,
+            employee_id=employee_id,
+            company_id=company_id,
+            day=now.date(),
+            at=now.time(),
+            outcome=self._loop.create_future() if self.durability == "commit" else None
+        )
+
+        try:
+            self._queue.put_nowait(punch)
+        except asyncio.QueueFull:
+            self._stats["rejected_queue_full"] += 1
+            raise PunchQueueFull()
+
+        depth = self._queue.qsize()
+        self._stats["enqueued"] += 1
+        self._stats["queue_depth_peak"] = max(self._stats["queue_depth_peak"], depth)
+        # The flusher already holds the batch's first punch
+        if depth >= self.max_rows - 1:
+            self._full.set()
+
+        if punch.outcome is None:
+            return None
+        return await asyncio.shield(punch.outcome)
+
+    async def _run(self):
+        try:
+            while True:
+                batch = [await self._queue.get()]
+
+                # Every punch taken off the queue is answered and marked done,
+                # whatever happens to its batch, or drain() and its caller wait forever
+                try:
+                    if self._queue.qsize() < self.max_rows - 1:
+                        self._full.clear()
+                        try:
+                            await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                        except asyncio.TimeoutError:
+                            pass
+
+                    while len(batch) < self.max_rows and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+
+                    await self._flush(batch)
+                except Exception:
+                    logger.exception("Punch batch of %d rows failed", len(batch))
+                finally:
+                    _fail(batch, PunchBufferStopped("Punch batch did not complete"))
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            # Cancelled or crashed: nothing else takes from this queue
+            self._abandon_queued()
+
+    async def _flush(self, batch: list):
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                db.info["statement_timeout_ms"] = config.DB_STATEMENT_TIMEOUT_MS
+                outcomes = await apply_punches(db, batch)
+                await db.commit()
+        except Exception as e:
+            logger.exception("Punch flush of %d rows failed", len(batch))
+            self._stats["flush_failures"] += 1
+            # Callers get the retryable error the API maps to 503, with the cause attached
+            stopped = PunchBufferStopped("Punch batch could not be written")
+            stopped.__cause__ = e
+            _fail(batch, stopped)
+            return
+
+        # Committed: bookkeeping failures are logged, never turned into failed punches
+        try:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            rejected = sum(1 for outcome in outcomes if isinstance(outcome, str))
+            self._stats["flushes"] += 1
+            self._stats["rows_flushed"] += len(batch) - rejected
+            self._stats["rows_rejected"] += rejected
+            self._stats["flush_ms_last"] = elapsed_ms
+            self._stats["flush_ms_max"] = max(self._stats["flush_ms_max"], elapsed_ms)
+            self._stats["flush_ms_total"] += elapsed_ms
+
+            for company_id in {p.company_id for p, o in zip(batch, outcomes) if p.direction == "in" and isinstance(o, dict)}:
+                invalidate_dashboard(company_id)
+        except Exception:
+            logger.exception("Punch flush bookkeeping failed after commit")
+
+        for punch, outcome in zip(batch, outcomes):
+            if punch.outcome is None or punch.outcome.done():
+                continue
+            if isinstance(outcome, str):
+                punch.outcome.set_exception(PunchRejected(outcome))
+            else:
+                punch.outcome.set_result(outcome)
+
+    async def drain(self):
+        """Flush everything queued in the current loop and stop the task.
+
+        If the flusher task has died, the punches still queued are failed
+        with PunchBufferStopped instead of waiting on a join that never
+        returns.
+        """
+        if self._loop is not asyncio.get_running_loop() or self._task is None:
+            return
+
+        joined = asyncio.ensure_future(self._queue.join())
+        await asyncio.wait({joined, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if not joined.done():
+            joined.cancel()
+            self._abandon_queued()
+
+        self._task.cancel()
+        self._task = None
+
+    def _abandon_queued(self):
+        abandoned = []
+        while not self._queue.empty():
+            abandoned.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if abandoned:
+            logger.error("Punch flusher stopped; %d queued punches were not written", len(abandoned))
+            _fail(abandoned, PunchBufferStopped("Punch buffer stopped before the punch was written"))
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        flushes = stats["flushes"]
+        stats.update({
+            "mode": config.PUNCH_WRITE_MODE,
+            "durability": self.durability,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_max": self.max_queue,
+            "flush_ms_avg": stats["flush_ms_total"] / flushes if flushes else 0.0,
+            "batch_avg": (stats["rows_flushed"] + stats["rows_rejected"]) / flushes if flushes else 0.0,
+        })
+        return stats
+
+
+punch_buffer = PunchBuffer(
+    flush_interval_ms=config.PUNCH_FLUSH_INTERVAL_MS,
+    max_rows=config.PUNCH_FLUSH_MAX_ROWS,
+    max_queue=config.PUNCH_QUEUE_MAX,
+    durability=config.PUNCH_DURABILITY
+)
+
+
+def get_punch_buffer_stats() -> dict:
+    return punch_buffer.stats()
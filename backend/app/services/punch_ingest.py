@@ -0,0 +1,119 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.db.dialect import upsert_insert
+from app.models.attendance import Attendance
+from app.models.employee import EmployeeProfile
+from app.services.attendance_rollup import month_key, refresh_attendance
+from app.services.versions import bump
+
+UPSERT_BATCH_SIZE = 1000
+
+
+def _local(timestamp: datetime) -> datetime:
+    # Attendance stores naive local times, like check-in's datetime.now()
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+
+def merge_punches(employee_ids: dict, punches: list, now: datetime) -> tuple:
+    """Fold punches into one first-in/last-out row per (employee, day).
+
+    employee_ids maps employee_code to EmployeeProfile.id. Returns
+    (days, errors); days is keyed by (employee_id, date).
+    """
+    latest = now + timedelta(seconds=config.PUNCH_CLOCK_SKEW)
+    days, errors = {}, []
+
+    for index, punch in enumerate(punches):
+        employee_id = employee_ids.get(punch.employee_code)
+        if employee_id is None:
+            errors.append({"index": index, "employee_code": punch.employee_code, "error": "Unknown employee code"})
+            continue
+
+        at = _local(punch.timestamp)
+        if at > latest:
+            errors.append({"index": index, "employee_code": punch.employee_code, "error": "Timestamp is in the future"})
+            continue
+
+        day = days.setdefault((employee_id, at.date()), {
+            "employee_id": employee_id,
+            "date": at.date(),
+            "check_in_time": None,
+            "check_out_time": None,
+            "status": "present",
+        })
+        if punch.direction == "in":
+            if day["check_in_time"] is None or at.time() < day["check_in_time"]:
+                day["check_in_time"] = at.time()
+        elif day["check_out_time"] is None or at.time() > day["check_out_time"]:
+            day["check_out_time"] = at.time()
+
+    return days, errors
+
+
+async def upsert_days(db: AsyncSession, days: list):
+    """Bulk upsert merged day rows, keeping the earliest in and latest out.
+
+    Rows already in the table (e.g. from /check-in) are widened, never
+    narrowed, so re-sending a batch is harmless. The caller commits.
+    """
+    insert = upsert_insert(db, Attendance)
+    table, incoming = Attendance.__table__, insert.excluded
+
+    upsert = insert.on_conflict_do_update(
+        index_elements=["employee_id", "date"],
+        set_={
+            "check_in_time": case(
+                (table.c.check_in_time.is_(None), incoming.check_in_time),
+                (incoming.check_in_time < table.c.check_in_time, incoming.check_in_time),
+                else_=table.c.check_in_time
+            ),
+            "check_out_time": case(
+                (table.c.check_out_time.is_(None), incoming.check_out_time),
+                (incoming.check_out_time > table.c.check_out_time, incoming.check_out_time),
+                else_=table.c.check_out_time
+            ),
+            # A punch overrides a pre-filled absence, not a leave day
+            "status": case(
+                (table.c.status == "absent", incoming.status),
+                else_=table.c.status
+            ),
+        }
+    )
+
+    for start in range(0, len(days), UPSERT_BATCH_SIZE):
+        await db.execute(upsert, days[start:start + UPSERT_BATCH_SIZE])
+
+
+async def ingest_punches(db: AsyncSession, company_id: int, punches: list) -> dict:
+    """Resolve, merge and upsert a batch of device punches in one transaction."""
+    started = time.perf_counter()
+
+    codes = {punch.employee_code for punch in punches}
+    employee_ids = dict((await db.execute(
+        select(EmployeeProfile.employee_code, EmployeeProfile.id).where(
+            EmployeeProfile.company_id == company_id,
+            EmployeeProfile.employee_code.in_(codes)
+        )
+    )).all())
+
+    days, errors = merge_punches(employee_ids, punches, datetime.now())
+    await upsert_days(db, list(days.values()))
+    await refresh_attendance(db, {(employee_id, month_key(day)) for employee_id, day in days})
+    await bump(db, "attendance", {employee_id for employee_id, _ in days})
+    await db.commit()
+
+    return {
+        "received": len(punches),
+        "accepted": len(punches) - len(errors),
+        "rejected": len(errors),
+        "days_upserted": len(days),
+        "errors": errors,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,54 @@
+import hashlib
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.dialect import upsert_insert
+from app.models.collection_version import CollectionVersion
+
+COLLECTIONS = ("attendance", "leave", "payroll")
+
+# Part of every ETag; bump when a collection's response schema changes so
+# clients holding old bodies do not get a 304 for a different format.
+ETAG_FORMAT = 1
+
+INSERT_BATCH_SIZE = 1000
+
+
+async def bump(db: AsyncSession, collection: str, employee_ids):
+    """Move collection's version for each employee, in the caller's transaction.
+
+    Ids are upserted in sorted order so concurrent writers lock the rows
+    (PostgreSQL) in the same order.
+    """
+    rows = [{"employee_id": employee_id, "collection": collection, "version": 1} for employee_id in sorted(set(employee_ids))]
+    if not rows:
+        return
+
+    insert_stmt = upsert_insert(db, CollectionVersion)
+    upsert = insert_stmt.on_conflict_do_update(
+        index_elements=["employee_id", "collection"],
+        set_={"version": CollectionVersion.version + 1}
+    )
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await db.execute(upsert, rows[start:start + INSERT_BATCH_SIZE])
+
+
+async def current_version(db: AsyncSession, employee_id: int, collection: str) -> int:
+    version = await db.scalar(
+        select(CollectionVersion.version).where(
+            CollectionVersion.employee_id == employee_id,
+            CollectionVersion.collection == collection
+        )
+    )
+    return version or 0
+
+
+def etag(employee_id: int, collection: str, version: int, query: str) -> str:
+    """Strong ETag of one page of a collection: its version plus the query string.
+
+    Cursor, limit and filters all select a different body, so they are
+    hashed in; the version alone only says nothing was written since.
+    """
+    digest = hashlib.sha256(f"{ETAG_FORMAT}:{collection}:{query}".encode()).hexdigest()[:16]
+    return f'"{collection}-{employee_id}-{version}-{digest}"'
@@ -0,0 +1,71 @@
+"""HR analytics report latency, cold (cache cleared) and warm.
+
+Seeds one company on first use, then requests a year-long report for each
+dimension through the real app. A cold request loads the window once and
+caches every dimension, so "other" is a different dimension right after it.
+
+Run from backend/:
+
+    DATABASE_URL=sqlite:///./analytics_bench.db python -m benchmarks.analytics --employees 10000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from sqlalchemy import select
+
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.user import User
+from app.services import analytics
+from scripts.seed import migrate, seed
+
+
+async def run(repeat: int):
+    with SessionLocal() as db:
+        admin = db.scalars(select(User).where(User.role == "admin").order_by(User.id)).first()
+    token = create_access_token({"user_id": admin.id, "company_id": admin.company_id, "role": admin.role})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for dimension in analytics.DIMENSIONS:
+            other = next(each for each in analytics.DIMENSIONS if each != dimension)
+            cold, warm, switched = [], [], []
+            for _ in range(repeat):
+                analytics._cache.clear()
+                for timings, wanted in ((cold, dimension), (warm, dimension), (switched, other)):
+                    started = time.perf_counter()
+                    response = await client.get("/reports/analytics", params={"dimension": wanted}, headers=headers)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    response.raise_for_status()
+                    if wanted == dimension:
+                        report = response.json()
+
+            print(
+                f"{dimension:>16}: groups={len(report['groups'])}"
+                f"  load_ms={report['load_ms']}  aggregate_ms={report['aggregate_ms']}"
+                f"  cold_p50_ms={statistics.median(cold):.1f}  warm_p50_ms={statistics.median(warm):.2f}"
+                f"  other_dimension_p50_ms={statistics.median(switched):.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    migrate()
+    started = time.perf_counter()
+    if seed(employees=args.employees, days=args.days):
+        print(f"seeded {args.employees} employees x {args.days} days in {time.perf_counter() - started:.1f}s")
+
+    asyncio.run(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Compare sync vs async handler throughput on a seeded database.
+
+Both sides serve GET /attendance/me. The sync side is the original
+threadpool handler (user, profile and history queries, caller identified by
+a user_id query parameter); the async side is the real app from app.main.
+
+Run from backend/ (the database is seeded on first use only):
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.async_vs_sync \
+        --employees 500 --days 60 --requests 3000 --concurrency 200
+
+Each side also reports the peak worker threads busy and the peak tasks
+waiting for one (anyio's default limiter, 40 threads): the sync handler
+holds a thread per in-flight request, the async stack should hold none.
+
+Measured on SQLite only (3 runs each, settings above). At the async switch
+both sides served 85-103 req/s with p50 about 2.1-2.3 s, and the async p99 was
+5.4-6.7 s against 2.5-2.8 s sync, aiosqlite queueing every query on its one
+thread. On the current tree (token and identity caches, page parameters
+resolved off the threadpool) the sync side serves 132-133 req/s holding all
+40 threads with 160 tasks queued for one; the async side serves 178-194 req/s
+on no worker thread, p50 1.0 s, but its p99 is still 3.2-3.5 s against
+1.9 s. Most of that throughput comes from the caches, not the async driver.
+
+PostgreSQL (asyncpg), the deployment target, has not been measured: the
+benefit of the async stack there is unproven until it is, e.g. with
+
+    DATABASE_URL=postgresql://... python -m benchmarks.async_vs_sync --concurrency 200
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+from anyio import to_thread
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.pagination import DEFAULT_PAGE_SIZE
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.main import app as async_app
+from app.models.attendance import Attendance
+from app.models.employee import EmployeeProfile
+from app.models.user import User
+from scripts.seed import migrate, seed
+
+
+def employee_callers() -> list:
+    with SessionLocal() as db:
+        users = db.scalars(select(User).where(User.role == "employee")).all()
+        return [
+            (user.id, create_access_token({"user_id": user.id, "company_id": user.company_id, "role": user.role}))
+            for user in users
+        ]
+
+
+# ---------------- Sync Baseline ----------------
+sync_app = FastAPI()
+
+
+def get_sync_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@sync_app.get("/attendance/me")
+def sync_my_attendance(user_id: int, db: Session = Depends(get_sync_db)):
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid user")
+
+    employee = db.query(EmployeeProfile).filter(
+        EmployeeProfile.user_id == user.id
+    ).first()
+
+    # Same page size as the paginated async endpoint, so both move equal data
+    return db.query(Attendance).filter(
+        Attendance.employee_id == employee.id
+    ).order_by(Attendance.date.desc(), Attendance.id.desc()).limit(DEFAULT_PAGE_SIZE).all()
+
+
+# ---------------- Driver ----------------
+async def watch_threads(peaks: dict):
+    limiter = to_thread.current_default_thread_limiter()
+    while True:
+        peaks["threads_peak"] = max(peaks["threads_peak"], limiter.borrowed_tokens)
+        peaks["thread_waiters_peak"] = max(peaks["thread_waiters_peak"], limiter.statistics().tasks_waiting)
+        await asyncio.sleep(0.005)
+
+
+async def drive(app, callers: list, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    peaks = {"threads_peak": 0, "thread_waiters_peak": 0}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                user_id, token = random.choice(callers)
+                started = time.perf_counter()
+                response = await client.get(
+                    "/attendance/me",
+                    params={"user_id": user_id},
+                    headers={"Authorization": f"Bearer {token}"}
+                )
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        watcher = asyncio.create_task(watch_threads(peaks))
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        watcher.cancel()
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        **peaks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    migrate()
+    seed(employees=args.employees, days=args.days)
+    callers = employee_callers()
+
+    for name, app in (("sync", sync_app), ("async", async_app)):
+        result = asyncio.run(drive(app, callers, args.requests, args.concurrency))
+        print(f"{name:>5}: " + "  ".join(f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Morning-rush load test for check-in/check-out.
+
+Every employee punches in (and later out) --repeat times at once, at a paced
+arrival rate, against the real app. Afterwards the database is checked: each
+employee must have exactly one attendance row for today and exactly one
+successful check-in and check-out. Exits non-zero on any duplicate.
+
+Run from backend/ (the database is seeded on first use; today's attendance
+is cleared before each run):
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.checkin_rush \\
+        --employees 1000 --repeat 3 --rate 500 --mode buffered
+
+--mode/--durability override PUNCH_WRITE_MODE/PUNCH_DURABILITY, so the
+direct and group-commit write paths can be compared on the same data.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import date
+
+import httpx
+from sqlalchemy import delete, func, select
+
+from app.core import config
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.attendance import Attendance
+from app.models.attendance_rollup import AttendanceMonthly
+from app.services.attendance_rollup import month_bounds, month_key
+from app.services.attendance_rollup import rebuild as rebuild_attendance_rollup
+from app.services.punch_buffer import get_punch_buffer_stats, punch_buffer
+from benchmarks.async_vs_sync import employee_callers
+from scripts.seed import migrate, seed
+
+
+def _percentile(latencies: list, pct: float) -> float:
+    return latencies[max(0, int(len(latencies) * pct) - 1)]
+
+
+async def rush(client, path: str, callers: list, repeat: int, rate: float) -> dict:
+    """Fire repeat punches per caller, shuffled, arriving at rate per second."""
+    punches = [token for _, token in callers for _ in range(repeat)]
+    random.shuffle(punches)
+
+    latencies, statuses = [], {}
+
+    async def one(token):
+        started = time.perf_counter()
+        response = await client.post(path, headers={"Authorization": f"Bearer {token}"})
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    tasks = []
+    for n, token in enumerate(punches):
+        # Open-loop arrivals: a slow response does not slow the next punch down
+        delay = started + n / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(token)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "punches": len(punches),
+        "elapsed_s": round(elapsed, 3),
+        "punches_per_s": round(len(punches) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def verify(callers: int) -> list:
+    today = date.today()
+    with SessionLocal() as db:
+        rows = db.scalar(select(func.count(Attendance.id)).where(Attendance.date == today))
+        duplicates = db.scalar(
+            select(func.count()).select_from(
+                select(Attendance.employee_id)
+                .where(Attendance.date == today)
+                .group_by(Attendance.employee_id)
+                .having(func.count(Attendance.id) > 1)
+                .subquery()
+            )
+        )
+        open_rows = db.scalar(
+            select(func.count(Attendance.id)).where(Attendance.date == today, Attendance.check_out_time.is_(None))
+        )
+        # The incrementally maintained rollup must agree with the source rows
+        first, last = month_bounds(month_key(today))
+        present = db.scalar(
+            select(func.count(Attendance.id)).where(Attendance.date.between(first, last), Attendance.status == "present")
+        )
+        rolled_up = db.scalar(
+            select(func.coalesce(func.sum(AttendanceMonthly.present_days), 0))
+            .where(AttendanceMonthly.month == month_key(today))
+        )
+
+    problems = []
+    if duplicates:
+        problems.append(f"{duplicates} employees with more than one row today")
+    if rows != callers:
+        problems.append(f"expected {callers} rows today, found {rows}")
+    if open_rows:
+        problems.append(f"{open_rows} rows without a check-out")
+    if rolled_up != present:
+        problems.append(f"rollup counts {rolled_up} present days this month, attendance has {present}")
+    return problems
+
+
+async def run(callers: list, repeat: int, rate: float) -> list:
+    problems = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://bench") as client:
+        for path in ("/attendance/check-in", "/attendance/check-out"):
+            result = await rush(client, path, callers, repeat, rate)
+            print(f"{path:>22}: " + "  ".join(f"{k}={v}" for k, v in result.items()))
+
+            # Queued punches are all acknowledged; only the database check applies
+            succeeded = result["statuses"].get(200, 0)
+            if punch_buffer.durability == "commit" and succeeded != len(callers):
+                problems.append(f"{path}: {succeeded} successful punches for {len(callers)} employees")
+            await punch_buffer.drain()
+
+    if config.PUNCH_WRITE_MODE == "buffered":
+        stats = get_punch_buffer_stats()
+        print("punch buffer: " + "  ".join(
+            f"{k}={round(stats[k], 2)}"
+            for k in ("flushes", "batch_avg", "flush_ms_avg", "flush_ms_max", "queue_depth_peak", "rejected_queue_full")
+        ))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3, help="concurrent punches per employee")
+    parser.add_argument("--rate", type=float, default=500, help="punch arrivals per second")
+    parser.add_argument("--mode", choices=["direct", "buffered"], default=config.PUNCH_WRITE_MODE)
+    parser.add_argument("--durability", choices=["commit", "queued"], default=config.PUNCH_DURABILITY)
+    args = parser.parse_args()
+
+    config.PUNCH_WRITE_MODE = args.mode
+    punch_buffer.durability = args.durability
+
+    migrate()
+    seed(employees=args.employees, days=30)
+
+    with SessionLocal() as db:
+        db.execute(delete(Attendance).where(Attendance.date == date.today()))
+        rebuild_attendance_rollup(db, month=month_key(date.today()))
+        db.commit()
+
+    callers = employee_callers()
+    problems = asyncio.run(run(callers, args.repeat, args.rate))
+    problems += verify(len(callers))
+
+    for problem in problems:
+        print("FAIL:", problem)
+    if not problems:
+        print("OK: one row, one check-in and one check-out per employee")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Metrics overhead: throughput with METRICS_ENABLED=0 vs 1 on the real app.
+
+The middleware and the engine hooks are installed at import time, so each
+measurement runs in a fresh worker process; rounds alternate off/on to spread
+machine noise evenly, and the median of each side is compared. Two routes:
+/attendance/me (token, version read and a page of rows) and /employees/me
+(served from the identity cache, no SQL: the worst case relative to the
+request's own cost).
+
+Run from backend/ (the database is seeded on first use only):
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.metrics_overhead \\
+        --employees 500 --requests 3000 --rounds 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROUTES = ("/attendance/me", "/employees/me")
+
+
+# ---------------- Worker ----------------
+async def drive(path: str, callers: list, requests: int, concurrency: int) -> float:
+    import httpx
+    from app.main import app
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                _, token = random.choice(callers)
+                response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+                assert response.status_code == 200, response.text
+
+        # Warm caches and connections before timing
+        await asyncio.gather(*(one() for _ in range(min(requests, 200))))
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+def worker(requests: int, concurrency: int):
+    from benchmarks.async_vs_sync import employee_callers
+
+    callers = employee_callers()
+
+    async def run():
+        # One event loop for both routes: the engine's pool is bound to it
+        return {path: await drive(path, callers, requests, concurrency) for path in ROUTES}
+
+    print(json.dumps(asyncio.run(run())))
+
+
+# ---------------- Driver ----------------
+def measure(enabled: bool, requests: int, concurrency: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.metrics_overhead", "--worker",
+         "--requests", str(requests), "--concurrency", str(concurrency)],
+        env={**os.environ, "METRICS_ENABLED": "1" if enabled else "0"},
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.requests, args.concurrency)
+        return
+
+    from scripts.seed import migrate, seed
+    migrate()
+    seed(employees=args.employees, days=args.days)
+
+    results = {True: [], False: []}
+    for _ in range(args.rounds):
+        for enabled in (False, True):
+            results[enabled].append(measure(enabled, args.requests, args.concurrency))
+
+    for path in ROUTES:
+        off = statistics.median(r[path] for r in results[False])
+        on = statistics.median(r[path] for r in results[True])
+        print(f"{path:>16}: off={off:.0f} req/s  on={on:.0f} req/s  overhead={(off - on) / off * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Payroll engine benchmark: compute alone, then a full run against the database.
+
+The compute stage times payroll_engine.compute on synthetic arrays. The run
+stage seeds one company (first use only), deletes last month's payslips and
+times run_monthly_payroll end to end: load, compute and bulk insert.
+
+Run from backend/:
+
+    DATABASE_URL=sqlite:///./payroll_bench.db python -m benchmarks.payroll_engine --employees 50000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import delete, select
+
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.models.company import Company
+from app.models.employee import EmployeeProfile
+from app.models.payroll import Payroll
+from app.services.payroll_engine import PayrollInputs, compute, load_inputs
+from app.services.payroll_run import run_monthly_payroll
+from scripts.seed import migrate, seed
+
+
+def bench_compute(employees: int, repeat: int) -> dict:
+    rng = np.random.default_rng(42)
+    inputs = PayrollInputs(
+        employee_ids=np.arange(1, employees + 1, dtype=np.int64),
+        salary=rng.integers(20000, 200000, employees, dtype=np.int64),
+        unpaid_days=rng.choice([0.0, 0.0, 0.0, 1.0, 2.0, 5.0], employees),
+        absent_days=rng.choice([0.0, 0.0, 0.5, 1.0], employees),
+        days_in_month=30
+    )
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payslips = compute(inputs)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    assert (payslips["basic_salary"] - payslips["deductions"] == payslips["net_salary"]).all()
+    assert (payslips["net_salary"] >= 0).all()
+    return {"employees": employees, "median_ms": round(statistics.median(timings), 2), "max_ms": round(max(timings), 2)}
+
+
+async def bench_run(company_id: int, month: str) -> dict:
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        inputs = await load_inputs(db, company_id, month)
+        load_ms = (time.perf_counter() - started) * 1000
+
+    async with AsyncSessionLocal() as db:
+        summary = await run_monthly_payroll(db, company_id, month)
+    summary["load_ms"] = round(load_ms, 2)
+    summary["loaded"] = len(inputs.employee_ids)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=35, help="attendance history seeded")
+    parser.add_argument("--repeat", type=int, default=20, help="compute-only repetitions")
+    args = parser.parse_args()
+
+    print("compute:", "  ".join(f"{k}={v}" for k, v in bench_compute(args.employees, args.repeat).items()))
+
+    migrate()
+    started = time.perf_counter()
+    if seed(employees=args.employees, days=args.days):
+        print(f"seeded {args.employees} employees in {time.perf_counter() - started:.1f}s")
+
+    month = (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+    with SessionLocal() as db:
+        company_id = db.scalar(select(Company.id).order_by(Company.id))
+        db.execute(delete(Payroll).where(
+            Payroll.month == month,
+            Payroll.employee_id.in_(select(EmployeeProfile.id).where(EmployeeProfile.company_id == company_id))
+        ))
+        db.commit()
+
+    summary = asyncio.run(bench_run(company_id, month))
+    print("run:", "  ".join(f"{k}={v}" for k, v in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
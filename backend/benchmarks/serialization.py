@@ -0,0 +1,113 @@
+"""Response serialization benchmark: time per 10k rows, before and after schemas.
+
+Each list endpoint returns a fetch_page dict of ORM rows. Before response
+schemas, FastAPI walked those rows with jsonable_encoder and rendered the
+result with json.dumps (JSONResponse). With a response_model it validates them
+into the Page[...] schema and dumps JSON bytes in pydantic-core instead. The
+dict-returning routes still go through jsonable_encoder, then the orjson
+default response class instead of json.dumps; that row is timed as well.
+
+No database is needed; rows are transient ORM objects. Run from backend/:
+
+    python -m benchmarks.serialization --rows 10000 --repeat 10
+"""
+import argparse
+import statistics
+import time
+from datetime import date, time as clock_time, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.responses import OrjsonResponse
+from app.models.attendance import Attendance
+from app.models.leave import LeaveRequest
+from app.models.payroll import Payroll
+from app.schemas.attendance import AttendanceOut
+from app.schemas.leave import LeaveOut
+from app.schemas.page import Page
+from app.schemas.payroll import PayrollOut
+
+
+def payroll_rows(n: int) -> list:
+    return [
+        Payroll(id=i, employee_id=i % 5000 + 1, month="2026-09", basic_salary=50000 + i,
+                deductions=4000, net_salary=46000 + i, lop_days=float(i % 3), loss_of_pay=(i % 3) * 1600)
+        for i in range(1, n + 1)
+    ]
+
+
+def leave_rows(n: int) -> list:
+    first = date(2026, 1, 1)
+    return [
+        LeaveRequest(id=i, employee_id=i % 5000 + 1, leave_type=("paid", "sick", "unpaid")[i % 3],
+                     start_date=first + timedelta(days=i % 300), end_date=first + timedelta(days=i % 300 + 2),
+                     status="approved", admin_comment=None if i % 2 else "ok")
+        for i in range(1, n + 1)
+    ]
+
+
+def attendance_rows(n: int) -> list:
+    first = date(2026, 1, 1)
+    return [
+        Attendance(id=i, employee_id=i % 5000 + 1, date=first + timedelta(days=i % 300),
+                   check_in_time=clock_time(9, i % 60), check_out_time=clock_time(18, i % 60), status="present")
+        for i in range(1, n + 1)
+    ]
+
+
+def _median_ms(fn, repeat: int) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def bench(name: str, schema, rows: list, repeat: int) -> dict:
+    page = {"items": rows, "next_cursor": None}
+    adapter = TypeAdapter(Page[schema])
+
+    # What FastAPI does without / with a response_model on the route
+    before = lambda: JSONResponse(jsonable_encoder(page)).body
+    after = lambda: adapter.dump_json(adapter.validate_python(page, from_attributes=True))
+    dict_route = lambda: OrjsonResponse(jsonable_encoder(page)).body
+
+    assert TypeAdapter(Page[schema]).validate_json(after()).items[0].id == rows[0].id
+
+    per_10k = 10000 / len(rows)
+    before_ms, before_bytes = _median_ms(before, repeat)
+    after_ms, after_bytes = _median_ms(after, repeat)
+    orjson_ms, _ = _median_ms(dict_route, repeat)
+    return {
+        "endpoint": name,
+        "before_ms": round(before_ms * per_10k, 1),
+        "after_ms": round(after_ms * per_10k, 1),
+        "speedup": round(before_ms / after_ms, 1),
+        "encoder_orjson_ms": round(orjson_ms * per_10k, 1),
+        "bytes_before": before_bytes,
+        "bytes_after": after_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    cases: List[tuple] = [
+        ("/payroll/company", PayrollOut, payroll_rows(args.rows)),
+        ("/leave/company", LeaveOut, leave_rows(args.rows)),
+        ("/attendance/me", AttendanceOut, attendance_rows(args.rows)),
+    ]
+    print(f"per 10k rows, median of {args.repeat}:")
+    for name, schema, rows in cases:
+        print("  ".join(f"{k}={v}" for k, v in bench(name, schema, rows, args.repeat).items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""Benchmark suite: seeded data, the real app, throughput and p50/p95/p99 per scenario.
+
+Scenarios, all driven through app.main over an in-process ASGI transport:
+
+    checkin_rush     every employee checks in, then out, arriving at --rate per second
+    payroll_listing  month-end: HR walks last month's company payroll (200 a page)
+                     while employees fetch /payroll/me
+    dashboard        HR dashboards, recomputed (cache invalidated per request) and cached
+
+Each run is saved to benchmarks/results/<timestamp>-<commit>.json. --compare
+prints the change against the latest earlier result from another commit (or
+--baseline FILE); --max-regression fails the run when a p95 grew more than
+that many percent.
+
+Run from backend/ (seeded on first use; the same flags reproduce the same data):
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.suite \\
+        --companies 2 --employees 1000 --years 1 --compare
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import httpx
+from sqlalchemy import delete, func, select
+
+from app.core import config
+from app.core.security import create_access_token
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.attendance import Attendance
+from app.models.company import Company
+from app.models.employee import EmployeeProfile
+from app.models.user import User
+from app.services.attendance_rollup import month_key
+from app.services.attendance_rollup import rebuild as rebuild_attendance_rollup
+from app.services.dashboard import invalidate_dashboard
+from app.services.punch_buffer import punch_buffer
+from scripts.seed import migrate, seed
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+# ---------------- Measurement ----------------
+def percentile(ordered: list, pct: float) -> float:
+    # Nearest rank on an already sorted list
+    return ordered[max(0, math.ceil(len(ordered) * pct) - 1)]
+
+
+class Recorder:
+    """Latencies and status codes of one scenario's requests."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.started = time.perf_counter()
+
+    async def call(self, client, method: str, path: str, token: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, path, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        self.latencies.append(time.perf_counter() - started)
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        return response
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        ordered = sorted(self.latencies)
+        ms = lambda seconds: round(seconds * 1000, 2)
+        return {
+            "requests": len(ordered),
+            "elapsed_s": round(elapsed, 3),
+            "rps": round(len(ordered) / elapsed, 1),
+            "p50_ms": ms(percentile(ordered, 0.50)),
+            "p95_ms": ms(percentile(ordered, 0.95)),
+            "p99_ms": ms(percentile(ordered, 0.99)),
+            "errors": sum(count for status, count in self.statuses.items() if status >= 400),
+        }
+
+
+async def open_loop(calls: list, rate: float):
+    """Fire calls at rate per second; a slow response never delays the next arrival."""
+    started = time.perf_counter()
+    tasks = []
+    for n, call in enumerate(calls):
+        delay = started + n / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(call()))
+    await asyncio.gather(*tasks)
+
+
+async def closed_loop(calls: list, concurrency: int):
+    """Run calls with at most concurrency in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(call):
+        async with semaphore:
+            await call()
+
+    await asyncio.gather(*(one(call) for call in calls))
+
+
+# ---------------- Callers ----------------
+def _token(user) -> str:
+    return create_access_token({"user_id": user.id, "company_id": user.company_id, "role": user.role})
+
+
+def callers(role: str) -> list:
+    with SessionLocal() as db:
+        users = db.scalars(
+            select(User).where(User.role == role, User.is_active.is_(True)).order_by(User.id)
+        ).all()
+        return [_token(user) for user in users]
+
+
+# ---------------- Scenarios ----------------
+def reset_today():
+    # Undo an earlier rush so every run starts from the seeded data; keep the rollup consistent
+    with SessionLocal() as db:
+        db.execute(delete(Attendance).where(Attendance.date == date.today()))
+        rebuild_attendance_rollup(db, month=month_key(date.today()))
+        db.commit()
+
+
+async def checkin_rush(client, args) -> dict:
+    employees = callers("employee")
+    results = {}
+    for direction, path in (("check_in", "/attendance/check-in"), ("check_out", "/attendance/check-out")):
+        order = random.Random(args.seed).sample(employees, len(employees))
+        recorder = Recorder()
+        await open_loop([
+            lambda token=token: recorder.call(client, "POST", path, token) for token in order
+        ], args.rate)
+        await punch_buffer.drain()
+        results[direction] = recorder.summary()
+    return results
+
+
+async def payroll_listing(client, args) -> dict:
+    month = (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+    admins, employees = callers("admin"), callers("employee")
+    rng = random.Random(args.seed)
+
+    pages, payslips = Recorder(), Recorder()
+
+    async def walk(token):
+        cursor = None
+        while True:
+            params = {"month": month, "limit": 200, **({"cursor": cursor} if cursor else {})}
+            response = await pages.call(client, "GET", "/payroll/company", token, params=params)
+            cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+            if not cursor:
+                return
+
+    walkers = [walk(admins[n % len(admins)]) for n in range(args.hr_walkers)]
+    employee_calls = closed_loop([
+        lambda token=rng.choice(employees): payslips.call(client, "GET", "/payroll/me", token, params={"month": month})
+        for _ in range(args.requests)
+    ], args.concurrency)
+    await asyncio.gather(*walkers, employee_calls)
+    return {"company_pages": pages.summary(), "payroll_me": payslips.summary()}
+
+
+async def dashboard(client, args) -> dict:
+    admins = callers("admin")
+    with SessionLocal() as db:
+        company_ids = db.scalars(select(Company.id)).all()
+
+    # Recomputed: every request misses the cache, one at a time
+    cold = Recorder()
+    for n in range(min(args.requests, 200)):
+        for company_id in company_ids:
+            invalidate_dashboard(company_id)
+        await cold.call(client, "GET", "/reports/dashboard", admins[n % len(admins)])
+
+    cached = Recorder()
+    await closed_loop([
+        lambda token=admins[n % len(admins)]: cached.call(client, "GET", "/reports/dashboard", token)
+        for n in range(args.requests)
+    ], args.concurrency)
+    return {"recomputed": cold.summary(), "cached": cached.summary()}
+
+
+SCENARIOS = {
+    "checkin_rush": checkin_rush,
+    "payroll_listing": payroll_listing,
+    "dashboard": dashboard,
+}
+
+
+async def run(scenarios: list, args) -> dict:
+    # One event loop for every scenario: the async engine's pool is bound to it
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        results = {}
+        for name in scenarios:
+            results[name] = await SCENARIOS[name](client, args)
+            for step, summary in results[name].items():
+                print(f"{name + '/' + step:<30} " + "  ".join(f"{k}={v}" for k, v in summary.items()))
+        return results
+
+
+# ---------------- Results ----------------
+def _git(*command) -> str:
+    try:
+        return subprocess.run(["git", *command], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def environment(args) -> dict:
+    with SessionLocal() as db:
+        dataset = {
+            "companies": db.scalar(select(func.count(Company.id))),
+            "employees": db.scalar(select(func.count(EmployeeProfile.id))),
+            "attendance_rows": db.scalar(select(func.count(Attendance.id))),
+        }
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "punch_write_mode": config.PUNCH_WRITE_MODE,
+        "dataset": dataset,
+        "args": {key: value for key, value in vars(args).items() if key not in ("compare", "baseline", "max_regression")},
+    }
+
+
+def save(record: dict) -> Path:
+    RESULTS_DIR.mkdir(exist_ok=True)
+    stamp = record["environment"]["timestamp"].replace(":", "").replace("-", "")
+    path = RESULTS_DIR / f"{stamp}-{record['environment']['commit']}.json"
+    path.write_text(json.dumps(record, indent=2))
+    return path
+
+
+def find_baseline(current: dict):
+    # Latest saved run from a different commit (file names sort by time)
+    for path in sorted(RESULTS_DIR.glob("*.json"), reverse=True):
+        record = json.loads(path.read_text())
+        if record["environment"]["commit"] != current["environment"]["commit"]:
+            return path, record
+    return None, None
+
+
+def compare(baseline: dict, current: dict) -> list:
+    """Print per-step changes; returns (step, p95 change %) pairs."""
+    before_env, after_env = baseline["environment"], current["environment"]
+    print(f"\ncompared with {before_env['commit']} ({before_env['timestamp']})")
+    for key in ("database", "dataset", "punch_write_mode"):
+        if before_env[key] != after_env[key]:
+            print(f"  warning: {key} differs: {before_env[key]} -> {after_env[key]}")
+
+    change = lambda old, new: (new - old) / old * 100 if old else 0.0
+    changes = []
+    for name, steps in current["results"].items():
+        for step, after in steps.items():
+            before = baseline["results"].get(name, {}).get(step)
+            if before is None:
+                continue
+            p95 = change(before["p95_ms"], after["p95_ms"])
+            changes.append((f"{name}/{step}", p95))
+            print(
+                f"  {name + '/' + step:<30} rps {before['rps']} -> {after['rps']} ({change(before['rps'], after['rps']):+.1f}%)"
+                f"  p95 {before['p95_ms']} -> {after['p95_ms']} ms ({p95:+.1f}%)"
+                f"  p99 {before['p99_ms']} -> {after['p99_ms']} ms ({change(before['p99_ms'], after['p99_ms']):+.1f}%)"
+            )
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=1)
+    parser.add_argument("--employees", type=int, default=1000, help="employees per company")
+    parser.add_argument("--days", type=int, default=90, help="days of history per employee")
+    parser.add_argument("--years", type=float, help="years of history, overrides --days")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for data and request order")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--rate", type=float, default=500, help="check-in rush arrivals per second")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per closed-loop step")
+    parser.add_argument("--concurrency", type=int, default=50, help="closed-loop requests in flight")
+    parser.add_argument("--hr-walkers", type=int, default=5, help="HR clients paging through payroll at once")
+    parser.add_argument("--mode", choices=["direct", "buffered"], default=config.PUNCH_WRITE_MODE)
+    parser.add_argument("--compare", action="store_true", help="compare with the latest result of another commit")
+    parser.add_argument("--baseline", type=Path, help="compare with this result file instead")
+    parser.add_argument("--max-regression", type=float, help="exit 1 if any p95 grew more than this percent")
+    args = parser.parse_args()
+    if args.years:
+        args.days = round(args.years * 365)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    config.PUNCH_WRITE_MODE = args.mode
+    random.seed(args.seed)
+
+    migrate()
+    started = time.perf_counter()
+    if seed(args.companies, args.employees, args.days, args.seed):
+        print(f"seeded {args.companies} x {args.employees} employees, {args.days} days in {time.perf_counter() - started:.1f}s")
+    else:
+        print("database already seeded, reusing it")
+    reset_today()
+
+    record = {"environment": environment(args), "results": asyncio.run(run(scenarios, args))}
+    print(f"saved {save(record)}")
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+    elif args.compare or args.max_regression is not None:
+        path, baseline = find_baseline(record)
+        if baseline is None:
+            print("no earlier result from another commit to compare with")
+    if baseline is None:
+        return
+
+    regressions = [
+        (step, p95) for step, p95 in compare(baseline, record)
+        if args.max_regression is not None and p95 > args.max_regression
+    ]
+    for step, p95 in regressions:
+        print(f"FAIL: {step} p95 grew {p95:.1f}% (limit {args.max_regression}%)")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""initial schema
+
+Tables as they existed before migrations were introduced. Databases that
+were created by hand can be adopted with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "companies",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("logo_url", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_companies_id", "companies", ["id"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "employee_profiles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), unique=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id")),
+        sa.Column("employee_code", sa.String()),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("phone", sa.String()),
+        sa.Column("address", sa.String()),
+        sa.Column("job_title", sa.String()),
+        sa.Column("department", sa.String()),
+        sa.Column("salary", sa.Integer()),
+        sa.Column("year_of_joining", sa.Integer()),
+    )
+    op.create_index("ix_employee_profiles_id", "employee_profiles", ["id"])
+    op.create_index("ix_employee_profiles_employee_code", "employee_profiles", ["employee_code"], unique=True)
+
+    op.create_table(
+        "attendance",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employee_profiles.id")),
+        sa.Column("date", sa.Date()),
+        sa.Column("check_in_time", sa.Time()),
+        sa.Column("check_out_time", sa.Time()),
+        sa.Column("status", sa.String()),
+    )
+    op.create_index("ix_attendance_id", "attendance", ["id"])
+
+    op.create_table(
+        "leave_requests",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employee_profiles.id")),
+        sa.Column("leave_type", sa.String()),
+        sa.Column("start_date", sa.Date()),
+        sa.Column("end_date", sa.Date()),
+        sa.Column("status", sa.String()),
+        sa.Column("admin_comment", sa.String()),
+    )
+    op.create_index("ix_leave_requests_id", "leave_requests", ["id"])
+
+    op.create_table(
+        "payroll",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employee_profiles.id")),
+        sa.Column("basic_salary", sa.Integer()),
+        sa.Column("deductions", sa.Integer()),
+        sa.Column("net_salary", sa.Integer()),
+        sa.Column("month", sa.String()),
+    )
+    op.create_index("ix_payroll_id", "payroll", ["id"])
+
+
+def downgrade():
+    op.drop_table("payroll")
+    op.drop_table("leave_requests")
+    op.drop_table("attendance")
+    op.drop_table("employee_profiles")
+    op.drop_table("users")
+    op.drop_table("companies")
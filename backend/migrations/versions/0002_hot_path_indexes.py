@@ -0,0 +1,91 @@
+"""indexes and uniqueness for the hot query shapes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Racing check-ins could insert the same day twice. Merge each group into
+    # its first row (earliest check-in, latest check-out, best status) so no
+    # punch is lost, then drop the rest. Rows missing employee_id or date
+    # never collide under the unique key and are left alone.
+    same_day = "d.employee_id = attendance.employee_id AND d.date = attendance.date"
+    keyed = "employee_id IS NOT NULL AND date IS NOT NULL"
+    merged = bind.execute(sa.text(
+        "UPDATE attendance SET"
+        f" check_in_time = (SELECT MIN(d.check_in_time) FROM attendance d WHERE {same_day}),"
+        f" check_out_time = (SELECT MAX(d.check_out_time) FROM attendance d WHERE {same_day}),"
+        f" status = (SELECT d.status FROM attendance d WHERE {same_day} ORDER BY"
+        "  CASE d.status WHEN 'present' THEN 0 WHEN 'half-day' THEN 1 WHEN 'leave' THEN 2"
+        "  WHEN 'absent' THEN 3 ELSE 4 END, d.id LIMIT 1)"
+        " WHERE id IN ("
+        f"  SELECT MIN(id) FROM attendance WHERE {keyed} GROUP BY employee_id, date HAVING COUNT(*) > 1"
+        " )"
+    )).rowcount
+    if merged:
+        removed = bind.execute(sa.text(
+            f"DELETE FROM attendance WHERE {keyed} AND id NOT IN ("
+            f" SELECT MIN(id) FROM attendance WHERE {keyed} GROUP BY employee_id, date"
+            ")"
+        )).rowcount
+        logger.warning("Merged %d duplicated attendance days, removing %d rows", merged, removed)
+
+    # Duplicate payslips are real money, so refuse to guess which one is right.
+    duplicates = bind.execute(sa.text(
+        "SELECT employee_id, month, COUNT(*) FROM payroll"
+        " GROUP BY employee_id, month HAVING COUNT(*) > 1"
+    )).fetchall()
+    if duplicates:
+        raise RuntimeError(
+            "Resolve duplicate payroll rows (employee_id, month, count) before migrating: "
+            f"{[tuple(row) for row in duplicates[:20]]}"
+        )
+
+    with op.batch_alter_table("attendance") as batch:
+        batch.create_unique_constraint("uq_attendance_employee_date", ["employee_id", "date"])
+    op.create_index("ix_attendance_date", "attendance", ["date"])
+
+    with op.batch_alter_table("payroll") as batch:
+        batch.create_unique_constraint("uq_payroll_employee_month", ["employee_id", "month"])
+    op.create_index("ix_payroll_employee_id_id", "payroll", ["employee_id", "id"])
+
+    op.create_index(
+        "ix_leave_requests_employee_start", "leave_requests", ["employee_id", "start_date", "id"]
+    )
+    op.create_index("ix_leave_requests_status", "leave_requests", ["status"])
+
+    op.create_index(
+        "ix_employee_profiles_company_department", "employee_profiles", ["company_id", "department"]
+    )
+    op.create_index("ix_users_company_role", "users", ["company_id", "role"])
+
+
+def downgrade():
+    op.drop_index("ix_users_company_role", table_name="users")
+    op.drop_index("ix_employee_profiles_company_department", table_name="employee_profiles")
+    op.drop_index("ix_leave_requests_status", table_name="leave_requests")
+    op.drop_index("ix_leave_requests_employee_start", table_name="leave_requests")
+
+    op.drop_index("ix_payroll_employee_id_id", table_name="payroll")
+    with op.batch_alter_table("payroll") as batch:
+        batch.drop_constraint("uq_payroll_employee_month", type_="unique")
+
+    op.drop_index("ix_attendance_date", table_name="attendance")
+    with op.batch_alter_table("attendance") as batch:
+        batch.drop_constraint("uq_attendance_employee_date", type_="unique")
@@ -0,0 +1,42 @@
+"""monthly attendance rollup
+
+Created empty; backfill with `python -m scripts.rebuild_attendance_rollup`.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "attendance_monthly",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employee_profiles.id"), nullable=False),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("month", sa.String(), nullable=False),
+        sa.Column("present_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("half_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("absent_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("leave_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("minutes_worked", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("employee_id", "month", name="uq_attendance_monthly_employee_month"),
+    )
+    op.create_index("ix_attendance_monthly_id", "attendance_monthly", ["id"])
+    op.create_index(
+        "ix_attendance_monthly_company_month", "attendance_monthly", ["company_id", "month", "employee_id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_attendance_monthly_company_month", table_name="attendance_monthly")
+    op.drop_index("ix_attendance_monthly_id", table_name="attendance_monthly")
+    op.drop_table("attendance_monthly")
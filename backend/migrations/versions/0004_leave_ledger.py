@@ -0,0 +1,50 @@
+"""leave ledger and per-type balances
+
+Starts empty: balances come from accrual runs (POST /leave/accruals).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leave_ledger",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employee_profiles.id"), nullable=False),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("leave_type", sa.String(), nullable=False),
+        sa.Column("delta", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+        sa.Column("leave_request_id", sa.Integer(), sa.ForeignKey("leave_requests.id"), nullable=True),
+        sa.Column("period", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("employee_id", "leave_type", "period", name="uq_leave_ledger_accrual"),
+    )
+    op.create_index("ix_leave_ledger_id", "leave_ledger", ["id"])
+    op.create_index("ix_leave_ledger_employee_type_id", "leave_ledger", ["employee_id", "leave_type", "id"])
+
+    op.create_table(
+        "leave_balances",
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employee_profiles.id"), primary_key=True),
+        sa.Column("leave_type", sa.String(), primary_key=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("balance", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("used", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_table("leave_balances")
+    op.drop_index("ix_leave_ledger_employee_type_id", table_name="leave_ledger")
+    op.drop_index("ix_leave_ledger_id", table_name="leave_ledger")
+    op.drop_table("leave_ledger")
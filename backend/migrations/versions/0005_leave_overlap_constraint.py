@@ -0,0 +1,51 @@
+"""no overlapping pending/approved leave per employee (PostgreSQL)
+
+Other dialects rely on the application check, which reads
+ix_leave_requests_employee_start.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    # Which of two overlapping leaves is the real one is an HR decision.
+    overlaps = bind.execute(sa.text(
+        "SELECT a.employee_id, a.id, b.id FROM leave_requests a"
+        " JOIN leave_requests b ON b.employee_id = a.employee_id AND b.id > a.id"
+        " AND b.start_date <= a.end_date AND b.end_date >= a.start_date"
+        " WHERE a.status IN ('pending', 'approved') AND b.status IN ('pending', 'approved')"
+        " LIMIT 20"
+    )).fetchall()
+    if overlaps:
+        raise RuntimeError(
+            "Reject or cancel overlapping leave requests (employee_id, leave_id, leave_id) before migrating: "
+            f"{[tuple(row) for row in overlaps]}"
+        )
+
+    # GiST has no integer equality operator class without btree_gist
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE leave_requests ADD CONSTRAINT ex_leave_requests_no_overlap"
+        " EXCLUDE USING gist (employee_id WITH =, daterange(start_date, end_date, '[]') WITH &&)"
+        " WHERE (status IN ('pending', 'approved'))"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE leave_requests DROP CONSTRAINT ex_leave_requests_no_overlap")
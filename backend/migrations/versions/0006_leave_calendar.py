@@ -0,0 +1,37 @@
+"""per-day leave calendar
+
+Created empty; backfill with `python -m scripts.rebuild_leave_calendar`.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leave_calendar",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employee_profiles.id"), nullable=False),
+        sa.Column("leave_request_id", sa.Integer(), sa.ForeignKey("leave_requests.id"), nullable=False),
+        sa.Column("leave_type", sa.String(), nullable=False),
+        sa.UniqueConstraint("leave_request_id", "day", name="uq_leave_calendar_leave_day"),
+    )
+    op.create_index("ix_leave_calendar_id", "leave_calendar", ["id"])
+    op.create_index("ix_leave_calendar_company_day", "leave_calendar", ["company_id", "day", "employee_id"])
+
+
+def downgrade():
+    op.drop_index("ix_leave_calendar_company_day", table_name="leave_calendar")
+    op.drop_index("ix_leave_calendar_id", table_name="leave_calendar")
+    op.drop_table("leave_calendar")
@@ -0,0 +1,25 @@
+"""loss-of-pay breakdown on payslips
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("payroll", sa.Column("lop_days", sa.Float(), nullable=True))
+    op.add_column("payroll", sa.Column("loss_of_pay", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("payroll") as batch:
+        batch.drop_column("loss_of_pay")
+        batch.drop_column("lop_days")
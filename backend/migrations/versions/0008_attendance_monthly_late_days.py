@@ -0,0 +1,28 @@
+"""late arrivals in the monthly attendance rollup
+
+Existing rows start at 0; restate them with `python -m scripts.rebuild_attendance_rollup`.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "attendance_monthly",
+        sa.Column("late_days", sa.Integer(), nullable=False, server_default="0")
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("attendance_monthly") as batch:
+        batch.drop_column("late_days")
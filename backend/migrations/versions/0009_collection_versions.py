@@ -0,0 +1,29 @@
+"""per-employee collection versions for conditional GETs
+
+Created empty: every collection starts at version 0 and moves on its next write.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "collection_versions",
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employee_profiles.id"), primary_key=True),
+        sa.Column("collection", sa.String(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_table("collection_versions")
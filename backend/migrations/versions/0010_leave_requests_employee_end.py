@@ -0,0 +1,21 @@
+"""leave overlap lookup seeks on (employee_id, end_date)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_leave_requests_employee_end", "leave_requests", ["employee_id", "end_date"])
+
+
+def downgrade():
+    op.drop_index("ix_leave_requests_employee_end", table_name="leave_requests")
@@ -0,0 +1,174 @@
+"""Fail if any endpoint query falls back to a sequential scan.
+
+Migrates and seeds a scratch database, drives every read/write endpoint
+through the real app, captures each SELECT the app issues and EXPLAINs it.
+Exits non-zero when a plan contains a full table scan (PostgreSQL "Seq Scan",
+SQLite "SCAN <table>" without an index).
+
+    DATABASE_URL=sqlite:///./plans.db python -m scripts.check_query_plans --employees 2000
+"""
+import argparse
+import asyncio
+import re
+import sys
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import event, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable, Select
+
+from app.core.security import create_access_token
+from app.db.session import async_engine, engine, SessionLocal
+from app.main import app
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+from app.models.user import User
+from scripts.seed import migrate, seed
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    prefix = "EXPLAIN QUERY PLAN " if compiler.dialect.name == "sqlite" else "EXPLAIN "
+    return prefix + compiler.process(element.statement, **kw)
+
+
+# ---------------- Capture ----------------
+captured = []
+
+
+@event.listens_for(async_engine.sync_engine, "before_execute")
+def _capture_select(conn, clauseelement, multiparams, params, execution_options):
+    if isinstance(clauseelement, Select):
+        captured.append((clauseelement, multiparams, params))
+
+
+def _token(user) -> dict:
+    token = create_access_token({"user_id": user.id, "company_id": user.company_id, "role": user.role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def exercise_endpoints():
+    with SessionLocal() as db:
+        admin = db.scalars(select(User).where(User.role == "admin").order_by(User.id)).first()
+        employee = db.scalars(
+            select(User).where(User.company_id == admin.company_id, User.role == "employee").order_by(User.id)
+        ).first()
+        profile = db.scalar(select(EmployeeProfile).where(EmployeeProfile.user_id == employee.id))
+        department = profile.department
+        pending = db.scalar(
+            select(LeaveRequest.id)
+            .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
+            .where(EmployeeProfile.company_id == admin.company_id, LeaveRequest.status == "pending")
+        )
+
+    hr, me = _token(admin), _token(employee)
+    month_ago = (date.today() - timedelta(days=30)).isoformat()
+    last_month = (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+    calls = [
+        ("GET", "/employees/", hr, {}),
+        ("GET", "/employees/", hr, {"department": department}),
+        ("GET", "/employees/me", me, {}),
+        ("GET", "/attendance/me", me, {}),
+        ("GET", "/attendance/me", me, {"date_from": month_ago, "status": "present"}),
+        ("GET", "/attendance/summary/me", me, {"month": last_month}),
+        ("GET", "/attendance/summary/company", hr, {"month": last_month}),
+        ("GET", "/attendance/summary/company", hr, {"month": last_month, "department": department}),
+        ("GET", "/leave/me", me, {}),
+        ("GET", "/leave/balance", me, {}),
+        ("GET", "/leave/company", hr, {}),
+        ("GET", "/leave/company", hr, {"status": "pending", "department": department}),
+        ("GET", "/leave/calendar", hr, {"date_from": month_ago}),
+        ("GET", "/leave/calendar", hr, {"date_from": month_ago, "department": department}),
+        ("GET", "/payroll/me", me, {}),
+        ("GET", "/payroll/company", hr, {}),
+        ("GET", "/payroll/company", hr, {"month": last_month}),
+        ("GET", "/reports/dashboard", hr, {}),
+        ("GET", "/reports/analytics", hr, {}),
+        ("GET", "/payroll/company/export", hr, {"month": last_month}),
+        ("GET", "/leave/company/export", hr, {"status": "pending"}),
+        ("GET", "/attendance/company/export", hr, {"date_from": month_ago}),
+        ("POST", "/attendance/check-in", me, {}),
+        ("POST", "/attendance/check-out", me, {}),
+        ("POST", f"/leave/{pending}/approve", hr, {}),
+        ("POST", "/leave/decisions", hr, {"json": {"decisions": [{"leave_id": pending, "decision": "reject"}]}}),
+        ("POST", "/leave/apply", me, {"json": {
+            "leave_type": "unpaid", "start_date": "2099-01-05", "end_date": "2099-01-06"
+        }}),
+        ("POST", "/attendance/punches", hr, {"json": {"punches": [
+            {"employee_code": profile.employee_code, "timestamp": f"{month_ago}T09:00:00", "direction": "in"}
+        ]}}),
+        ("POST", "/leave/accruals", hr, {"json": {"month": "2099-01"}}),
+        ("POST", "/payroll/run", hr, {"json": {"month": "2099-02"}}),
+        ("POST", "/payroll/create", hr, {
+            "employee_id": profile.id, "basic_salary": 1000, "deductions": 0, "month": "2099-01"
+        }),
+    ]
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://plans") as client:
+        for method, path, headers, params in calls:
+            body = params.pop("json", None)
+            response = await client.request(method, path, headers=headers, params=params, json=body)
+            if response.status_code >= 500:
+                raise SystemExit(f"{method} {path} failed: {response.status_code} {response.text}")
+            # Follow one page so the keyset predicate is planned too
+            body = response.json() if "json" in response.headers.get("content-type", "") else None
+            if isinstance(body, dict) and body.get("next_cursor"):
+                await client.request(method, path, headers=headers, params={**params, "cursor": body["next_cursor"]})
+
+
+# ---------------- Plan Inspection ----------------
+def full_scans(conn, statement, multiparams, params) -> list:
+    parameters = multiparams[0] if multiparams else (params or None)
+    # Raw rows: the plan's columns are not the statement's, so skip its type processors
+    rows = conn.execute(Explain(statement), parameters).cursor.fetchall()
+
+    if conn.dialect.name == "sqlite":
+        details = [row[-1] for row in rows]
+        return [d for d in details if _SQLITE_FULL_SCAN.match(d)]
+    return [row[0] for row in rows if "Seq Scan" in row[0]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--employees", type=int, default=500, help="employees per company")
+    parser.add_argument("--days", type=int, default=120)
+    args = parser.parse_args()
+
+    migrate()
+    seed(args.companies, args.employees, args.days)
+    asyncio.run(exercise_endpoints())
+
+    failures, seen = [], set()
+    with engine.connect() as conn:
+        for statement, multiparams, params in captured:
+            sql = str(statement.compile(dialect=conn.dialect))
+            if sql in seen:
+                continue
+            seen.add(sql)
+
+            scans = full_scans(conn, statement, multiparams, params)
+            if scans:
+                failures.append((sql, scans))
+
+    print(f"Checked {len(seen)} distinct queries")
+    for sql, scans in failures:
+        print("\nFULL SCAN:", "; ".join(scans))
+        print(sql)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
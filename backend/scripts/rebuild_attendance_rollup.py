@@ -0,0 +1,38 @@
+"""Rebuild the monthly attendance rollup from attendance and approved leave.
+
+Use after a backfill, a bulk import that bypassed the API, or to repair
+drift. Scoped rebuilds replace only the matching rollup rows.
+
+    python -m scripts.rebuild_attendance_rollup                      # everything
+    python -m scripts.rebuild_attendance_rollup --company 3 --month 2026-09
+"""
+import argparse
+import re
+import time
+
+from app.db.session import SessionLocal
+from app.services.attendance_rollup import rebuild
+
+
+def month_arg(value: str) -> str:
+    if not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", value):
+        raise argparse.ArgumentTypeError("expected YYYY-MM")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--company", type=int, help="only this company id")
+    parser.add_argument("--month", type=month_arg, help="only this month (YYYY-MM)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        rows = rebuild(db, company_id=args.company, month=args.month)
+        db.commit()
+
+    print(f"Rebuilt {rows} rollup rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
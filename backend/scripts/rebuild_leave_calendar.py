@@ -0,0 +1,29 @@
+"""Rebuild the per-day leave calendar from approved leave requests.
+
+Use after migrating, a bulk import that bypassed the API, or to repair drift.
+
+    python -m scripts.rebuild_leave_calendar              # everything
+    python -m scripts.rebuild_leave_calendar --company 3
+"""
+import argparse
+import time
+
+from app.db.session import SessionLocal
+from app.services.leave_calendar import rebuild_calendar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--company", type=int, help="only this company id")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        rows = rebuild_calendar(db, company_id=args.company)
+        db.commit()
+
+    print(f"Rebuilt {rows} calendar days in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
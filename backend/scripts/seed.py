@@ -0,0 +1,270 @@
+"""Generate synthetic companies, employees and their history.
+
+Run from backend/ against a scratch database (never production):
+
+    DATABASE_URL=sqlite:///./seed.db python -m scripts.seed --companies 2 --employees 1000 --years 2
+
+Works the same against a local PostgreSQL (DATABASE_URL=postgresql://...). The schema is migrated to head first.
+Rows are written with batched Core inserts, so a few million attendance rows take seconds rather than minutes.
+Past payslips are priced by the payroll engine from the seeded absences and unpaid leave, as a real run would.
+The same --seed reproduces the same data.
+"""
+import argparse
+import random
+from datetime import date, time, timedelta
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+import numpy as np
+from sqlalchemy import func, insert, select
+
+from app.core import config
+from app.core.security import hash_password
+from app.db.session import SessionLocal
+from app.models.attendance import Attendance
+from app.models.company import Company
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+from app.models.leave_ledger import LeaveLedgerEntry
+from app.models.payroll import Payroll
+from app.models.user import User
+from app.services.attendance_rollup import month_bounds, month_key
+from app.services.attendance_rollup import rebuild as rebuild_attendance_rollup
+from app.services.leave_calendar import rebuild_calendar
+from app.services.leave_ledger import is_tracked, leave_days, rebuild_balances
+from app.services.payroll_engine import PayrollInputs, compute, unpaid_leave_days
+
+DEPARTMENTS = ["Engineering", "Sales", "Support", "Finance", "Operations", "People"]
+LEAVE_TYPES = ["paid", "sick", "unpaid"]
+BATCH_SIZE = 10000
+
+# Every seeded account shares this password so benchmarks can log in
+SEED_PASSWORD = "password123"
+
+
+def _insert(db, model, rows: list):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def _months(first: date, last: date) -> list:
+    months, current = [], first.replace(day=1)
+    while current <= last:
+        months.append(current.strftime("%Y-%m"))
+        current = (current + timedelta(days=32)).replace(day=1)
+    return months
+
+
+def _payslips(profiles: list, absences: dict, leaves: list, month: str) -> list:
+    """One month's payslips for profiles, computed by the payroll engine."""
+    first, last = month_bounds(month)
+    ordered = sorted(profiles)
+    employee_ids = np.array([employee_id for employee_id, _ in ordered], dtype=np.int64)
+    unpaid = [
+        (leave["employee_id"], leave["start_date"], leave["end_date"])
+        for leave in leaves
+        if leave["status"] == "approved" and leave["leave_type"] in config.PAYROLL_UNPAID_LEAVE_TYPES
+    ]
+    payslips = compute(PayrollInputs(
+        employee_ids=employee_ids,
+        salary=np.array([salary for _, salary in ordered], dtype=np.int64),
+        unpaid_days=unpaid_leave_days(employee_ids, unpaid, first, last),
+        absent_days=np.array([absences.get((employee_id, month), 0.0) for employee_id, _ in ordered]),
+        days_in_month=last.day
+    ))
+    columns = {name: values.tolist() for name, values in payslips.items()}
+    return [
+        dict(zip(columns, values), month=month)
+        for values in zip(*columns.values())
+    ]
+
+
+def seed_company(db, rng: random.Random, name: str, employees: int, days: int, password_hash: str) -> int:
+    company = Company(name=name)
+    db.add(company)
+    db.flush()
+
+    slug = name.lower().replace(" ", "-")
+    db.add(User(
+        company_id=company.id,
+        email=f"admin@{slug}.test",
+        full_name=f"{name} Admin",
+        hashed_password=password_hash,
+        role="admin",
+        is_active=True
+    ))
+
+    _insert(db, User, [
+        {
+            "company_id": company.id,
+            "email": f"employee{i}@{slug}.test",
+            "full_name": f"Employee {i}",
+            "hashed_password": password_hash,
+            "role": "employee",
+            "is_active": rng.random() > 0.03,
+        }
+        for i in range(employees)
+    ])
+    user_ids = db.scalars(
+        select(User.id)
+        .where(User.company_id == company.id, User.role == "employee")
+        .order_by(User.id)
+    ).all()
+
+    _insert(db, EmployeeProfile, [
+        {
+            "user_id": user_id,
+            "company_id": company.id,
+            "employee_code": f"C{company.id}E{i:06d}",
+            "full_name": f"Employee {i}",
+            "job_title": "Employee",
+            "department": rng.choice(DEPARTMENTS),
+            "salary": rng.randrange(30000, 150000, 500),  # monthly wage
+            "year_of_joining": rng.randint(2015, date.today().year),
+        }
+        for i, user_id in enumerate(user_ids)
+    ])
+    profiles = db.execute(
+        select(EmployeeProfile.id, EmployeeProfile.salary)
+        .where(EmployeeProfile.company_id == company.id)
+    ).all()
+
+    today = date.today()
+    first_day = today - timedelta(days=days)
+    workdays = [
+        first_day + timedelta(days=d)
+        for d in range(days)
+        if (first_day + timedelta(days=d)).weekday() < 5
+    ]
+
+    attendance, leaves = [], []
+    absences = {}  # (employee_id, month) -> absent days, a half-day counting 0.5
+    for employee_id, _ in profiles:
+        for day in workdays:
+            roll = rng.random()
+            if roll < 0.04:
+                attendance.append({"employee_id": employee_id, "date": day, "status": "absent"})
+                key = (employee_id, month_key(day))
+                absences[key] = absences.get(key, 0.0) + 1
+                continue
+            if roll > 0.97:
+                key = (employee_id, month_key(day))
+                absences[key] = absences.get(key, 0.0) + 0.5
+            check_in = time(8 + (roll > 0.85), rng.randrange(0, 60))
+            attendance.append({
+                "employee_id": employee_id,
+                "date": day,
+                "check_in_time": check_in,
+                "check_out_time": time(rng.randint(16, 19), rng.randrange(0, 60)),
+                "status": "half-day" if roll > 0.97 else "present",
+            })
+
+        # One employee's leaves never overlap (ex_leave_requests_no_overlap on PostgreSQL)
+        taken = []
+        for _ in range(max(1, days // 60)):
+            start = first_day + timedelta(days=rng.randrange(max(days, 1)))
+            end = start + timedelta(days=rng.randint(0, 4))
+            if any(start <= other_end and end >= other_start for other_start, other_end in taken):
+                continue
+            taken.append((start, end))
+            leaves.append({
+                "employee_id": employee_id,
+                "leave_type": rng.choice(LEAVE_TYPES),
+                "start_date": start,
+                "end_date": end,
+                "status": rng.choices(["approved", "rejected", "pending"], weights=[80, 10, 10])[0],
+            })
+
+        if len(attendance) >= BATCH_SIZE:
+            _insert(db, Attendance, attendance)
+            attendance = []
+
+    _insert(db, Attendance, attendance)
+    _insert(db, LeaveRequest, leaves)
+
+    for month in _months(first_day, today)[:-1]:  # current month not run yet
+        _insert(db, Payroll, _payslips(profiles, absences, leaves, month))
+
+    # Leave ledger: monthly accruals, then a debit per approved balance-tracked leave
+    ledger = [
+        {
+            "employee_id": employee_id,
+            "company_id": company.id,
+            "leave_type": leave_type,
+            "delta": days,
+            "reason": "accrual",
+            "period": month,
+        }
+        for month in _months(first_day, today)
+        for employee_id, _ in profiles
+        for leave_type, days in config.LEAVE_MONTHLY_ACCRUAL.items()
+    ]
+    approved = db.execute(
+        select(LeaveRequest.id, LeaveRequest.employee_id, LeaveRequest.leave_type,
+               LeaveRequest.start_date, LeaveRequest.end_date)
+        .join(EmployeeProfile, LeaveRequest.employee_id == EmployeeProfile.id)
+        .where(EmployeeProfile.company_id == company.id, LeaveRequest.status == "approved")
+    ).all()
+    ledger += [
+        {
+            "employee_id": leave.employee_id,
+            "company_id": company.id,
+            "leave_type": leave.leave_type,
+            "delta": -leave_days(leave.start_date, leave.end_date),
+            "reason": "approval",
+            "leave_request_id": leave.id,
+        }
+        for leave in approved if is_tracked(leave.leave_type)
+    ]
+    _insert(db, LeaveLedgerEntry, ledger)
+
+    return company.id
+
+
+def migrate():
+    """Bring the schema to the latest migration."""
+    command.upgrade(Config(str(Path(__file__).resolve().parents[1] / "alembic.ini")), "head")
+
+
+def seed(companies: int = 1, employees: int = 200, days: int = 90, seed: int = 42) -> bool:
+    """Seed an empty database; returns False (and writes nothing) if data already exists."""
+    rng = random.Random(seed)
+    password_hash = hash_password(SEED_PASSWORD)
+
+    with SessionLocal() as db:
+        if db.scalar(select(func.count(Company.id))):
+            return False
+
+        for n in range(companies):
+            seed_company(db, rng, f"Seed Company {n + 1}", employees, days, password_hash)
+        rebuild_attendance_rollup(db)
+        rebuild_balances(db)
+        rebuild_calendar(db)
+        db.commit()
+
+        # Fresh planner statistics, otherwise EXPLAIN reflects an empty database
+        db.connection().exec_driver_sql("ANALYZE")
+        db.commit()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=1)
+    parser.add_argument("--employees", type=int, default=200, help="employees per company")
+    parser.add_argument("--days", type=int, default=90, help="days of history per employee")
+    parser.add_argument("--years", type=float, help="years of history, overrides --days")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    args = parser.parse_args()
+    days = round(args.years * 365) if args.years else args.days
+
+    migrate()
+    if seed(args.companies, args.employees, days, args.seed):
+        print(f"Seeded {args.companies} x {args.employees} employees, {days} days of history")
+    else:
+        print("Database already has companies, nothing seeded")
+
+
+if __name__ == "__main__":
+    main()
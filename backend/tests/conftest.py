@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+# Before app.core.config is imported: every test session gets a scratch SQLite database
+_db_dir = tempfile.mkdtemp(prefix="dayflow-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["PAYSLIP_CACHE_DIR"] = f"{_db_dir}/payslips"
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.employee import EmployeeProfile
+from app.models.user import User
+from scripts.seed import migrate, seed
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # One event loop for the whole session: the async engine's pool is bound to it
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client(anyio_backend):
+    """The real app over an in-process ASGI transport."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def seeded():
+    migrate()
+    seed(employees=5, days=10)
+
+
+def _headers(user) -> dict:
+    token = create_access_token({"user_id": user.id, "company_id": user.company_id, "role": user.role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def employee(seeded):
+    """(profile id, auth headers) of the first seeded employee."""
+    with SessionLocal() as db:
+        user = db.scalars(select(User).where(User.role == "employee").order_by(User.id)).first()
+        profile_id = db.scalar(select(EmployeeProfile.id).where(EmployeeProfile.user_id == user.id))
+        return profile_id, _headers(user)
+
+
+@pytest.fixture
+def admin(seeded):
+    with SessionLocal() as db:
+        user = db.scalars(select(User).where(User.role == "admin").order_by(User.id)).first()
+        return _headers(user)
@@ -0,0 +1,16 @@
+import pytest
+
+from app.core.cache import TTLCache
+from app.services import analytics
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_report_returned_when_cache_keeps_nothing(client, admin, monkeypatch):
+    # ANALYTICS_CACHE_TTL=0: every entry has expired by the time it could be read back
+    monkeypatch.setattr(analytics, "_cache", TTLCache(maxsize=10, ttl=0))
+
+    response = await client.get("/reports/analytics", headers=admin, params={"dimension": "month"})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["dimension"] == "month"
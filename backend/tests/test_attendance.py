@@ -0,0 +1,38 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.db.session import SessionLocal
+from app.models.attendance import Attendance
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_check_ins_record_one_day(client, employee):
+    employee_id, headers = employee
+    with SessionLocal() as db:
+        db.execute(delete(Attendance).where(Attendance.employee_id == employee_id, Attendance.date == date.today()))
+        db.commit()
+
+    responses = await asyncio.gather(*(
+        client.post("/attendance/check-in", headers=headers) for _ in range(5)
+    ))
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 400, 400, 400, 400], [response.text for response in responses]
+    assert all(
+        response.json()["detail"] == "Already checked in today"
+        for response in responses if response.status_code == 400
+    )
+    with SessionLocal() as db:
+        rows = db.scalar(
+            select(func.count()).where(Attendance.employee_id == employee_id, Attendance.date == date.today())
+        )
+    assert rows == 1
+
+    responses = await asyncio.gather(*(
+        client.post("/attendance/check-out", headers=headers) for _ in range(3)
+    ))
+    assert sorted(response.status_code for response in responses) == [200, 400, 400]
@@ -0,0 +1,30 @@
+from datetime import date
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_me_collection_revalidates_until_a_write(client, employee):
+    _, headers = employee
+
+    first = await client.get("/leave/me", headers=headers)
+    assert first.status_code == 200, first.text
+    tag = first.headers["ETag"]
+
+    response = await client.get("/leave/me", headers={**headers, "If-None-Match": f"W/{tag}"})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == tag
+
+    # The tag covers the query string: another page is another representation
+    response = await client.get("/leave/me?limit=1", headers={**headers, "If-None-Match": tag})
+    assert response.status_code == 200
+
+    response = await client.post("/leave/apply", headers=headers, json={
+        "leave_type": "unpaid", "start_date": date(2037, 2, 2).isoformat(), "end_date": date(2037, 2, 2).isoformat()
+    })
+    assert response.status_code == 200, response.text
+
+    response = await client.get("/leave/me", headers={**headers, "If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != tag
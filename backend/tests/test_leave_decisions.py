@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.employee import EmployeeProfile
+from app.models.leave import LeaveRequest
+from app.models.leave_ledger import LeaveBalance
+
+pytestmark = pytest.mark.anyio
+
+
+async def _apply(client, headers: dict, leave_type: str, start: date, end: date) -> int:
+    response = await client.post("/leave/apply", headers=headers, json={
+        "leave_type": leave_type, "start_date": start.isoformat(), "end_date": end.isoformat()
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["leave_id"]
+
+
+async def test_bulk_decisions_apply_each_item_on_its_own(client, employee, admin):
+    employee_id, headers = employee
+    with SessionLocal() as db:
+        company_id = db.scalar(select(EmployeeProfile.company_id).where(EmployeeProfile.id == employee_id))
+        db.merge(LeaveBalance(employee_id=employee_id, leave_type="sick", company_id=company_id, balance=3, used=0))
+        db.commit()
+
+    fits = await _apply(client, headers, "sick", date(2036, 5, 4), date(2036, 5, 5))
+    over = await _apply(client, headers, "sick", date(2036, 5, 11), date(2036, 5, 12))
+    unpaid = await _apply(client, headers, "unpaid", date(2036, 5, 18), date(2036, 5, 18))
+
+    response = await client.post("/leave/decisions", headers=admin, json={"decisions": [
+        {"leave_id": fits, "decision": "approve"},
+        {"leave_id": over, "decision": "approve"},
+        {"leave_id": unpaid, "decision": "reject", "comment": "Busy week"},
+        {"leave_id": fits, "decision": "reject"},
+        {"leave_id": 999999, "decision": "approve"},
+    ]})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["applied"], body["failed"]) == (2, 3)
+    results = body["results"]
+    assert results[0]["status"] == "approved"
+    assert "Insufficient sick leave balance" in results[1]["error"]
+    assert results[2]["status"] == "rejected"
+    assert results[3]["error"] == "Duplicate leave_id in batch"
+    assert results[4]["error"] == "Leave not found"
+
+    with SessionLocal() as db:
+        leaves = {
+            leave.id: leave
+            for leave in db.scalars(select(LeaveRequest).where(LeaveRequest.id.in_([fits, over, unpaid])))
+        }
+        balance = db.get(LeaveBalance, (employee_id, "sick"))
+    assert leaves[fits].status == "approved"
+    assert leaves[over].status == "pending"
+    assert (leaves[unpaid].status, leaves[unpaid].admin_comment) == ("rejected", "Busy week")
+    assert (balance.balance, balance.used) == (1, 2)
@@ -0,0 +1,76 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.session import SessionLocal
+from app.models.employee import EmployeeProfile
+from app.models.leave_ledger import LeaveBalance, LeaveLedgerEntry
+
+pytestmark = pytest.mark.anyio
+
+
+async def _balance(client, headers: dict, leave_type: str) -> dict:
+    response = await client.get("/leave/balance", headers=headers)
+    assert response.status_code == 200, response.text
+    return next(row for row in response.json() if row["leave_type"] == leave_type)
+
+
+async def _apply(client, headers: dict, start: date, end: date) -> int:
+    response = await client.post("/leave/apply", headers=headers, json={
+        "leave_type": "sick", "start_date": start.isoformat(), "end_date": end.isoformat()
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["leave_id"]
+
+
+def _ledger_total(employee_id: int) -> int:
+    with SessionLocal() as db:
+        return db.scalar(
+            select(func.coalesce(func.sum(LeaveLedgerEntry.delta), 0))
+            .where(LeaveLedgerEntry.employee_id == employee_id, LeaveLedgerEntry.leave_type == "sick")
+        )
+
+
+async def test_accrual_credits_each_period_once(client, employee, admin):
+    _, headers = employee
+    before = await _balance(client, headers, "sick")
+
+    for _ in range(2):
+        response = await client.post("/leave/accruals", headers=admin, json={"month": "2035-01"})
+        assert response.status_code == 200, response.text
+
+    after = await _balance(client, headers, "sick")
+    assert after["balance"] == before["balance"] + after["monthly_accrual"]
+
+
+async def test_approval_debits_and_rejection_credits(client, employee, admin):
+    employee_id, headers = employee
+    with SessionLocal() as db:
+        company_id = db.scalar(select(EmployeeProfile.company_id).where(EmployeeProfile.id == employee_id))
+        db.merge(LeaveBalance(employee_id=employee_id, leave_type="sick", company_id=company_id, balance=3, used=0))
+        db.commit()
+    base = _ledger_total(employee_id)
+
+    first = await _apply(client, headers, date(2035, 3, 2), date(2035, 3, 3))
+    second = await _apply(client, headers, date(2035, 3, 9), date(2035, 3, 10))
+
+    response = await client.post(f"/leave/{first}/approve", headers=admin)
+    assert response.status_code == 200, response.text
+    balance = await _balance(client, headers, "sick")
+    assert (balance["balance"], balance["used"]) == (1, 2)
+
+    # Both fit when applied for; only one fits once the first is approved
+    response = await client.post(f"/leave/{second}/approve", headers=admin)
+    assert response.status_code == 400, response.text
+    assert "Insufficient sick leave balance" in response.json()["detail"]
+
+    # Approving again is not a status change and does not debit twice
+    response = await client.post(f"/leave/{first}/approve", headers=admin)
+    assert response.status_code == 200, response.text
+
+    response = await client.post(f"/leave/{first}/reject", headers=admin)
+    assert response.status_code == 200, response.text
+    balance = await _balance(client, headers, "sick")
+    assert (balance["balance"], balance["used"]) == (3, 0)
+    assert _ledger_total(employee_id) == base
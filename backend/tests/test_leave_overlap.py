@@ -0,0 +1,35 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.core import config
+from app.db.session import SessionLocal
+from app.models.leave import LeaveRequest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _apply(client, headers: dict, start: date, end: date):
+    return await client.post("/leave/apply", headers=headers, json={
+        "leave_type": "unpaid", "start_date": start.isoformat(), "end_date": end.isoformat()
+    })
+
+
+async def test_overlap_with_leave_longer_than_max_days(client, employee):
+    employee_id, headers = employee
+    # Stored before the limit applied: starts well before start - LEAVE_MAX_DAYS
+    first = date(2031, 1, 1)
+    long_end = first + timedelta(days=config.LEAVE_MAX_DAYS * 2)
+    with SessionLocal() as db:
+        db.add(LeaveRequest(
+            employee_id=employee_id, leave_type="unpaid", start_date=first, end_date=long_end, status="approved"
+        ))
+        db.commit()
+
+    start = long_end - timedelta(days=2)
+    response = await _apply(client, headers, start, start + timedelta(days=4))
+    assert response.status_code == 409, response.text
+    assert f"{first} to {long_end}" in response.json()["detail"]
+
+    response = await _apply(client, headers, long_end + timedelta(days=1), long_end + timedelta(days=2))
+    assert response.status_code == 200, response.text
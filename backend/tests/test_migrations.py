@@ -0,0 +1,47 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def _alembic(url: str, *args):
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND, env={**os.environ, "DATABASE_URL": url}, check=True, capture_output=True
+    )
+
+
+def test_duplicate_attendance_days_are_merged_not_dropped(tmp_path):
+    path = tmp_path / "migrate.db"
+    _alembic(f"sqlite:///{path}", "upgrade", "0001")
+
+    with sqlite3.connect(path) as db:
+        db.executemany(
+            "INSERT INTO attendance (id, employee_id, date, check_in_time, check_out_time, status) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                # One day punched three times: the check-out only on the last row
+                (1, 7, "2026-03-02", "09:05:00.000000", None, "absent"),
+                (2, 7, "2026-03-02", "09:00:00.000000", None, "present"),
+                (3, 7, "2026-03-02", None, "18:00:00.000000", "present"),
+                (4, 7, "2026-03-03", "09:10:00.000000", "17:00:00.000000", "present"),
+                # No key: never collides under the unique constraint, left alone
+                (5, 7, None, None, None, "present"),
+                (6, 7, None, None, None, "present"),
+            ]
+        )
+
+    _alembic(f"sqlite:///{path}", "upgrade", "0002")
+
+    with sqlite3.connect(path) as db:
+        rows = db.execute(
+            "SELECT id, check_in_time, check_out_time, status FROM attendance ORDER BY id"
+        ).fetchall()
+    assert rows == [
+        (1, "09:00:00.000000", "18:00:00.000000", "present"),
+        (4, "09:10:00.000000", "17:00:00.000000", "present"),
+        (5, None, None, "present"),
+        (6, None, None, "present"),
+    ]
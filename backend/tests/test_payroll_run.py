@@ -0,0 +1,52 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.attendance import Attendance
+from app.models.employee import EmployeeProfile
+from app.models.payroll import Payroll
+from app.models.user import User
+from app.services.attendance_rollup import rebuild as rebuild_attendance_rollup
+
+pytestmark = pytest.mark.anyio
+
+MONTH = "2033-03"
+
+
+async def test_only_recorded_absences_are_deducted(client, employee, admin):
+    absent_id, _ = employee
+    with SessionLocal() as db:
+        company_id = db.scalar(select(EmployeeProfile.company_id).where(EmployeeProfile.id == absent_id))
+        present_id = db.scalar(
+            select(EmployeeProfile.id)
+            .join(User, User.id == EmployeeProfile.user_id)
+            .where(
+                EmployeeProfile.company_id == company_id,
+                EmployeeProfile.id != absent_id,
+                EmployeeProfile.salary > 0,
+                User.is_active.is_(True)
+            )
+            .order_by(EmployeeProfile.id)
+        )
+        db.add_all([
+            Attendance(employee_id=absent_id, date=date(2033, 3, 9), status="present"),
+            Attendance(employee_id=absent_id, date=date(2033, 3, 10), status="absent"),
+            Attendance(employee_id=present_id, date=date(2033, 3, 10), status="present"),
+        ])
+        db.flush()
+        rebuild_attendance_rollup(db, company_id=company_id, month=MONTH)
+        db.commit()
+
+    response = await client.post("/payroll/run", headers=admin, json={"month": MONTH})
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    # Everyone else has no attendance in the month: paid in full, and reported
+    assert summary["created"] >= 2
+    assert summary["without_attendance"] == summary["created"] - 2
+
+    with SessionLocal() as db:
+        lop_days = dict(db.execute(select(Payroll.employee_id, Payroll.lop_days).where(Payroll.month == MONTH)).all())
+    assert lop_days.pop(absent_id) == 1
+    assert set(lop_days.values()) == {0}
@@ -0,0 +1,33 @@
+import pytest
+
+from app.db.session import SessionLocal
+from app.models.payroll import Payroll
+from app.services.payslip_render import line_items, render_html, render_pdf
+
+pytestmark = pytest.mark.anyio
+
+LEGACY = {
+    "payroll_id": 1, "month": None, "company": "Acme", "employee_code": None, "full_name": "A. Person",
+    "department": None, "job_title": None, "basic_salary": 50000, "lop_days": None, "loss_of_pay": None,
+    "deductions": None, "net_salary": None,
+}
+
+
+def test_render_payslip_with_null_deductions_and_month():
+    assert dict(line_items(LEGACY))["Statutory deductions"] == "-"
+    assert b"Payslip for -" in render_html(LEGACY)
+    assert render_pdf(LEGACY).startswith(b"%PDF")
+
+
+@pytest.mark.parametrize("fmt", ["html", "pdf"])
+async def test_download_legacy_payslip(client, employee, admin, fmt):
+    employee_id, _ = employee
+    with SessionLocal() as db:
+        payroll = Payroll(employee_id=employee_id, basic_salary=50000)
+        db.add(payroll)
+        db.commit()
+        payroll_id = payroll.id
+
+    response = await client.get(f"/payroll/{payroll_id}/payslip", headers=admin, params={"format": fmt})
+    assert response.status_code == 200, response.text
+    assert "undated" in response.headers["content-disposition"]
@@ -0,0 +1,27 @@
+import pytest
+
+from app.core import config
+from app.services import punch_buffer as punch_buffer_module
+from app.services.punch_buffer import punch_buffer
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_flush_answers_503(client, employee, monkeypatch):
+    _, headers = employee
+
+    async def broken(db, punches):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(config, "PUNCH_WRITE_MODE", "buffered")
+    monkeypatch.setattr(punch_buffer, "durability", "commit")
+    monkeypatch.setattr(punch_buffer_module, "apply_punches", broken)
+    failures = punch_buffer.stats()["flush_failures"]
+    try:
+        response = await client.post("/attendance/check-in", headers=headers)
+    finally:
+        await punch_buffer.drain()
+
+    assert response.status_code == 503, response.text
+    assert response.headers["Retry-After"] == "1"
+    assert punch_buffer.stats()["flush_failures"] == failures + 1
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def test_no_endpoint_query_scans_a_whole_table(tmp_path):
+    # Its own database: the check seeds several companies, so per-company
+    # selectivity looks like a multi-tenant deployment, not a single tenant
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.check_query_plans", "--companies", "3", "--employees", "200", "--days", "60"],
+        cwd=BACKEND, env={**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path}/plans.db"},
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
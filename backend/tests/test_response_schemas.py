@@ -0,0 +1,25 @@
+import pytest
+
+from app.db.session import SessionLocal
+from app.models.attendance import Attendance
+from app.models.leave import LeaveRequest
+from app.models.payroll import Payroll
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_legacy_rows_with_nulls_are_served(client, employee):
+    employee_id, headers = employee
+    # Every nullable column left NULL, as rows written before the schemas could be
+    with SessionLocal() as db:
+        db.add_all([
+            LeaveRequest(employee_id=employee_id, status=None),
+            Payroll(employee_id=employee_id),
+            Attendance(employee_id=employee_id),
+        ])
+        db.commit()
+
+    for path in ("/leave/me", "/payroll/me", "/attendance/me"):
+        response = await client.get(path, headers=headers)
+        assert response.status_code == 200, response.text
+        assert any(item["employee_id"] == employee_id and None in item.values() for item in response.json()["items"])